@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark
+
+Measures, in fresh interpreters, how long the API and detector modules take
+to import and how long a new API worker takes to answer its first request.
+Heavy modules that should load lazily are reported if an import pulls them in.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--max-import-ms 1500] [--skip-server]
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that must only load when a code path needs them
+HEAVY_MODULES = ("geopandas", "shapely", "rasterio", "pandas", "scipy", "uvicorn")
+
+# Modules whose cold import time is measured
+TARGETS = ("api.simple_main", "detection.fire_detector")
+
+_IMPORT_PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, cwd: str) -> dict:
+    """Import ``module`` in a new interpreter and return its timing."""
+    code = _IMPORT_PROBE.format(src=str(SRC_DIR), module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(cwd: str, timeout: float = 60.0) -> float:
+    """Seconds from spawning a uvicorn worker until GET /health succeeds."""
+    port = _free_port()
+    code = (
+        f"import sys; sys.path.insert(0, {str(SRC_DIR)!r}); import uvicorn; "
+        f"uvicorn.run('api.simple_main:app', host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", code], cwd=cwd,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"API did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="Fail if the median import time of a target exceeds this")
+    parser.add_argument("--skip-server", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    failed = False
+    # Run from a scratch directory so data and cache files are not written into the repo
+    with tempfile.TemporaryDirectory() as workdir:
+        for module in TARGETS:
+            results = [measure_import(module, workdir) for _ in range(args.runs)]
+            median_ms = statistics.median(r["seconds"] for r in results) * 1000
+            loaded = sorted(set(m for r in results for m in r["loaded"]))
+            print(f"import {module:<28} median {median_ms:8.1f} ms   heavy modules loaded: {', '.join(loaded) or 'none'}")
+            if loaded or (args.max_import_ms is not None and median_ms > args.max_import_ms):
+                failed = True
+
+        if not args.skip_server:
+            timings = [measure_first_request(workdir) for _ in range(args.runs)]
+            print(f"time to first request          median {statistics.median(timings) * 1000:8.1f} ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Batch Detection Planning
+
+This module turns a list of detection requests into an execution plan for
+one grouped job: identical AOIs are deduplicated so they run once, and
+AOIs that overlap (same dates and satellite) are grouped so that scene
+loading is shared by every AOI in the group.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from utils.hashing import stable_key
+
+# Coordinate precision used when comparing AOIs (about 1 m)
+BOUNDS_DECIMALS = 5
+
+
+def aoi_key(request: Dict[str, Any]) -> str:
+    """Stable key identifying requests that produce identical results."""
+    return stable_key(
+        "aoi",
+        [round(float(v), BOUNDS_DECIMALS) for v in request["bounds"]],
+        request["start_date"],
+        request["end_date"],
+        request.get("satellite"),
+        request.get("max_cloud_cover"),
+        request.get("include_historical")
+    )
+
+
+def scene_key(request: Dict[str, Any]) -> str:
+    """Key of the scene set a request needs (everything except its bounds)."""
+    return stable_key("scenes", request["start_date"], request["end_date"], request.get("satellite"))
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def plan_batch(requests: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Deduplicate and group batch items.
+
+    Args:
+        requests: Detection request dictionaries (bounds, start_date, end_date, ...)
+
+    Returns:
+        Dictionary with:
+            canonical: for each item, the index of the item whose result it shares
+            groups: lists of canonical item indices sharing scene loading
+            group_bounds: union bounds of each group
+    """
+    canonical = []
+    first_by_key: Dict[str, int] = {}
+    for i, request in enumerate(requests):
+        canonical.append(first_by_key.setdefault(aoi_key(request), i))
+
+    unique = [i for i, c in enumerate(canonical) if c == i]
+    parent = list(range(len(requests)))
+
+    # Union overlapping AOIs that need the same scenes
+    by_scene: Dict[str, List[int]] = {}
+    for i in unique:
+        by_scene.setdefault(scene_key(requests[i]), []).append(i)
+
+    for members in by_scene.values():
+        if len(members) < 2:
+            continue
+        bounds = np.array([requests[i]["bounds"] for i in members], dtype=float)
+        overlaps = (
+            (bounds[:, None, 0] <= bounds[None, :, 2]) & (bounds[None, :, 0] <= bounds[:, None, 2]) &
+            (bounds[:, None, 1] <= bounds[None, :, 3]) & (bounds[None, :, 1] <= bounds[:, None, 3])
+        )
+        for a, b in zip(*np.nonzero(np.triu(overlaps, k=1))):
+            root_a, root_b = _find(parent, members[a]), _find(parent, members[b])
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    grouped: Dict[int, List[int]] = {}
+    for i in unique:
+        grouped.setdefault(_find(parent, i), []).append(i)
+    groups = list(grouped.values())
+
+    group_bounds = []
+    for group in groups:
+        bounds = np.array([requests[i]["bounds"] for i in group], dtype=float)
+        group_bounds.append([
+            float(bounds[:, 0].min()), float(bounds[:, 1].min()),
+            float(bounds[:, 2].max()), float(bounds[:, 3].max())
+        ])
+
+    return {"canonical": canonical, "groups": groups, "group_bounds": group_bounds}
+
+
+def batch_status(item_statuses: Sequence[str]) -> str:
+    """
+    Overall batch status from its items' statuses.
+
+    Returns:
+        'queued', 'processing', 'completed', 'partial' (some items failed)
+        or 'failed' (every item failed)
+    """
+    statuses = set(item_statuses)
+    if statuses <= {"queued"}:
+        return "queued"
+    if statuses & {"queued", "processing"}:
+        return "processing"
+    if statuses == {"completed"}:
+        return "completed"
+    if statuses == {"failed"}:
+        return "failed"
+    return "partial"
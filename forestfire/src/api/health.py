@@ -0,0 +1,140 @@
+"""
+Liveness and Readiness Checks
+
+Measures event-loop lag with a background ticker and turns saturation
+figures (loop lag, job queue utilization, task store memory, warm-up
+state) into liveness / readiness verdicts against configurable thresholds,
+so a load balancer stops routing to an instance before its latency spikes.
+"""
+
+import asyncio
+import os
+import resource
+import sys
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+# Defaults for monitoring.health_checks
+DEFAULT_THRESHOLDS = {
+    "max_event_loop_lag_ms": 250,
+    "max_queue_utilization": 0.9,
+    "max_task_store_mb": 512,
+    "timeout": 10
+}
+
+
+class EventLoopLagMonitor:
+    """
+    Background ticker measuring how late the event loop wakes it up.
+
+    A blocked or overloaded loop delays every coroutine; the delay of a
+    periodic sleep is a direct, cheap measure of that.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 10):
+        self.interval = interval
+        self._samples = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self._last_tick: Optional[float] = None
+
+    async def start(self):
+        if self._task is None:
+            self._last_tick = asyncio.get_running_loop().time()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self._samples.append(max(0.0, now - expected))
+            self._last_tick = now
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def lag(self) -> float:
+        """Worst lag over the recent window, in seconds."""
+        return max(self._samples, default=0.0)
+
+    def heartbeat_age(self) -> Optional[float]:
+        """Seconds since the ticker last ran (None before start)."""
+        if self._last_tick is None:
+            return None
+        return asyncio.get_running_loop().time() - self._last_tick
+
+
+def process_memory_mb() -> float:
+    """Resident set size of this process in MiB (peak RSS where current is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and KiB elsewhere
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _check(value: float, threshold: Optional[float]) -> Dict[str, Any]:
+    return {"ok": threshold is None or value <= threshold, "value": round(value, 4), "threshold": threshold}
+
+
+def liveness_report(monitor: EventLoopLagMonitor, thresholds: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Liveness: the event loop is still turning.
+
+    Only a stalled loop (no tick for ``timeout`` seconds) fails liveness;
+    a slow one is a readiness concern, restarting it would not help.
+    """
+    age = monitor.heartbeat_age()
+    alive = monitor.running and age is not None and age <= thresholds["timeout"]
+    return {
+        "status": "alive" if alive else "stalled",
+        "checks": {"event_loop_heartbeat_s": {"ok": alive, "value": age, "threshold": thresholds["timeout"]}}
+    }
+
+
+def readiness_report(measurements: Dict[str, Any], thresholds: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Readiness: the instance can take more traffic without degrading.
+
+    Args:
+        measurements: event_loop_lag_s, queue_depth, max_queue_size,
+            task_store_bytes and warm (startup caches loaded)
+        thresholds: monitoring.health_checks settings merged over DEFAULT_THRESHOLDS
+
+    Returns:
+        Dictionary with status ('ready' / 'not_ready'), per-check results and
+        the names of failing checks
+    """
+    max_queue = measurements.get("max_queue_size") or 0
+    checks = {
+        "warm": {"ok": bool(measurements["warm"]), "value": bool(measurements["warm"]), "threshold": True},
+        "event_loop_lag_ms": _check(measurements["event_loop_lag_s"] * 1000, thresholds["max_event_loop_lag_ms"]),
+        "queue_utilization": _check(
+            measurements["queue_depth"] / max_queue if max_queue else 0.0, thresholds["max_queue_utilization"]
+        ),
+        "task_store_mb": _check(measurements["task_store_bytes"] / 2 ** 20, thresholds["max_task_store_mb"])
+    }
+    failing = [name for name, check in checks.items() if not check["ok"]]
+    return {"status": "not_ready" if failing else "ready", "checks": checks, "failing": failing}
@@ -0,0 +1,93 @@
+"""
+HTTP Caching Helpers
+
+ETag / Last-Modified validators, conditional GET evaluation (304 Not
+Modified) and per-endpoint Cache-Control policies, so browsers and
+reverse proxies can reuse responses whose inputs have not changed.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+from fastapi import Response
+
+from utils.hashing import stable_key
+
+# Default Cache-Control per endpoint (overridable via api.cache_control)
+DEFAULT_CACHE_POLICIES = {
+    "regions": "public, max-age=86400",
+    "results": "public, max-age=86400, immutable",
+    "hotspots": "public, max-age=300",
+    "tiles": "public, max-age=60"
+}
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak entity tag from a stable hash of the inputs that determine a response.
+
+    Weak tags are used because compressed and uncompressed bodies of the
+    same representation should validate against the same tag.
+    """
+    return f'W/"{stable_key(*parts)}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an IMF-fixdate (naive values are taken as local time)."""
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(headers: Mapping[str, str], etag: Optional[str],
+                    last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET request.
+
+    If-None-Match takes precedence; tags are compared weakly (RFC 9110).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified if last_modified.tzinfo else last_modified.astimezone()
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: Optional[str], cache_control: Optional[str],
+                  last_modified: Optional[datetime] = None, vary: Optional[str] = None) -> Dict[str, str]:
+    """Validator and caching headers for a response."""
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """Empty 304 response carrying the same validators as a full one."""
+    return Response(status_code=304, headers=headers)
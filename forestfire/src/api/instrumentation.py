@@ -0,0 +1,55 @@
+"""
+Request Instrumentation
+
+ASGI middleware recording per-route request latency and in-flight counts
+into the metrics registry.
+"""
+
+import time
+
+from utils.metrics import REGISTRY, MetricsRegistry
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    Requests are labelled by route template (``/api/v1/results/{request_id}``)
+    rather than raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+        self.latency = registry.histogram(
+            "forestfire_http_request_duration_seconds", "HTTP request latency",
+            ("method", "route", "status")
+        )
+        self.in_flight = registry.gauge("forestfire_http_requests_in_flight", "HTTP requests being processed")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            self.latency.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            )
@@ -0,0 +1,137 @@
+"""
+Detection Field Projection
+
+Applies ``fields=``, ``geometry=``, ``zoom`` and ``limit``/``cursor`` options to
+detection lists before they are serialized, so fields a client did not ask
+for are never encoded.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.geometry import centroid, select_geometry, simplify_geometry
+
+GEOMETRY_MODES = ("full", "simplified", "centroid", "none")
+
+# Virtual field computed from the geometry
+CENTROID_FIELD = "centroid"
+
+# Precomputed per-zoom geometries, only returned when asked for by name
+LEVELS_FIELD = "geometry_levels"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated field list.
+
+    Dotted names select nested values (e.g. ``indices.dnbr_mean``).
+
+    Returns:
+        List of field paths, or None to keep every field
+    """
+    if not fields:
+        return None
+    parsed = [field.strip() for field in fields.split(",") if field.strip()]
+    return parsed or None
+
+
+def parse_geometry_mode(mode: Optional[str]) -> str:
+    """Validate a ``geometry=`` option; raises ValueError if unknown."""
+    mode = (mode or "full").lower()
+    if mode not in GEOMETRY_MODES:
+        raise ValueError(f"Unknown geometry mode '{mode}', expected one of: {', '.join(GEOMETRY_MODES)}")
+    return mode
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for list offsets."""
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+
+def decode_offset_cursor(cursor: Optional[str]) -> int:
+    """Inverse of encode_offset_cursor; raises ValueError on malformed input."""
+    if not cursor:
+        return 0
+    try:
+        prefix, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        if prefix != "offset" or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate(items: Sequence, limit: Optional[int], cursor: Optional[str]) -> Tuple[Sequence, Optional[str]]:
+    """
+    Slice a list by cursor and limit.
+
+    Returns:
+        Tuple of (page, next cursor or None)
+    """
+    offset = decode_offset_cursor(cursor)
+    if limit is None:
+        return items[offset:], None
+    page = items[offset:offset + limit]
+    next_cursor = encode_offset_cursor(offset + limit) if offset + limit < len(items) else None
+    return page, next_cursor
+
+
+def _select(detection: Dict[str, Any], path: str) -> Tuple[bool, Any]:
+    value: Any = detection
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+
+def _assign(target: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def project_detection(detection: Dict[str, Any], fields: Optional[List[str]] = None,
+                      geometry: str = "full", tolerance: float = 0.0,
+                      zoom: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build the serialized view of one detection.
+
+    Args:
+        detection: Detection dictionary (id, geometry, confidence, ...)
+        fields: Field paths to keep (None keeps all); 'centroid' adds the
+            geometry centroid
+        geometry: 'full', 'simplified', 'centroid' or 'none'
+        tolerance: Simplification tolerance in degrees for 'simplified'
+        zoom: Client zoom level; selects the matching precomputed geometry
+
+    Returns:
+        New dictionary; the input is not modified
+    """
+    if fields is None:
+        projected = {k: v for k, v in detection.items() if k not in ("geometry", LEVELS_FIELD)}
+        include_geometry = True
+    else:
+        projected = {}
+        for path in fields:
+            if path in ("geometry", CENTROID_FIELD):
+                continue
+            found, value = _select(detection, path)
+            if found:
+                _assign(projected, path, value)
+        include_geometry = "geometry" in fields
+        if CENTROID_FIELD in fields and detection.get("geometry"):
+            point = centroid(detection["geometry"])
+            projected[CENTROID_FIELD] = point["coordinates"] if point else None
+
+    source = select_geometry(detection, zoom)
+    if include_geometry and geometry != "none" and source:
+        if geometry == "centroid":
+            projected["geometry"] = centroid(source)
+        elif geometry == "simplified" and tolerance > 0:
+            projected["geometry"] = simplify_geometry(source, tolerance)
+        else:
+            projected["geometry"] = source
+
+    return projected
@@ -0,0 +1,298 @@
+"""
+Rate Limiting for the Forest Fire Detection API
+
+This module implements a token-bucket rate limiter keyed by API key or
+client address. Buckets live in process memory by default; a Redis backend
+can be used to share state between multiple API workers.
+"""
+
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Dict, Iterable, Optional, Tuple
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+# Optional shared-state backend
+try:
+    import redis.asyncio as redis_asyncio  # type: ignore
+    REDIS_AVAILABLE = True
+except Exception:
+    redis_asyncio = None  # type: ignore
+    REDIS_AVAILABLE = False
+
+from utils.metrics import REGISTRY, MetricsRegistry
+
+# Path segments kept in rejection labels (/api/v1/results/<id> -> /api/v1/results)
+ROUTE_PREFIX_DEPTH = 3
+
+# Distinct rejection labels before further prefixes are counted as "other"
+MAX_ROUTE_LABELS = 100
+
+
+def route_prefix(path: str, depth: int = ROUTE_PREFIX_DEPTH) -> str:
+    """Leading segments of a request path, dropping IDs in deeper segments."""
+    return "/" + "/".join(path.strip("/").split("/")[:depth])
+
+
+class MemoryBucketStore:
+    """
+    In-process token buckets with LRU eviction of idle clients.
+
+    Each check is a dictionary lookup plus a few float operations.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        """
+        Initialize the bucket store.
+
+        Args:
+            max_keys: Maximum number of tracked clients before evicting the least recent
+        """
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def consume(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        """
+        Take one token from the bucket for ``key``.
+
+        Args:
+            key: Client key
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity
+
+        Returns:
+            Tuple of (allowed, tokens remaining)
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True, bucket[0]
+        return False, bucket[0]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisBucketStore:
+    """
+    Token buckets stored in Redis so that all API workers share one budget.
+
+    The refill-and-take step runs as a Lua script, so it is atomic and costs
+    a single round trip per request.
+    """
+
+    SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str, prefix: str = "forestfire:ratelimit:"):
+        """
+        Initialize the Redis bucket store.
+
+        Args:
+            url: Redis connection URL
+            prefix: Key prefix for bucket hashes
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package is required for the shared rate limit backend")
+        self.prefix = prefix
+        self._client = redis_asyncio.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def consume(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        """Take one token from the shared bucket for ``key``."""
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[rate, burst])
+        return bool(int(allowed)), float(tokens)
+
+    def __len__(self) -> int:
+        return 0
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with rejection counters.
+    """
+
+    def __init__(self, requests_per_minute: float = 100, burst_size: int = 20,
+                 store: Optional[Any] = None, registry: MetricsRegistry = REGISTRY):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate per client
+            burst_size: Maximum number of requests allowed in a burst
+            store: Bucket store (defaults to MemoryBucketStore)
+            registry: Metrics registry receiving the rejection counter
+        """
+        self.rate = max(float(requests_per_minute), 1e-6) / 60.0
+        self.burst = max(float(burst_size), 1.0)
+        self.store = store if store is not None else MemoryBucketStore()
+        self.allowed_total = 0
+        self.rejected_total = 0
+        self.rejected_by_path: Dict[str, int] = {}
+        self.rejections = registry.counter(
+            "forestfire_rate_limited_total", "Requests rejected by the rate limiter", ("route",)
+        )
+
+    async def check(self, key: str, path: str = "") -> Tuple[bool, float, int]:
+        """
+        Check whether a request from ``key`` may proceed.
+
+        Args:
+            key: Client key
+            path: Request path, counted by route prefix when rejected
+
+        Returns:
+            Tuple of (allowed, tokens remaining, seconds until next token)
+        """
+        try:
+            allowed, remaining = await self.store.consume(key, self.rate, self.burst)
+        except Exception as e:
+            # Never turn a backend outage into an API outage
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return True, self.burst, 0
+
+        if allowed:
+            self.allowed_total += 1
+            return True, remaining, 0
+
+        self.rejected_total += 1
+        route = route_prefix(path)
+        if route not in self.rejected_by_path and len(self.rejected_by_path) >= MAX_ROUTE_LABELS:
+            route = "other"
+        self.rejected_by_path[route] = self.rejected_by_path.get(route, 0) + 1
+        self.rejections.inc(route=route)
+        retry_after = max(1, math.ceil((1.0 - remaining) / self.rate))
+        return False, remaining, retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limiter counters for monitoring."""
+        return {
+            "requests_per_minute": self.rate * 60.0,
+            "burst_size": self.burst,
+            "tracked_clients": len(self.store),
+            "allowed_total": self.allowed_total,
+            "rejected_total": self.rejected_total,
+            "rejected_by_path": dict(self.rejected_by_path)
+        }
+
+
+def default_client_key(scope: Dict[str, Any], api_keys: Optional[Collection[str]] = None) -> str:
+    """
+    Identify the client by API key header, falling back to its address.
+
+    Only keys in ``api_keys`` are trusted; any other key would let a client
+    pick a fresh bucket per request, so it is identified by address instead.
+    """
+    if api_keys:
+        for name, value in scope.get("headers", []):
+            if name == b"x-api-key":
+                key = value.decode("latin-1")
+                if key in api_keys:
+                    return "key:" + key
+                break
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying a RateLimiter to selected path prefixes.
+
+    Rejected requests receive a 429 response with Retry-After and
+    X-RateLimit-* headers.
+    """
+
+    def __init__(self, app, limiter: RateLimiter,
+                 path_prefixes: Iterable[str] = ("/api/",),
+                 key_func: Callable[[Dict[str, Any]], str] = default_client_key):
+        self.app = app
+        self.limiter = limiter
+        self.path_prefixes = tuple(path_prefixes)
+        self.key_func = key_func
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, remaining, retry_after = await self.limiter.check(self.key_func(scope), scope["path"])
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+                (b"x-ratelimit-limit", str(int(self.limiter.burst)).encode()),
+                (b"x-ratelimit-remaining", str(int(remaining)).encode()),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_rate_limiter(settings: Dict[str, Any], redis_url: Optional[str] = None) -> RateLimiter:
+    """
+    Build a RateLimiter from the security.rate_limiting configuration.
+
+    Args:
+        settings: Rate limiting settings (requests_per_minute, burst_size, backend)
+        redis_url: Redis URL used when backend is 'redis'
+
+    Returns:
+        Configured RateLimiter
+    """
+    store = None
+    if settings.get("backend", "memory") == "redis":
+        try:
+            store = RedisBucketStore(settings.get("redis_url") or redis_url)
+        except Exception as e:
+            logger.warning(f"Falling back to in-process rate limiting: {e}")
+
+    if store is None:
+        store = MemoryBucketStore(settings.get("max_tracked_clients", 10000))
+
+    return RateLimiter(
+        requests_per_minute=settings.get("requests_per_minute", 100),
+        burst_size=settings.get("burst_size", 20),
+        store=store
+    )
@@ -0,0 +1,91 @@
+"""
+In-Process Response Cache
+
+A small LRU cache with TTL and a size budget for responses that are a pure
+function of their (stably hashed) request parameters.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    LRU response cache bounded by entry count, total weight and age.
+
+    The weight of an entry is supplied by the caller (e.g. the number of
+    features in a FeatureCollection) so that a few huge responses cannot
+    push the process out of memory.
+    """
+
+    def __init__(self, max_entries: int = 256, max_weight: int = 200000,
+                 ttl_seconds: Optional[float] = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_weight: Maximum combined weight of cached responses
+            ttl_seconds: Entry lifetime in seconds (None disables expiry)
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, weight, stored_at = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any, weight: int = 1):
+        """Store ``value`` under ``key``; oversized values are not cached."""
+        if weight > self.max_weight:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, weight, time.monotonic())
+        self._weight += weight
+        while len(self._entries) > self.max_entries or self._weight > self.max_weight:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str):
+        _, weight, _ = self._entries.pop(key)
+        self._weight -= weight
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "weight": self._weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,243 @@
+"""
+Detection Job Scheduler
+
+This module implements admission control for background detection jobs:
+a bounded priority queue, a fixed pool of async workers, per-client
+concurrency limits and backpressure signalling (429/503 with Retry-After).
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+
+# Scheduling classes, lower value is served first
+PRIORITY_CLASSES = {
+    "emergency": 0,
+    "high": 1,
+    "normal": 2,
+    "bulk": 3
+}
+
+# Requests covering more than this many square degrees are treated as bulk scans
+BULK_AREA_THRESHOLD = 1000.0
+
+
+class JobCancelledError(Exception):
+    """Reported to on_error for jobs dropped or interrupted by a scheduler shutdown."""
+
+
+class AdmissionError(Exception):
+    """Raised when a job cannot be admitted to the scheduler."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+def classify_priority(bounds, requested: Optional[str] = None) -> str:
+    """
+    Resolve the scheduling class for a detection request.
+
+    Args:
+        bounds: [min_lon, min_lat, max_lon, max_lat]
+        requested: Explicit priority class from the request (optional)
+
+    Returns:
+        Name of the priority class
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority '{requested}', expected one of {list(PRIORITY_CLASSES)}")
+        return requested
+
+    area = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+    return "bulk" if area >= BULK_AREA_THRESHOLD else "normal"
+
+
+class JobScheduler:
+    """
+    Bounded priority scheduler for detection jobs.
+
+    Jobs are admitted into a priority queue and executed by a fixed number
+    of async workers. Admission is refused when the submitting client already
+    has too many active jobs (429) or when the scheduler is saturated (503).
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 4, max_queue_size: int = 100,
+                 per_client_limit: int = 4, job_timeout: Optional[float] = 300):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrent_jobs: Number of jobs executed at the same time
+            max_queue_size: Maximum number of jobs waiting for a worker
+            per_client_limit: Maximum queued plus running jobs per client
+            job_timeout: Seconds before a running job is cancelled (None disables)
+        """
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.per_client_limit = max(1, int(per_client_limit))
+        self.job_timeout = job_timeout
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers = []
+        self._sequence = itertools.count()
+        self._client_jobs: Dict[str, int] = {}
+        self._running = 0
+        self._avg_duration = 5.0  # seconds, refined as jobs complete
+        self.rejected = {"client_limit": 0, "queue_full": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently executing."""
+        return self._running
+
+    def estimate_wait(self) -> int:
+        """Estimate the seconds until a newly queued job would start."""
+        backlog = self.queue_depth + self._running
+        waves = backlog / self.max_concurrent_jobs
+        return max(1, int(round(waves * self._avg_duration)))
+
+    def submit(self, job_id: str, client_id: str, priority: str,
+               job: Callable[[], Awaitable[Any]],
+               on_error: Optional[Callable[[str, Exception], None]] = None,
+               timeout: Optional[float] = None, cost: int = 1) -> int:
+        """
+        Admit a job into the queue.
+
+        Args:
+            job_id: Unique job identifier
+            client_id: Identity used for per-client limits
+            priority: Priority class name (see PRIORITY_CLASSES)
+            job: Zero-argument coroutine function executing the job
+            on_error: Callback invoked when the job fails or times out
+            timeout: Per-job timeout overriding job_timeout (e.g. for batches)
+            cost: Jobs counted against the client's limit (e.g. the AOIs of a batch)
+
+        Returns:
+            Number of jobs queued ahead of this one
+
+        Raises:
+            AdmissionError: If the client or the scheduler is saturated
+        """
+        self._ensure_workers()
+
+        cost = max(1, int(cost))
+        if self._client_jobs.get(client_id, 0) + cost > self.per_client_limit:
+            self.rejected["client_limit"] += 1
+            raise AdmissionError(
+                429,
+                f"Too many concurrent detection jobs for this client (limit {self.per_client_limit})",
+                self.estimate_wait()
+            )
+
+        position = self.queue_depth
+        try:
+            self._queue.put_nowait((
+                PRIORITY_CLASSES[priority],
+                next(self._sequence),
+                job_id,
+                client_id,
+                job,
+                on_error,
+                timeout or self.job_timeout,
+                cost
+            ))
+        except asyncio.QueueFull:
+            self.rejected["queue_full"] += 1
+            raise AdmissionError(503, "Detection queue is full, try again later", self.estimate_wait())
+
+        self._client_jobs[client_id] = self._client_jobs.get(client_id, 0) + cost
+        return position
+
+    def _ensure_workers(self):
+        """Create the queue and worker tasks on the running event loop."""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(i)) for i in range(self.max_concurrent_jobs)
+            ]
+
+    async def start(self):
+        """Start the worker pool."""
+        self._ensure_workers()
+
+    async def stop(self):
+        """Cancel all workers; running and queued jobs are reported to their on_error callback."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, job_id, _, _, on_error, _, _ = self._queue.get_nowait()
+                logger.warning(f"Job {job_id} dropped from the queue on shutdown")
+                if on_error:
+                    on_error(job_id, JobCancelledError("Scheduler shut down before the job started"))
+        self._queue = None
+        self._client_jobs.clear()
+
+    async def _worker(self, worker_id: int):
+        """Pull jobs off the queue in priority order and run them."""
+        while True:
+            _, _, job_id, client_id, job, on_error, timeout, cost = await self._queue.get()
+            self._running += 1
+            started = time.monotonic()
+            try:
+                if timeout:
+                    await asyncio.wait_for(job(), timeout=timeout)
+                else:
+                    await job()
+            except asyncio.TimeoutError as e:
+                logger.error(f"Job {job_id} exceeded timeout of {timeout}s")
+                if on_error:
+                    on_error(job_id, e)
+            except asyncio.CancelledError:
+                if on_error:
+                    on_error(job_id, JobCancelledError("Scheduler shut down while the job was running"))
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed on worker {worker_id}: {e}")
+                if on_error:
+                    on_error(job_id, e)
+            finally:
+                duration = time.monotonic() - started
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                self._running -= 1
+                remaining = self._client_jobs.get(client_id, cost) - cost
+                if remaining > 0:
+                    self._client_jobs[client_id] = remaining
+                else:
+                    self._client_jobs.pop(client_id, None)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return scheduler counters for monitoring."""
+        return {
+            "queue_depth": self.queue_depth,
+            "running": self._running,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "max_queue_size": self.max_queue_size,
+            "per_client_limit": self.per_client_limit,
+            "active_clients": len(self._client_jobs),
+            "rejected": dict(self.rejected)
+        }
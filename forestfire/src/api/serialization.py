@@ -0,0 +1,249 @@
+"""
+Response Serialization
+
+Fast JSON encoding (orjson when installed, the standard library otherwise),
+streaming NDJSON / chunked GeoJSON bodies for large FeatureCollections, and
+a compression middleware that negotiates brotli or gzip per request and
+compresses streamed bodies chunk by chunk.
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+# Response formats accepted by endpoints that can stream
+RESPONSE_FORMATS = ("json", "geojson", "ndjson")
+
+# Features serialized per streamed chunk
+STREAM_CHUNK_FEATURES = 1000
+
+
+def _default(obj: Any) -> Any:
+    """Fallback conversions shared by both encoders."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, "__geo_interface__"):
+        return obj.__geo_interface__
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON."""
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def response_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """
+    Pick the response format from a ``format`` parameter or the Accept header.
+
+    Raises:
+        ValueError: If an unknown format is requested
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown format '{requested}', expected one of: {', '.join(RESPONSE_FORMATS)}")
+        return requested
+    accept = (accept or "").lower()
+    if NDJSON_MEDIA_TYPE in accept:
+        return "ndjson"
+    if GEOJSON_MEDIA_TYPE in accept:
+        return "geojson"
+    return "json"
+
+
+def chunked(items: Sequence, size: int = STREAM_CHUNK_FEATURES) -> Iterator[Sequence]:
+    """Split a sequence into consecutive slices of ``size``."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def iter_ndjson(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode chunks of records as newline-delimited JSON, one chunk per yield."""
+    for chunk in chunks:
+        if chunk:
+            yield b"".join(dumps(record) + b"\n" for record in chunk)
+
+
+def iter_geojson(chunks: Iterable[List[Dict]], members: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
+    """
+    Encode chunks of features as one GeoJSON FeatureCollection, incrementally.
+
+    Args:
+        chunks: Iterable of feature lists
+        members: Extra top-level members written after the features (e.g. metadata)
+
+    Yields:
+        Byte fragments that concatenate to a valid FeatureCollection
+    """
+    yield b'{"type":"FeatureCollection","features":['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = b",".join(dumps(feature) for feature in chunk)
+        yield body if first else b"," + body
+        first = False
+    tail = b"]"
+    for key, value in (members or {}).items():
+        tail += b"," + dumps(key) + b":" + dumps(value)
+    yield tail + b"}"
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choose a content coding from an Accept-Encoding header.
+
+    Brotli is preferred when the optional ``brotli`` package is installed.
+    Codings with q=0 are treated as refused.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    def allowed(coding):
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if BROTLI_AVAILABLE and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Incremental gzip / brotli compressor with flush per chunk."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with brotli or gzip.
+
+    Single-message bodies below ``minimum_size`` are sent as is. Streamed
+    bodies are compressed and flushed chunk by chunk so clients still get
+    the first bytes early.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                response_headers = start_message.get("headers", [])
+                already_encoded = any(k.lower() == b"content-encoding" for k, _ in response_headers)
+                if already_encoded or (not more_body and len(body) < self.minimum_size):
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                start_message["headers"] = [
+                    (k, v) for k, v in response_headers if k.lower() != b"content-length"
+                ] + [(b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]
+                await send(start_message)
+                start_message = None
+
+            if compressor is None:
+                await send(message)
+                return
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body
+            })
+
+        await self.app(scope, receive, send_wrapper)
@@ -4,18 +4,19 @@ Simple FastAPI Backend for Forest Fire Detection System
 This is a simplified version that works without heavy geospatial dependencies.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
-import uvicorn
+from typing import Dict, List, Optional, Any, Tuple
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 import random
+from statistics import fmean
 import numpy as np
 import asyncio
+import uuid
 
 # Import logger with fallback
 try:
@@ -25,6 +26,56 @@ except ImportError:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     logger = logging.getLogger(__name__)
 
+from utils.hashing import stable_hash, stable_key, stable_seed
+from utils.gazetteer import get_gazetteer
+from utils.geometry import build_geometry_levels, meters_to_degrees, select_geometry, vertex_count
+from storage.detection_store import get_detection_store, to_timestamp
+from storage.hotspot_store import get_hotspot_store
+from utils.land_mask import get_land_mask
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, stage_timer, start_metrics_server
+from utils.execution import ExecutionEngine
+from .scheduler import JobScheduler, AdmissionError, PRIORITY_CLASSES, classify_priority
+from .rate_limit import RateLimitMiddleware, create_rate_limiter, default_client_key
+from .response_cache import ResponseCache
+from .batch import batch_status, plan_batch
+from .instrumentation import MetricsMiddleware
+from .health import DEFAULT_THRESHOLDS, EventLoopLagMonitor, liveness_report, process_memory_mb, readiness_report
+from .http_cache import DEFAULT_CACHE_POLICIES, cache_headers, is_not_modified, make_etag, not_modified
+from .projection import paginate, parse_fields, parse_geometry_mode, project_detection
+from .serialization import (
+    GEOJSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, STREAM_CHUNK_FEATURES,
+    CompressionMiddleware, FastJSONResponse, chunked, iter_geojson, iter_ndjson, response_format
+)
+from .tiles import (
+    MAX_TILE_FEATURES, MVT_MEDIA_TYPE, TILE_BUFFER, TILE_EXTENT,
+    TileCache, render_tile, tile_bounds, validate_tile
+)
+from .synthetic_hotspots import (
+    MAX_SYNTHETIC_HOTSPOTS, generate_hotspots, hotspot_features, land_locations
+)
+
+# Load configuration (falls back to built-in defaults if unavailable)
+CONFIG_PATH = os.getenv(
+    "FORESTFIRE_CONFIG",
+    os.path.join(os.path.dirname(__file__), "..", "..", "config", "config.yaml")
+)
+
+try:
+    from utils.config_loader import load_config
+    config = load_config(CONFIG_PATH)
+except Exception as e:
+    logger.warning(f"Configuration loader unavailable, using defaults: {e}")
+    config = None
+
+
+def get_setting(key_path: str, default: Any = None) -> Any:
+    """Get a configuration value by dot-separated path (one lookup in the config snapshot)."""
+    if config is None:
+        return default
+    value = config.get(key_path)
+    return default if value is None else value
+
+
 # Pydantic models for API requests/responses
 class DetectionRequest(BaseModel):
     bounds: List[float] = Field(..., description="[min_lon, min_lat, max_lon, max_lat]")
@@ -33,6 +84,12 @@ class DetectionRequest(BaseModel):
     satellite: str = Field(default="sentinel2", description="Satellite to use")
     include_historical: bool = Field(default=True, description="Include historical data for dNBR")
     max_cloud_cover: Optional[float] = Field(default=40, description="Maximum cloud cover percentage")
+    priority: Optional[str] = Field(default=None, description="Scheduling class: emergency, high, normal or bulk")
+
+
+class BatchDetectionRequest(BaseModel):
+    requests: List[DetectionRequest] = Field(..., min_length=1, description="Detection requests, one per AOI")
+    priority: Optional[str] = Field(default=None, description="Scheduling class for the whole batch")
 
 
 class DetectionResponse(BaseModel):
@@ -42,6 +99,8 @@ class DetectionResponse(BaseModel):
     detections: List[Dict[str, Any]]
     summary: Dict[str, Any]
     metadata: Dict[str, Any]
+    total_detections: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class StatusResponse(BaseModel):
@@ -56,10 +115,41 @@ class StatusResponse(BaseModel):
 app = FastAPI(
     title="Forest Fire Detection API",
     description="Satellite-based forest fire detection system",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse
 )
 
-# Add CORS middleware
+# Clients sending one of these X-API-Key values are limited per key, all others per address
+API_KEYS = frozenset(
+    (get_setting('security.api_keys.keys', []) or []) if get_setting('security.api_keys.enabled', False) else ()
+)
+
+
+def client_key(scope: Dict[str, Any]) -> str:
+    """Rate limit and scheduler identity of a request."""
+    return default_client_key(scope, API_KEYS)
+
+
+# Rate limiting (security.rate_limiting overrides api.rate_limit)
+rate_limit_settings = {**get_setting('api.rate_limit', {}), **get_setting('security.rate_limiting', {})}
+rate_limiter = None
+if rate_limit_settings.get('enabled', True):
+    rate_limiter = create_rate_limiter(
+        rate_limit_settings,
+        redis_url=config.get_redis_url() if config else None
+    )
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, path_prefixes=("/api/",), key_func=client_key)
+
+# Response compression (brotli when available, otherwise gzip)
+if get_setting('api.compression.enabled', True):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=get_setting('api.compression.minimum_size', 1024),
+        gzip_level=get_setting('api.compression.gzip_level', 6),
+        brotli_quality=get_setting('api.compression.brotli_quality', 4)
+    )
+
+# Add CORS middleware (added last so it also wraps rate limit rejections)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -68,16 +158,192 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency / in-flight metrics (outermost, so rejections are timed too)
+METRICS_ENABLED = get_setting('monitoring.metrics.enabled', True)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=REGISTRY)
+
 # Global variables
 detection_tasks = {}  # Store ongoing detection tasks
+detection_batches = {}  # Batch ID -> member request IDs
+
+# Finished tasks are evicted after a while, and sooner when their results take too much memory
+TASK_TTL = timedelta(seconds=get_setting('api.scheduler.task_ttl_seconds', 3600))
+TASK_STORE_MAX_BYTES = get_setting('api.scheduler.task_store_mb', 256) * 2 ** 20
+FINISHED_STATUSES = ("completed", "failed")
+
+# Approximate JSON size of detection results: per detection, and per coordinate pair
+DETECTION_JSON_BYTES = 600
+VERTEX_JSON_BYTES = 40
+
+# Zoom levels with precomputed simplified detection geometries
+GEOMETRY_ZOOM_LEVELS = get_setting('detection.spatial.geometry_zoom_levels', [4, 8, 12])
+
+# Batch limits: items and unique AOIs per request, and scene groups processed at once within a batch
+MAX_BATCH_ITEMS = get_setting('api.batch.max_items', 500)
+MAX_BATCH_UNIQUE_ITEMS = get_setting('api.batch.max_unique_items', 200)
+BATCH_GROUP_CONCURRENCY = get_setting('api.batch.group_concurrency', 4)
+
+# Admission control for background detection jobs
+scheduler = JobScheduler(
+    max_concurrent_jobs=get_setting('api.scheduler.max_concurrent_jobs', 4),
+    max_queue_size=get_setting('api.scheduler.max_queue_size', get_setting('api.max_connections', 1000)),
+    per_client_limit=get_setting('api.rate_limit.max_concurrent_jobs_per_client', 4),
+    job_timeout=get_setting('api.timeout', 300)
+)
+
+# CPU-bound detection work runs on the configured backend, off the event loop
+execution_engine = ExecutionEngine.from_config(get_setting('performance', {}))
+
+# Deterministic responses keyed by a stable hash of their parameters
+hotspot_cache = ResponseCache(
+    max_entries=get_setting('performance.caching.response_cache_entries', 256),
+    max_weight=get_setting('performance.caching.response_cache_features', 200000),
+    ttl_seconds=get_setting('performance.caching.response_ttl_seconds', 3600)
+)
+
+# Cache-Control per endpoint; responses also carry ETag / Last-Modified validators
+CACHE_POLICIES = {**DEFAULT_CACHE_POLICIES, **get_setting('api.cache_control', {})}
+
+# Monitoring regions served by /api/v1/regions
+REGIONS = {
+    "california": {
+        "name": "California, USA",
+        "bounds": [-124.5, 32.5, -114.0, 42.0],
+        "center": [36.7783, -119.4179],
+        "zoom": 6,
+        "description": "California wildfire monitoring region"
+    },
+    "australia": {
+        "name": "Australia",
+        "bounds": [113.0, -44.0, 154.0, -10.0],
+        "center": [-25.2744, 133.7751],
+        "zoom": 4,
+        "description": "Australian bushfire monitoring region"
+    },
+    "global": {
+        "name": "Global Monitoring",
+        "bounds": [-180.0, -90.0, 180.0, 90.0],
+        "center": [20.0, 0.0],
+        "zoom": 2,
+        "description": "Global fire monitoring"
+    }
+}
+
+REGIONS_ETAG = make_etag("regions", REGIONS)
+REGIONS_MODIFIED = datetime.now()
+
+# Searchable history of completed detections (opened on first use)
+DETECTION_STORE_PATH = get_setting('database.detection_store_path', 'data/detections.sqlite')
+
+# FIRMS hotspots loaded from the CSV directories under satellite_data.<source>.csv_dir
+HOTSPOT_STORE_PATH = get_setting('database.hotspot_store_path', 'data/hotspots.sqlite')
+HOTSPOT_SOURCES = ("viirs", "modis")
+hotspot_ingest_task = None
+
+# Detection job outcomes
+DETECTION_JOBS = REGISTRY.counter("forestfire_detection_jobs_total", "Finished detection jobs", ("status",))
+
+# Standalone scrape endpoint on monitoring.metrics.prometheus_port (started on startup)
+metrics_server = None
+
+# Liveness / readiness thresholds and the event-loop lag probe
+HEALTH_CHECKS_ENABLED = get_setting('monitoring.health_checks.enabled', True)
+HEALTH_THRESHOLDS = {**DEFAULT_THRESHOLDS, **get_setting('monitoring.health_checks', {})}
+loop_monitor = EventLoopLagMonitor(interval=HEALTH_THRESHOLDS.get('lag_sample_interval', 0.5))
+app_warm = False  # set once startup has loaded the land mask, gazetteer and store
+
+# Detections are fetched with the same margin that tiles render beyond their edges
+TILE_QUERY_BUFFER = TILE_BUFFER / TILE_EXTENT
+
+# Rendered vector tiles, invalidated when the detection store changes
+tile_cache = TileCache(
+    max_entries=get_setting('performance.caching.tile_cache_entries', 4096),
+    max_bytes=get_setting('performance.caching.tile_cache_mb', 64) * 1024 * 1024,
+    disk_dir=(os.path.join(get_setting('performance.caching.cache_dir', 'cache'), 'tiles')
+              if get_setting('performance.caching.enabled', True) else None),
+    max_disk_bytes=get_setting('performance.caching.tile_cache_disk_mb', 512) * 1024 * 1024
+)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup."""
+    global app_warm
+    await scheduler.start()
+    # Settings read per request pick up edits to the config file without a restart
+    if config is not None and get_setting('system.config_reload_interval', 0) > 0:
+        config.start_watching(get_setting('system.config_reload_interval'))
+    if HEALTH_CHECKS_ENABLED:
+        await loop_monitor.start()
+    # Build the land/water grid and place index before the first request needs them
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, get_land_mask, get_setting('detection.spatial.land_mask_path'))
+    await loop.run_in_executor(None, get_gazetteer, get_setting('detection.spatial.gazetteer_path'))
+    await loop.run_in_executor(None, get_detection_store, DETECTION_STORE_PATH)
+    await loop.run_in_executor(None, get_hotspot_store, HOTSPOT_STORE_PATH)
+    
+    global metrics_server, hotspot_ingest_task
+    if hotspot_csv_dirs() and hotspot_ingest_task is None:
+        hotspot_ingest_task = asyncio.create_task(ingest_hotspots_periodically())
+    metrics_port = get_setting('monitoring.metrics.prometheus_port')
+    if METRICS_ENABLED and metrics_port and metrics_port != get_setting('api.port', 8000) and metrics_server is None:
+        metrics_server = start_metrics_server(metrics_port)
+    app_warm = True
     logger.info("Forest Fire Detection API initialized successfully")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers on shutdown."""
+    global metrics_server, app_warm, hotspot_ingest_task
+    app_warm = False
+    if hotspot_ingest_task is not None:
+        hotspot_ingest_task.cancel()
+        hotspot_ingest_task = None
+    await loop_monitor.stop()
+    await scheduler.stop()
+    if config is not None:
+        config.stop_watching()
+    get_detection_store(DETECTION_STORE_PATH).close()
+    get_hotspot_store(HOTSPOT_STORE_PATH).close()
+    execution_engine.shutdown(wait=False)
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+        metrics_server = None
+
+
+def hotspot_csv_dirs() -> Dict[str, str]:
+    """FIRMS CSV directory of each enabled hotspot source."""
+    directories = {}
+    for source in HOTSPOT_SOURCES:
+        settings = get_setting(f'satellite_data.{source}', {}) or {}
+        if settings.get('enabled', True) and settings.get('csv_dir'):
+            directories[source] = settings['csv_dir']
+    return directories
+
+
+def ingest_hotspot_files() -> Dict[str, Dict[str, int]]:
+    """Load new or changed FIRMS CSV files into the hotspot store."""
+    store = get_hotspot_store(HOTSPOT_STORE_PATH)
+    return {source: store.ingest_directory(directory, source) for source, directory in hotspot_csv_dirs().items()}
+
+
+async def ingest_hotspots_periodically():
+    """Scan the FIRMS CSV directories on startup and every database.hotspot_scan_interval seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, ingest_hotspot_files)
+        except Exception as e:
+            logger.error(f"Hotspot ingestion failed: {e}")
+        interval = get_setting('database.hotspot_scan_interval', 3600)
+        if not interval:
+            return
+        await asyncio.sleep(interval)
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -87,76 +353,398 @@ async def root():
         "status": "running",
         "endpoints": {
             "detect_fires": "/api/v1/detect",
+            "detect_fires_batch": "/api/v1/detect/batch",
+            "get_batch_status": "/api/v1/batch/{batch_id}",
             "get_status": "/api/v1/status/{request_id}",
             "get_results": "/api/v1/results/{request_id}",
-            "health": "/health"
+            "health": "/health",
+            "stats": "/stats"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health summary; always 200, see /health/ready for a routable verdict."""
+    readiness = check_readiness()
     return {
-        "status": "healthy",
+        "status": "healthy" if readiness["status"] == "ready" else "degraded",
         "timestamp": datetime.now(),
         "components": {
-            "api": True,
-            "detection_engine": True
-        }
+            "api": readiness["checks"]["event_loop_lag_ms"]["ok"],
+            "detection_engine": readiness["checks"]["queue_utilization"]["ok"],
+            "caches_warm": app_warm
+        },
+        "checks": readiness["checks"]
     }
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: 503 when the event loop has stalled."""
+    if not HEALTH_CHECKS_ENABLED:
+        return {"status": "alive"}
+    report = liveness_report(loop_monitor, HEALTH_THRESHOLDS)
+    return FastJSONResponse(report, status_code=200 if report["status"] == "alive" else 503)
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 503 while warming up or when saturated, so traffic is shed early."""
+    if not HEALTH_CHECKS_ENABLED:
+        return {"status": "ready"}
+    report = check_readiness()
+    return FastJSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+
+def task_store_bytes() -> int:
+    """Approximate memory held by in-memory task results (their serialized size)."""
+    return sum(task.get("result_bytes", 0) for task in list(detection_tasks.values()))
+
+
+def estimate_result_bytes(results: Dict) -> int:
+    """Approximate serialized size of detection results, without serializing them."""
+    detections = results.get("detections", [])
+    vertices = sum(
+        vertex_count(detection.get("geometry"))
+        + sum(vertex_count(level) for level in (detection.get("geometry_levels") or {}).values())
+        for detection in detections
+    )
+    return DETECTION_JSON_BYTES * (len(detections) + 1) + VERTEX_JSON_BYTES * vertices
+
+
+def prune_detection_tasks(now: Optional[datetime] = None):
+    """
+    Evict finished tasks older than api.scheduler.task_ttl_seconds, then the
+    oldest finished ones while results exceed api.scheduler.task_store_mb.
+    Batches are dropped once none of their items is left.
+    """
+    now = now or datetime.now()
+    finished = sorted(
+        (task["timestamp"], request_id) for request_id, task in list(detection_tasks.items())
+        if task["status"] in FINISHED_STATUSES
+    )
+    total = task_store_bytes()
+    for finished_at, request_id in finished:
+        if now - finished_at <= TASK_TTL and total <= TASK_STORE_MAX_BYTES:
+            break
+        total -= detection_tasks.pop(request_id).get("result_bytes", 0)
+    
+    for batch_id, batch in list(detection_batches.items()):
+        if not any(request_id in detection_tasks for request_id in batch["items"]):
+            del detection_batches[batch_id]
+
+
+def check_readiness() -> Dict[str, Any]:
+    """Evaluate readiness against monitoring.health_checks thresholds."""
+    prune_detection_tasks()
+    report = readiness_report({
+        "warm": app_warm,
+        "event_loop_lag_s": loop_monitor.lag,
+        "queue_depth": scheduler.queue_depth,
+        "max_queue_size": scheduler.max_queue_size,
+        "task_store_bytes": task_store_bytes()
+    }, HEALTH_THRESHOLDS)
+    report["process_memory_mb"] = round(process_memory_mb(), 1)
+    report["tasks"] = len(detection_tasks)
+    return report
+
+
+@app.get("/stats")
+async def get_stats():
+    """Scheduler and rate limiter counters."""
+    # Store counts wait for the store locks
+    loop = asyncio.get_running_loop()
+    stored_detections = await loop.run_in_executor(None, lambda: get_detection_store(DETECTION_STORE_PATH).count())
+    stored_hotspots = await loop.run_in_executor(None, lambda: get_hotspot_store(HOTSPOT_STORE_PATH).count())
+    return {
+        "timestamp": datetime.now(),
+        "scheduler": scheduler.stats(),
+        "execution": execution_engine.stats(),
+        "hotspot_cache": hotspot_cache.stats(),
+        "tile_cache": tile_cache.stats(),
+        "rate_limiter": rate_limiter.stats() if rate_limiter else None,
+        "tasks": len(detection_tasks),
+        "batches": len(detection_batches),
+        "stored_detections": stored_detections,
+        "stored_hotspots": stored_hotspots
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    # Collectors read the stores, so rendering runs off the event loop
+    content = await asyncio.get_running_loop().run_in_executor(None, REGISTRY.render)
+    return Response(content=content, media_type=METRICS_CONTENT_TYPE)
+
+
+def collect_service_metrics():
+    """Queue, task store and cache figures read at scrape time."""
+    scheduler_stats = scheduler.stats()
+    caches = {"hotspots": hotspot_cache.stats(), "tiles": tile_cache.stats()}
+    statuses: Dict[str, int] = {}
+    for task in list(detection_tasks.values()):
+        statuses[task["status"]] = statuses.get(task["status"], 0) + 1
+    
+    return [
+        ("forestfire_scheduler_queue_depth", "gauge", "Detection jobs waiting to run",
+         [("forestfire_scheduler_queue_depth", {}, scheduler_stats["queue_depth"])]),
+        ("forestfire_scheduler_running_jobs", "gauge", "Detection jobs running",
+         [("forestfire_scheduler_running_jobs", {}, scheduler_stats["running"])]),
+        ("forestfire_scheduler_rejected_total", "counter", "Detection jobs rejected by admission control",
+         [("forestfire_scheduler_rejected_total", {"reason": reason}, count)
+          for reason, count in scheduler_stats["rejected"].items()]),
+        ("forestfire_event_loop_lag_seconds", "gauge", "Worst recent event loop lag",
+         [("forestfire_event_loop_lag_seconds", {}, loop_monitor.lag)]),
+        ("forestfire_tasks", "gauge", "Detection tasks held in memory by status",
+         [("forestfire_tasks", {"status": status}, count) for status, count in statuses.items()]),
+        ("forestfire_batches", "gauge", "Detection batches held in memory",
+         [("forestfire_batches", {}, len(detection_batches))]),
+        ("forestfire_stored_detections", "gauge", "Detections in the searchable history store",
+         [("forestfire_stored_detections", {}, get_detection_store(DETECTION_STORE_PATH).count())]),
+        ("forestfire_stored_hotspots", "gauge", "FIRMS hotspots in the hotspot store",
+         [("forestfire_stored_hotspots", {"source": source}, get_hotspot_store(HOTSPOT_STORE_PATH).count(source))
+          for source in HOTSPOT_SOURCES]),
+        ("forestfire_cache_hits_total", "counter", "Cache hits",
+         [("forestfire_cache_hits_total", {"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("forestfire_cache_misses_total", "counter", "Cache misses",
+         [("forestfire_cache_misses_total", {"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("forestfire_cache_hit_ratio", "gauge", "Cache hit ratio since start",
+         [("forestfire_cache_hit_ratio", {"cache": name}, stats["hit_ratio"]) for name, stats in caches.items()]),
+        ("forestfire_cache_entries", "gauge", "Cached entries",
+         [("forestfire_cache_entries", {"cache": name}, stats["entries"]) for name, stats in caches.items()])
+    ]
+
+
+if METRICS_ENABLED:
+    REGISTRY.register_collector(collect_service_metrics)
+
+
 @app.post("/api/v1/detect", response_model=DetectionResponse)
-async def detect_fires(request: DetectionRequest, background_tasks: BackgroundTasks):
+async def detect_fires(request: DetectionRequest, http_request: Request):
     """
     Start a fire detection analysis.
     
-    This endpoint initiates a background fire detection task and returns
-    a request ID for tracking progress.
+    This endpoint queues a background fire detection task and returns
+    a request ID for tracking progress. Requests are rejected with 429
+    when the client has too many active jobs and with 503 when the
+    scheduler queue is full.
     """
     try:
         # Generate request ID
-        request_id = f"detection_{int(datetime.now().timestamp())}"
+        request_id = f"detection_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
         
         # Validate request
-        if len(request.bounds) != 4:
-            raise HTTPException(status_code=400, detail="Bounds must contain 4 values: [min_lon, min_lat, max_lon, max_lat]")
-        
-        if request.bounds[0] >= request.bounds[2] or request.bounds[1] >= request.bounds[3]:
-            raise HTTPException(status_code=400, detail="Invalid bounds: min values must be less than max values")
+        try:
+            priority = validate_detection_request(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         # Initialize task status
         detection_tasks[request_id] = {
-            "status": "processing",
+            "status": "queued",
             "progress": 0.0,
-            "message": "Starting detection...",
+            "message": "Waiting for a detection worker...",
             "timestamp": datetime.now(),
             "request": request.dict(),
+            "priority": priority,
             "results": None
         }
         
-        # Start background task
-        background_tasks.add_task(
-            run_detection_task,
-            request_id,
-            request
-        )
+        # Queue background task
+        try:
+            position = scheduler.submit(
+                request_id,
+                client_key(http_request.scope),
+                priority,
+                lambda: run_detection_task(request_id, request),
+                on_error=mark_task_failed
+            )
+        except AdmissionError as e:
+            del detection_tasks[request_id]
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.detail,
+                headers={"Retry-After": str(e.retry_after)}
+            )
         
         return DetectionResponse(
             request_id=request_id,
-            status="processing",
+            status="queued",
             timestamp=datetime.now(),
             detections=[],
             summary={},
-            metadata={"message": "Detection task started"}
+            metadata={
+                "message": "Detection task queued",
+                "priority": priority,
+                "queue_position": position
+            }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting detection: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def validate_detection_request(request: DetectionRequest) -> str:
+    """
+    Check request bounds and resolve its priority class.
+    
+    Raises:
+        ValueError: If the bounds or priority are invalid
+    """
+    if len(request.bounds) != 4:
+        raise ValueError("Bounds must contain 4 values: [min_lon, min_lat, max_lon, max_lat]")
+    
+    if request.bounds[0] >= request.bounds[2] or request.bounds[1] >= request.bounds[3]:
+        raise ValueError("Invalid bounds: min values must be less than max values")
+    
+    return classify_priority(request.bounds, request.priority)
+
+
+@app.post("/api/v1/detect/batch")
+async def detect_fires_batch(batch: BatchDetectionRequest, http_request: Request):
+    """
+    Start fire detection for many AOIs as one grouped job.
+    
+    Identical AOIs are run once and share a request ID; overlapping AOIs
+    with the same dates and satellite share scene loading. Each item can be
+    tracked through /api/v1/status/{request_id} or the batch as a whole
+    through /api/v1/batch/{batch_id}.
+    """
+    if len(batch.requests) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds the limit of {MAX_BATCH_ITEMS} requests")
+    
+    try:
+        item_priorities = [validate_detection_request(request) for request in batch.requests]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # The batch runs at its explicit priority or that of its most urgent item
+    try:
+        if batch.priority:
+            priority = classify_priority(batch.requests[0].bounds, batch.priority)
+        else:
+            priority = min(item_priorities, key=PRIORITY_CLASSES.get)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    batch_id = f"batch_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
+    plan = plan_batch([request.dict() for request in batch.requests])
+    
+    unique_items = len(set(plan["canonical"]))
+    if unique_items > MAX_BATCH_UNIQUE_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {unique_items} unique AOIs, more than the limit of {MAX_BATCH_UNIQUE_ITEMS}"
+        )
+    
+    # One task per unique AOI; duplicates point at the same request ID
+    request_ids = {}
+    for index in sorted(set(plan["canonical"])):
+        request_id = f"detection_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
+        request_ids[index] = request_id
+        detection_tasks[request_id] = {
+            "status": "queued",
+            "progress": 0.0,
+            "message": "Waiting for a detection worker...",
+            "timestamp": datetime.now(),
+            "request": batch.requests[index].dict(),
+            "priority": priority,
+            "batch_id": batch_id,
+            "results": None
+        }
+    
+    groups = [
+        {"request_ids": [request_ids[i] for i in group], "bounds": bounds}
+        for group, bounds in zip(plan["groups"], plan["group_bounds"])
+    ]
+    detection_batches[batch_id] = {
+        "timestamp": datetime.now(),
+        "priority": priority,
+        "items": [request_ids[c] for c in plan["canonical"]],
+        "groups": groups
+    }
+    requests_by_id = {request_ids[i]: batch.requests[i] for i in request_ids}
+    
+    # Groups run with limited concurrency, so allow one job timeout per wave
+    waves = -(-len(groups) // BATCH_GROUP_CONCURRENCY)
+    # The batch counts against the client's job limit by the groups it runs at once
+    cost = min(len(groups), BATCH_GROUP_CONCURRENCY, scheduler.per_client_limit)
+    try:
+        position = scheduler.submit(
+            batch_id,
+            client_key(http_request.scope),
+            priority,
+            lambda: run_detection_batch(batch_id, requests_by_id),
+            on_error=mark_batch_failed,
+            timeout=scheduler.job_timeout * waves if scheduler.job_timeout else None,
+            cost=cost
+        )
+    except AdmissionError as e:
+        for request_id in request_ids.values():
+            del detection_tasks[request_id]
+        del detection_batches[batch_id]
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    return {
+        "batch_id": batch_id,
+        "status": "queued",
+        "priority": priority,
+        "queue_position": position,
+        "items": len(batch.requests),
+        "unique_items": len(request_ids),
+        "scene_groups": len(groups),
+        "request_ids": detection_batches[batch_id]["items"]
+    }
+
+
+@app.get("/api/v1/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Get the overall and per-item status of a detection batch."""
+    if batch_id not in detection_batches:
+        raise HTTPException(status_code=404, detail="Batch ID not found")
+    
+    batch = detection_batches[batch_id]
+    items = []
+    for index, request_id in enumerate(batch["items"]):
+        task = detection_tasks.get(request_id, {})
+        results = task.get("results") or {}
+        items.append({
+            "index": index,
+            "request_id": request_id,
+            "status": task.get("status", "unknown"),
+            "progress": task.get("progress", 0.0),
+            "detections": len(results.get("detections", [])) if results else None,
+            "error": task.get("error")
+        })
+    
+    unique = {item["request_id"]: item for item in items}.values()
+    counts = {}
+    for item in items:
+        counts[item["status"]] = counts.get(item["status"], 0) + 1
+    
+    return {
+        "batch_id": batch_id,
+        "status": batch_status([item["status"] for item in unique]),
+        "progress": sum(item["progress"] for item in unique) / max(len(unique), 1),
+        "priority": batch["priority"],
+        "timestamp": batch["timestamp"],
+        "counts": counts,
+        "scene_groups": len(batch["groups"]),
+        "items": items
+    }
+
+
 @app.get("/api/v1/status/{request_id}", response_model=StatusResponse)
 async def get_detection_status(request_id: str):
     """Get the status of a detection task."""
@@ -174,14 +762,30 @@ async def get_detection_status(request_id: str):
 
 
 @app.get("/api/v1/results/{request_id}", response_model=DetectionResponse)
-async def get_detection_results(request_id: str):
+async def get_detection_results(
+    request_id: str,
+    request: Request,
+    format: Optional[str] = Query(default=None, description="json, geojson (streamed FeatureCollection) or ndjson"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated detection fields, e.g. id,centroid,area_ha,confidence"),
+    geometry: str = Query(default="full", description="Geometry detail: full, simplified, centroid or none"),
+    tolerance: Optional[float] = Query(default=None, gt=0, description="Simplification tolerance in meters (geometry=simplified)"),
+    zoom: Optional[int] = Query(default=None, ge=0, le=22, description="Client map zoom; serves the matching geometry level"),
+    limit: Optional[int] = Query(default=None, ge=1, le=10000, description="Maximum detections per page"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from the previous page")
+):
     """Get the results of a completed detection task."""
+    try:
+        output = response_format(format, request.headers.get("accept"))
+        geometry_mode = parse_geometry_mode(geometry)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     if request_id not in detection_tasks:
         raise HTTPException(status_code=404, detail="Request ID not found")
     
     task = detection_tasks[request_id]
     
-    if task["status"] == "processing":
+    if task["status"] in ("queued", "processing"):
         raise HTTPException(status_code=202, detail="Detection still in progress")
     
     if task["status"] == "failed":
@@ -190,94 +794,389 @@ async def get_detection_results(request_id: str):
     if task["results"] is None:
         raise HTTPException(status_code=500, detail="No results available")
     
-    return DetectionResponse(
-        request_id=request_id,
-        status=task["status"],
-        timestamp=task["timestamp"],
-        detections=task["results"]["detections"],
-        summary=task["results"]["summary"],
-        metadata=task["results"]["metadata"]
+    results = task["results"]
+    
+    # Completed results never change, so the tag only depends on the representation asked for
+    headers = cache_headers(
+        make_etag("results", request_id, task["timestamp"], output, fields, geometry_mode, tolerance, zoom, limit, cursor),
+        CACHE_POLICIES.get("results"),
+        last_modified=task["timestamp"],
+        vary="Accept"
+    )
+    if is_not_modified(request.headers, headers["ETag"], task["timestamp"]):
+        return not_modified(headers)
+    
+    try:
+        page, next_cursor = paginate(results["detections"], limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Project each detection only when it is about to be encoded
+    field_list = parse_fields(fields)
+    bounds = task["request"]["bounds"]
+    tolerance_deg = meters_to_degrees(
+        tolerance or get_setting('detection.spatial.simplify_tolerance', 10),
+        (bounds[1] + bounds[3]) / 2
     )
+    
+    def projected_chunks():
+        for chunk in chunked(page):
+            yield [project_detection(detection, field_list, geometry_mode, tolerance_deg, zoom) for detection in chunk]
+    
+    if output == "ndjson":
+        return StreamingResponse(iter_ndjson(projected_chunks()), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    
+    if output == "geojson":
+        features = (
+            [
+                {
+                    "type": "Feature",
+                    "geometry": detection.pop("geometry", None),
+                    "properties": detection
+                }
+                for detection in chunk
+            ]
+            for chunk in projected_chunks()
+        )
+        members = {
+            "request_id": request_id,
+            "status": task["status"],
+            "timestamp": task["timestamp"],
+            "summary": results["summary"],
+            "metadata": results["metadata"],
+            "total_detections": len(results["detections"]),
+            "next_cursor": next_cursor
+        }
+        return StreamingResponse(iter_geojson(features, members), media_type=GEOJSON_MEDIA_TYPE, headers=headers)
+    
+    # Serialize directly, skipping the response model round trip
+    return FastJSONResponse({
+        "request_id": request_id,
+        "status": task["status"],
+        "timestamp": task["timestamp"],
+        "detections": [detection for chunk in projected_chunks() for detection in chunk],
+        "summary": results["summary"],
+        "metadata": results["metadata"],
+        "total_detections": len(results["detections"]),
+        "next_cursor": next_cursor
+    }, headers=headers)
 
 
 @app.get("/api/v1/hotspots")
 async def get_hotspots(
+    request: Request,
     bounds: List[float] = Query(..., description="[min_lon, min_lat, max_lon, max_lat]"),
     start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
     end_date: str = Query(..., description="End date in YYYY-MM-DD format"),
-    source: str = Query(default="viirs", description="Hotspot source: 'viirs' or 'modis'")
+    source: str = Query(default="viirs", description="Hotspot source: 'viirs' or 'modis'"),
+    count: Optional[int] = Query(default=None, ge=0, le=MAX_SYNTHETIC_HOTSPOTS,
+                                 description="Exact number of hotspots to synthesize (load testing)"),
+    format: Optional[str] = Query(default=None, description="json, geojson (streamed FeatureCollection) or ndjson")
 ):
     """Get thermal hotspots for a given area and time period."""
     try:
-        # Create deterministic seed for consistency
-        seed_string = f"hotspots_{bounds}_{start_date}_{end_date}_{source}"
-        seed = hash(seed_string) % (2**32)
-        
-        # Use deterministic pseudo-random generation
-        def seeded_random(min_val, max_val, index=0):
-            x = (seed + index * 12345) % 2147483647
-            x = (x * 1103515245 + 12345) % 2147483647
-            return min_val + (x % 1000) / 1000.0 * (max_val - min_val)
-        
-        # Get realistic fire zones for this area
-        fire_zones = get_realistic_fire_zones(bounds)
-        
-        # Generate realistic number of hotspots based on area and fire zones
-        area_size = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
-        base_hotspots = len(fire_zones) * 2 if fire_zones else 1
-        max_hotspots = min(15, max(0, int(base_hotspots + area_size * 50)))
-        num_hotspots = int(seeded_random(0, max_hotspots + 1, 0))
-        
-        hotspots = []
-        
-        for i in range(num_hotspots):
-            # Place hotspots in realistic fire zones when possible
-            if fire_zones and i < len(fire_zones) * 2:
-                zone = fire_zones[i % len(fire_zones)]
-                lon = zone['center'][0] + seeded_random(-0.01, 0.01, i * 2)
-                lat = zone['center'][1] + seeded_random(-0.01, 0.01, i * 2 + 1)
-            else:
-                # Fallback to deterministic land location
-                lon, lat = get_deterministic_land_location(bounds, seed, i)
+        output = response_format(format, request.headers.get("accept"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Ingested FIRMS data is served when present; explicit counts are always synthesized
+    store = get_hotspot_store(HOTSPOT_STORE_PATH)
+    loop = asyncio.get_running_loop()
+    has_data, version = await loop.run_in_executor(None, hotspot_store_state, source)
+    use_store = count is None and has_data
+    
+    # Hotspots are a pure function of the query (and the store contents), so its hash is the entity tag
+    store_version = version if use_store else None
+    cache_key = stable_key("hotspots", bounds, start_date, end_date, source, count, store_version)
+    headers = cache_headers(make_etag(cache_key, output), CACHE_POLICIES.get("hotspots"), vary="Accept")
+    if is_not_modified(request.headers, headers["ETag"]):
+        return not_modified(headers)
+    
+    try:
+        # Serve repeated queries from the cache
+        cached = hotspot_cache.get(cache_key)
+        if cached is not None:
+            feature_chunks = chunked(cached["features"])
+            metadata = cached["metadata"]
+        elif use_store:
+            try:
+                start, end = date_range(start_date, end_date)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            # One extra row tells whether the result was truncated
+            hotspots = await loop.run_in_executor(
+                None, lambda: store.query(bounds, start, end, source, limit=MAX_SYNTHETIC_HOTSPOTS + 1)
+            )
+            truncated = len(hotspots["id"]) > MAX_SYNTHETIC_HOTSPOTS
+            if truncated:
+                hotspots = {name: values[:MAX_SYNTHETIC_HOTSPOTS] for name, values in hotspots.items()}
+            metadata = {
+                "cache_key": cache_key,
+                "data_source": "firms",
+                "store_version": store_version,
+                "truncated": truncated
+            }
+            feature_chunks = hotspot_feature_chunks(hotspots, stored_hotspot_features, cache_key, metadata)
+        else:
+            # Create deterministic seed, stable across processes and restarts
+            seed_string = f"hotspots_{bounds}_{start_date}_{end_date}_{source}"
+            seed = stable_seed(seed_string)
             
-            # Realistic hotspot properties
-            confidence = get_deterministic_confidence(source, seeded_random(0, 30, i * 10), seed, i)
-            brightness = get_deterministic_brightness_temp(lat, start_date, seed, i)
-            frp = get_deterministic_frp(lat, start_date, seed, i)
+            # Get realistic fire zones for this area
+            fire_zones = get_realistic_fire_zones(bounds)
+            area_size = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
             
-            hotspot = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [lon, lat]
-                },
-                "properties": {
-                    "id": f"hotspot_{i}_{seed}_{i}",
-                    "confidence": confidence,
-                    "brightness": brightness,
-                    "frp": frp,  # Fire Radiative Power
-                    "date": start_date,
-                    "source": source,
-                    "location": get_location_name(lon, lat)
-                }
-            }
-            hotspots.append(hotspot)
-        
-        return {
-            "type": "FeatureCollection",
-            "features": hotspots,
-            "metadata": {
+            # Generate all hotspot attributes as arrays in one pass
+            hotspots = generate_hotspots(bounds, start_date, source, seed, fire_zones, count)
+            metadata = {
                 "seed": seed,
+                "cache_key": cache_key,
                 "fire_zones_used": len(fire_zones),
                 "area_size": area_size
             }
-        }
+            feature_chunks = hotspot_feature_chunks(
+                hotspots, lambda chunk: hotspot_features(chunk, start_date, source, seed), cache_key, metadata
+            )
+        
+        if output == "ndjson":
+            return StreamingResponse(iter_ndjson(feature_chunks), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+        if output == "geojson":
+            return StreamingResponse(
+                iter_geojson(feature_chunks, {"metadata": metadata}), media_type=GEOJSON_MEDIA_TYPE, headers=headers
+            )
+        
+        return FastJSONResponse({
+            "type": "FeatureCollection",
+            "features": [feature for chunk in feature_chunks for feature in chunk],
+            "metadata": metadata
+        }, headers=headers)
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving hotspots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def hotspot_store_state(source: str) -> Tuple[bool, int]:
+    """
+    Whether FIRMS hotspots of ``source`` are stored, and the store version.
+    
+    Both wait for the store lock, which queries and ingests hold for seconds,
+    so async handlers call this in an executor.
+    """
+    store = get_hotspot_store(HOTSPOT_STORE_PATH)
+    return store.has_data(source), store.version
+
+
+def date_range(start_date: Optional[str], end_date: Optional[str]):
+    """Epoch-second bounds of a query (None when open); a date-only end includes that whole day."""
+    start = to_timestamp(start_date) if start_date is not None else None
+    end = None
+    if end_date is not None:
+        end = to_timestamp(end_date)
+        if len(end_date) == 10:
+            end += 86400 - 1
+    return start, end
+
+
+def stored_hotspot_features(hotspots: Dict[str, np.ndarray], locations: bool = True) -> List[Dict]:
+    """Convert hotspot store query results into GeoJSON features (``locations`` adds place names)."""
+    if locations:
+        names = get_gazetteer().names_for(hotspots["lon"], hotspots["lat"])
+    else:
+        names = [None] * len(hotspots["id"])
+    features = []
+    for rowid, source, satellite, acquired, lon, lat, confidence, brightness, frp, name in zip(
+        hotspots["id"].tolist(), hotspots["source"].tolist(), hotspots["satellite"].tolist(),
+        hotspots["acquired"].tolist(), hotspots["lon"].tolist(), hotspots["lat"].tolist(),
+        hotspots["confidence"].tolist(), hotspots["brightness"].tolist(), hotspots["frp"].tolist(), names
+    ):
+        acquired_at = datetime.fromtimestamp(acquired, timezone.utc)
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [lon, lat]
+            },
+            "properties": {
+                "id": f"firms_{source}_{rowid}",
+                # Unknown values are NaN in the arrays and null in JSON
+                "confidence": None if confidence != confidence else round(confidence, 2),
+                "brightness": None if brightness != brightness else round(brightness, 2),
+                "frp": None if frp != frp else round(frp, 2),  # Fire Radiative Power
+                "date": acquired_at.strftime("%Y-%m-%d"),
+                "acquired": acquired_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "source": source,
+                "satellite": satellite,
+                "location": name
+            }
+        })
+    return features
+
+
+def hotspot_feature_chunks(hotspots: Dict[str, np.ndarray], make_features, cache_key: str,
+                           metadata: Dict[str, Any]):
+    """Build hotspot features chunk by chunk, caching the full collection once complete."""
+    features = []
+    for start in range(0, len(hotspots["lat"]), STREAM_CHUNK_FEATURES):
+        chunk = make_features(
+            {name: values[start:start + STREAM_CHUNK_FEATURES] for name, values in hotspots.items()}
+        )
+        features.extend(chunk)
+        yield chunk
+    
+    response = {"type": "FeatureCollection", "features": features, "metadata": metadata}
+    hotspot_cache.put(cache_key, response, weight=len(features) + 1)
+
+
+@app.get("/api/v1/detections")
+async def search_detections(
+    bounds: List[float] = Query(..., description="[min_lon, min_lat, max_lon, max_lat]"),
+    start_date: Optional[str] = Query(default=None, description="Earliest detection time (YYYY-MM-DD or ISO 8601)"),
+    end_date: Optional[str] = Query(default=None, description="Latest detection time (YYYY-MM-DD or ISO 8601)"),
+    min_confidence: float = Query(default=0.0, ge=0.0, le=1.0, description="Minimum detection confidence"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from the previous page")
+):
+    """Search stored detections by bounding box, time range and confidence."""
+    if len(bounds) != 4:
+        raise HTTPException(status_code=400, detail="Bounds must contain 4 values: [min_lon, min_lat, max_lon, max_lat]")
+    
+    try:
+        start, end = date_range(start_date, end_date)
+        # The store query blocks on SQLite, so it runs off the event loop
+        page = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: get_detection_store(DETECTION_STORE_PATH).query(bounds, start, end, min_confidence, limit, cursor)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": detection.pop("geometry"),
+                "properties": {k: v for k, v in detection.items() if k != "geometry_levels"}
+            }
+            for detection in page["detections"]
+        ],
+        "next_cursor": page["next_cursor"]
+    }
+
+
+@app.get("/tiles/{z}/{x}/{y}")
+async def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    layers: str = Query(default="detections,hotspots", description="Comma-separated layers: detections, hotspots"),
+    start_date: Optional[str] = Query(default=None, description="Earliest detection / hotspot date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(default=None, description="Latest detection / hotspot date (YYYY-MM-DD)"),
+    min_confidence: float = Query(default=0.0, ge=0.0, le=1.0, description="Minimum detection confidence"),
+    source: str = Query(default="viirs", description="Hotspot source: 'viirs' or 'modis'")
+):
+    """Detections and hotspots as a Mapbox Vector Tile for the web map."""
+    try:
+        validate_tile(z, x, y)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    layer_names = sorted(set(name.strip() for name in layers.split(",") if name.strip()))
+    unknown = set(layer_names) - {"detections", "hotspots"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown layers: {', '.join(sorted(unknown))}")
+    
+    # Without a start date, hotspot layers show the current day
+    hotspot_date = (start_date or datetime.now().strftime("%Y-%m-%d")) if "hotspots" in layer_names else None
+    
+    # Ingested FIRMS data is drawn when present, like the hotspots endpoint; the stores are read off the loop
+    loop = asyncio.get_running_loop()
+    has_data, hotspot_version = await loop.run_in_executor(None, hotspot_store_state, source)
+    stored_hotspots = hotspot_date is not None and has_data
+    detection_version = await loop.run_in_executor(None, lambda: get_detection_store(DETECTION_STORE_PATH).version)
+    
+    # Tiles are versioned by both stores so that either ingesting new data invalidates them
+    version = f"{detection_version}.{hotspot_version}"
+    cache_key = stable_key("tile", z, x, y, layer_names, start_date, end_date, min_confidence, source, hotspot_date,
+                           stored_hotspots)
+    headers = cache_headers(make_etag(cache_key, version), CACHE_POLICIES.get("tiles"))
+    if is_not_modified(request.headers, headers["ETag"]):
+        return not_modified(headers)
+    
+    # Tile cache lookups may read, write and prune files
+    data = await loop.run_in_executor(None, tile_cache.get, cache_key, version)
+    cache_status = "hit"
+    
+    if data is None:
+        cache_status = "miss"
+        try:
+            data = await loop.run_in_executor(
+                None, build_map_tile, z, x, y, layer_names, start_date, end_date, min_confidence, source,
+                hotspot_date, stored_hotspots
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await loop.run_in_executor(None, tile_cache.put, cache_key, version, data)
+    
+    return Response(content=data, media_type=MVT_MEDIA_TYPE, headers={**headers, "X-Tile-Cache": cache_status})
+
+
+def build_map_tile(z: int, x: int, y: int, layer_names: List[str], start_date: Optional[str],
+                   end_date: Optional[str], min_confidence: float, source: str,
+                   hotspot_date: Optional[str] = None, stored_hotspots: bool = False) -> bytes:
+    """Query the features overlapping a tile and encode them as MVT (hotspots of ``hotspot_date``).
+    
+    With ``stored_hotspots`` the hotspot layer comes from the FIRMS hotspot store
+    instead of being synthesized.
+    """
+    layers = {}
+    
+    if "detections" in layer_names:
+        start, end = date_range(start_date, end_date)
+        page = get_detection_store(DETECTION_STORE_PATH).query(
+            tile_bounds(z, x, y, buffer=TILE_QUERY_BUFFER), start, end, min_confidence, limit=MAX_TILE_FEATURES
+        )
+        layers["detections"] = [
+            {"type": "Feature", "geometry": select_geometry(detection, z), "properties": detection}
+            for detection in page["detections"]
+        ]
+    
+    if "hotspots" in layer_names:
+        bounds = tile_bounds(z, x, y)
+        hotspot_date = hotspot_date or start_date or datetime.now().strftime("%Y-%m-%d")
+        if stored_hotspots:
+            start, end = date_range(hotspot_date, end_date or hotspot_date)
+            hotspots = get_hotspot_store(HOTSPOT_STORE_PATH).query(bounds, start, end, source, limit=MAX_TILE_FEATURES)
+            layers["hotspots"] = stored_hotspot_features(hotspots, locations=False)
+            return render_tile(layers, z, x, y)
+        seed = stable_seed(f"tile_hotspots_{z}_{x}_{y}_{hotspot_date}_{end_date}_{source}")
+        hotspots = generate_hotspots(bounds, hotspot_date, source, seed, get_realistic_fire_zones(bounds))
+        layers["hotspots"] = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {
+                    "id": f"hotspot_{i}_{seed}_{i}",
+                    "confidence": confidence,
+                    "brightness": brightness,
+                    "frp": frp,
+                    "date": hotspot_date,
+                    "source": source
+                }
+            }
+            for i, lon, lat, confidence, brightness, frp in zip(
+                hotspots["index"].tolist(), hotspots["lon"].tolist(), hotspots["lat"].tolist(),
+                hotspots["confidence"].tolist(), hotspots["brightness"].tolist(), hotspots["frp"].tolist()
+            )
+        ]
+    
+    return render_tile(layers, z, x, y)
+
+
 @app.get("/api/v1/satellite-data")
 async def get_satellite_data(
     bounds: List[float] = Query(..., description="[min_lon, min_lat, max_lon, max_lat]"),
@@ -317,36 +1216,28 @@ async def get_satellite_data(
 
 
 @app.get("/api/v1/regions")
-async def get_regions():
+async def get_regions(request: Request):
     """Get available geographic regions."""
-    regions = {
-        "california": {
-            "name": "California, USA",
-            "bounds": [-124.5, 32.5, -114.0, 42.0],
-            "center": [36.7783, -119.4179],
-            "zoom": 6,
-            "description": "California wildfire monitoring region"
-        },
-        "australia": {
-            "name": "Australia",
-            "bounds": [113.0, -44.0, 154.0, -10.0],
-            "center": [-25.2744, 133.7751],
-            "zoom": 4,
-            "description": "Australian bushfire monitoring region"
-        },
-        "global": {
-            "name": "Global Monitoring",
-            "bounds": [-180.0, -90.0, 180.0, 90.0],
-            "center": [20.0, 0.0],
-            "zoom": 2,
-            "description": "Global fire monitoring"
-        }
-    }
+    headers = cache_headers(REGIONS_ETAG, CACHE_POLICIES.get("regions"), last_modified=REGIONS_MODIFIED)
+    if is_not_modified(request.headers, REGIONS_ETAG, REGIONS_MODIFIED):
+        return not_modified(headers)
     
-    return {
-        "regions": regions,
-        "count": len(regions)
-    }
+    return FastJSONResponse({
+        "regions": REGIONS,
+        "count": len(REGIONS)
+    }, headers=headers)
+
+
+def detection_seed(request: DetectionRequest) -> int:
+    """Deterministic seed for a request, stable across processes and restarts."""
+    seed_string = f"{request.bounds}_{request.start_date}_{request.end_date}_{request.satellite}_{request.max_cloud_cover}"
+    return stable_seed(seed_string)
+
+
+def update_task(request_id: str, progress: float, message: str):
+    """Record progress of a running detection task."""
+    detection_tasks[request_id]["progress"] = progress
+    detection_tasks[request_id]["message"] = message
 
 
 async def run_detection_task(request_id: str, request: DetectionRequest):
@@ -357,63 +1248,128 @@ async def run_detection_task(request_id: str, request: DetectionRequest):
     the task status as it progresses.
     """
     try:
-        # Create a deterministic seed based on request parameters for consistency
-        # Use a more reliable deterministic hash function
-        seed_string = f"{request.bounds}_{request.start_date}_{request.end_date}_{request.satellite}_{request.max_cloud_cover}"
+        detection_tasks[request_id]["status"] = "processing"
+        detection_tasks[request_id]["message"] = "Starting detection..."
         
-        # Simple but reliable deterministic hash
-        seed = 0
-        for char in seed_string:
-            seed = ((seed << 5) + seed + ord(char)) & 0xFFFFFFFF
-        seed = seed % (2**32)  # Ensure positive seed
+        # Create a deterministic seed based on request parameters for consistency
+        seed = detection_seed(request)
         
         # Set the random seed for this task
         random.seed(seed)
         
         # Update status
-        detection_tasks[request_id]["progress"] = 0.1
-        detection_tasks[request_id]["message"] = "Retrieving satellite data..."
+        update_task(request_id, 0.1, "Retrieving satellite data...")
         detection_tasks[request_id]["seed"] = seed  # Store seed immediately
         
         # Simulate processing time
-        await asyncio.sleep(2)
+        with stage_timer("scene_retrieval"):
+            await asyncio.sleep(2)
         
-        # Update status
-        detection_tasks[request_id]["progress"] = 0.5
-        detection_tasks[request_id]["message"] = "Processing satellite data..."
-        
-        await asyncio.sleep(2)
-        
-        # Update status
-        detection_tasks[request_id]["progress"] = 0.8
-        detection_tasks[request_id]["message"] = "Analyzing spectral indices..."
-        
-        await asyncio.sleep(1)
-        
-        # Create mock detection results with the same seed
-        mock_results = create_mock_detection_results(request, seed)
-        
-        # Debug logging
-        logger.info(f"Mock results created: {len(mock_results.get('detections', []))} detections")
-        logger.info(f"Mock metadata seed: {mock_results.get('metadata', {}).get('seed', 'N/A')}")
-        logger.info(f"Task seed: {seed}")
-        
-        # Update status
-        detection_tasks[request_id]["progress"] = 1.0
-        detection_tasks[request_id]["status"] = "completed"
-        detection_tasks[request_id]["message"] = "Detection completed successfully"
-        detection_tasks[request_id]["results"] = mock_results
-        detection_tasks[request_id]["timestamp"] = datetime.now()
-        
-        logger.info(f"Detection task {request_id} completed successfully with seed {seed}")
+        await analyze_detection_task(request_id, request, seed)
         
     except Exception as e:
         logger.error(f"Error in detection task {request_id}: {e}")
+        DETECTION_JOBS.inc(status="failed")
         detection_tasks[request_id]["status"] = "failed"
         detection_tasks[request_id]["error"] = str(e)
         detection_tasks[request_id]["timestamp"] = datetime.now()
 
 
+async def analyze_detection_task(request_id: str, request: DetectionRequest, seed: int):
+    """Run detection on already retrieved scenes and store the results."""
+    # Update status
+    update_task(request_id, 0.5, "Processing satellite data...")
+    
+    with stage_timer("preprocessing"):
+        await asyncio.sleep(2)
+    
+    # Update status
+    update_task(request_id, 0.8, "Analyzing spectral indices...")
+    
+    with stage_timer("analysis"):
+        await asyncio.sleep(1)
+        
+        # Create mock detection results with the same seed
+        mock_results = await execution_engine.run(create_mock_detection_results, request, seed)
+    
+    # Debug logging
+    logger.info(f"Mock results created: {len(mock_results.get('detections', []))} detections")
+    logger.info(f"Mock metadata seed: {mock_results.get('metadata', {}).get('seed', 'N/A')}")
+    logger.info(f"Task seed: {seed}")
+    
+    # Update status
+    detection_tasks[request_id]["progress"] = 1.0
+    detection_tasks[request_id]["status"] = "completed"
+    detection_tasks[request_id]["message"] = "Detection completed successfully"
+    detection_tasks[request_id]["results"] = mock_results
+    detection_tasks[request_id]["result_bytes"] = estimate_result_bytes(mock_results)
+    detection_tasks[request_id]["timestamp"] = datetime.now()
+    DETECTION_JOBS.inc(status="completed")
+    prune_detection_tasks()
+    
+    # Index the detections for later bounding box / time queries
+    try:
+        with stage_timer("storage"):
+            get_detection_store(DETECTION_STORE_PATH).ingest(mock_results["detections"], request_id)
+    except Exception as e:
+        logger.error(f"Failed to store detections for {request_id}: {e}")
+    
+    logger.info(f"Detection task {request_id} completed successfully with seed {seed}")
+
+
+async def run_detection_batch(batch_id: str, requests_by_id: Dict[str, DetectionRequest]):
+    """
+    Background job running every unique AOI of a batch.
+    
+    Scenes are retrieved once per group of overlapping AOIs; the AOIs of a
+    group are then analyzed concurrently. A failing item does not affect
+    the rest of the batch.
+    """
+    semaphore = asyncio.Semaphore(BATCH_GROUP_CONCURRENCY)
+    
+    async def run_item(request_id: str):
+        request = requests_by_id[request_id]
+        try:
+            await analyze_detection_task(request_id, request, detection_tasks[request_id]["seed"])
+        except Exception as e:
+            logger.error(f"Error in batch {batch_id} item {request_id}: {e}")
+            mark_task_failed(request_id, e)
+    
+    async def run_group(group: Dict[str, Any]):
+        async with semaphore:
+            request_ids = group["request_ids"]
+            for request_id in request_ids:
+                detection_tasks[request_id]["status"] = "processing"
+                detection_tasks[request_id]["seed"] = detection_seed(requests_by_id[request_id])
+                update_task(request_id, 0.1, f"Retrieving satellite data (shared by {len(request_ids)} AOIs)...")
+            
+            # Scenes covering the group's union bounds are retrieved once
+            await asyncio.sleep(2)
+            
+            await asyncio.gather(*(run_item(request_id) for request_id in request_ids))
+    
+    await asyncio.gather(*(run_group(group) for group in detection_batches[batch_id]["groups"]))
+    logger.info(f"Detection batch {batch_id} finished ({len(requests_by_id)} AOIs)")
+
+
+def mark_batch_failed(batch_id: str, error: Exception):
+    """Fail every unfinished item of a batch (e.g. after a timeout)."""
+    for request_id in set(detection_batches.get(batch_id, {}).get("items", [])):
+        mark_task_failed(request_id, error)
+
+
+def mark_task_failed(request_id: str, error: Exception):
+    """Record a job failure reported by the scheduler (e.g. a timeout)."""
+    task = detection_tasks.get(request_id)
+    if task is None or task["status"] in FINISHED_STATUSES:
+        return
+    DETECTION_JOBS.inc(status="failed")
+    task["status"] = "failed"
+    task["error"] = str(error) or type(error).__name__
+    task["timestamp"] = datetime.now()
+    prune_detection_tasks()
+
+
 def create_mock_detection_results(request: DetectionRequest, seed: int) -> Dict:
     """
     Create realistic mock detection results for demonstration purposes.
@@ -444,11 +1400,7 @@ def create_mock_detection_results(request: DetectionRequest, seed: int) -> Dict:
     area_size = (request.bounds[2] - request.bounds[0]) * (request.bounds[3] - request.bounds[1])
     
     # Use a more deterministic approach based on area size and seed
-    # Simple but reliable deterministic hash for area
-    area_hash = 0
-    for char in str(area_size):
-        area_hash = ((area_hash << 5) + area_hash + ord(char)) & 0xFFFFFFFF
-    area_hash = area_hash % 1000
+    area_hash = stable_hash(area_size) % 1000
     
     seed_mod = seed % 1000
     
@@ -492,24 +1444,27 @@ def create_mock_detection_results(request: DetectionRequest, seed: int) -> Dict:
         # Realistic spectral indices
         indices = get_deterministic_spectral_indices(lat, request.start_date, seed, i)
         
+        geometry = {
+            "type": "Polygon",
+            "coordinates": [[
+                [lon - 0.005, lat - 0.005],
+                [lon + 0.005, lat - 0.005],
+                [lon + 0.005, lat + 0.005],
+                [lon - 0.005, lat + 0.005],
+                [lon - 0.005, lat - 0.005]
+            ]]
+        }
+        
         detection = {
             "id": f"fire_{i}_{seed}_{i}",
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [[
-                    [lon - 0.005, lat - 0.005],
-                    [lon + 0.005, lat - 0.005],
-                    [lon + 0.005, lat + 0.005],
-                    [lon - 0.005, lat + 0.005],
-                    [lon - 0.005, lat - 0.005]
-                ]]
-            },
+            "geometry": geometry,
             "area_m2": fire_size,
             "area_ha": fire_size / 10000,
             "confidence": confidence,
             "timestamp": datetime.now().isoformat(),
             "location": get_location_name(lon, lat),
             "indices": indices,
+            "geometry_levels": build_geometry_levels(geometry, GEOMETRY_ZOOM_LEVELS),
             "metadata": {
                 "satellite": request.satellite,
                 "cloud_cover": seeded_random(0, request.max_cloud_cover or 40, i * 10),
@@ -520,7 +1475,7 @@ def create_mock_detection_results(request: DetectionRequest, seed: int) -> Dict:
     
     # Calculate summary
     total_area_ha = sum(d["area_ha"] for d in detections)
-    mean_confidence = np.mean([d["confidence"] for d in detections]) if detections else 0
+    mean_confidence = fmean(d["confidence"] for d in detections) if detections else 0
     
     summary = {
         "total_events": len(detections),
@@ -592,81 +1547,8 @@ def get_realistic_fire_zones(bounds):
 
 def get_land_location(bounds):
     """Get a realistic land location, avoiding major water bodies."""
-    
-    def is_in_water(lon, lat):
-        """Check if coordinates are in water using comprehensive detection."""
-        
-        # 1. MAJOR OCEAN BASINS - More precise coverage
-        if (lon < -130 and lat < 60):  # Pacific Ocean (far west)
-            return True
-        if (-80 <= lon < -60 and lat < 60):  # Atlantic Ocean (east coast)
-            return True
-        if (lon >= 120 and lat < 60):  # Indian Ocean (far east)
-            return True
-        if (lat >= 70):  # Arctic Ocean (very far north)
-            return True
-        
-        # 2. SPECIFIC WATER BODIES
-        # North America
-        if (-87.5 <= lon <= -87.0 and 41.5 <= lat <= 42.5):  # Lake Michigan
-            return True
-        if (-122.5 <= lon <= -122.0 and 37.5 <= lat <= 38.5):  # San Francisco Bay
-            return True
-        if (-74.5 <= lon <= -74.0 and 40.5 <= lat <= 41.5):  # New York Bay
-            return True
-        if (-118.5 <= lon <= -118.0 and 33.5 <= lat <= 34.5):  # Santa Monica Bay
-            return True
-        
-        # Australia
-        if (145.0 <= lon <= 145.5 and -38.0 <= lat <= -37.5):  # Port Phillip Bay
-            return True
-        if (151.0 <= lon <= 151.5 and -34.0 <= lat <= -33.5):  # Botany Bay
-            return True
-        
-        # 3. COASTAL MARGINS - Much wider to avoid near-coast areas
-        coastal_margin = 0.2  # 0.2 degrees from coast (much wider)
-        
-        # North America coasts - Only very close to actual coastlines
-        if (lon < -124 and 32 <= lat <= 42):  # California coast (very close)
-            return True
-        if (-75 <= lon <= -70 and 35 <= lat <= 45):  # East Coast (very close)
-            return True
-        
-        # Australia coasts - Only very close to actual coastlines
-        if (113 <= lon <= 115 and -44 <= lat <= -10):  # West Coast (very close)
-            return True
-        if (153 <= lon <= 155 and -44 <= lat <= -10):  # East Coast (very close)
-            return True
-        
-        # Europe coasts - Only very close to actual coastlines
-        if (-5 <= lon <= 5 and 50 <= lat <= 55):  # North Sea (very close)
-            return True
-        if (15 <= lon <= 25 and 35 <= lat <= 45):  # Mediterranean (very close)
-            return True
-        
-        # Asia coasts - Only very close to actual coastlines
-        if (100 <= lon <= 105 and 0 <= lat <= 15):  # Southeast Asia (very close)
-            return True
-        if (135 <= lon <= 140 and 35 <= lat <= 40):  # Japan (very close)
-            return True
-        
-        # 4. MAJOR SEAS AND GULFS
-        if (-5 <= lon <= 5 and 50 <= lat <= 60):  # North Sea
-            return True
-        if (25 <= lon <= 35 and 30 <= lat <= 45):  # Mediterranean
-            return True
-        if (50 <= lon <= 60 and 20 <= lat <= 30):  # Persian Gulf
-            return True
-        if (80 <= lon <= 90 and 5 <= lat <= 20):  # Bay of Bengal
-            return True
-        
-        # 5. ISLAND NATIONS - Avoid placing fires on small islands
-        if (lon < -170 or lon > 170):  # Very far east/west
-            return True
-        if (abs(lat) > 80):  # Very far north/south
-            return True
-        
-        return False
+    land_mask = get_land_mask()
+    is_in_water = land_mask.is_water_point
     
     # Try to find a land location
     max_attempts = 200  # Increased attempts
@@ -812,177 +1694,13 @@ def get_realistic_spectral_indices(lat, start_date):
 
 def get_location_name(lon, lat):
     """Get a realistic location name based on coordinates."""
-    # Major cities and regions for reference
-    locations = [
-        {"coords": [-122.4194, 37.7749], "name": "San Francisco Area"},
-        {"coords": [-118.2437, 34.0522], "name": "Los Angeles Area"},
-        {"coords": [-121.4944, 38.5816], "name": "Sacramento Area"},
-        {"coords": [145.0, -37.0], "name": "Victoria Region"},
-        {"coords": [150.0, -33.0], "name": "New South Wales"},
-        {"coords": [-3.5, -58.4], "name": "Amazon Basin"},
-        {"coords": [65.0, 65.0], "name": "Siberian Region"}
-    ]
-    
-    # Find closest location
-    min_distance = float('inf')
-    closest_name = "Unknown Location"
-    
-    for loc in locations:
-        distance = ((lon - loc["coords"][0])**2 + (lat - loc["coords"][1])**2)**0.5
-        if distance < min_distance:
-            min_distance = distance
-            closest_name = loc["name"]
-    
-    # Add some variation
-    if min_distance < 0.1:  # Within 0.1 degrees
-        return closest_name
-    elif min_distance < 0.5:  # Within 0.5 degrees
-        return f"Near {closest_name}"
-    else:
-        return f"Remote Area ({lon:.2f}, {lat:.2f})"
+    return get_gazetteer().names_for(lon, lat)[0]
 
 
 def get_deterministic_land_location(bounds, seed, index):
     """Get a deterministic land location, avoiding major water bodies."""
-    
-    def is_in_water(lon, lat):
-        """Check if coordinates are in water using comprehensive detection."""
-        
-        # 1. MAJOR OCEAN BASINS - More precise coverage
-        if (lon < -130 and lat < 60):  # Pacific Ocean (far west)
-            return True
-        if (-80 <= lon < -60 and lat < 60):  # Atlantic Ocean (east coast)
-            return True
-        if (lon >= 120 and lat < 60):  # Indian Ocean (far east)
-            return True
-        if (lat >= 70):  # Arctic Ocean (very far north)
-            return True
-        
-        # 2. SPECIFIC WATER BODIES
-        # North America
-        if (-87.5 <= lon <= -87.0 and 41.5 <= lat <= 42.5):  # Lake Michigan
-            return True
-        if (-122.5 <= lon <= -122.0 and 37.5 <= lat <= 38.5):  # San Francisco Bay
-            return True
-        if (-74.5 <= lon <= -74.0 and 40.5 <= lat <= 41.5):  # New York Bay
-            return True
-        if (-118.5 <= lon <= -118.0 and 33.5 <= lat <= 34.5):  # Santa Monica Bay
-            return True
-        
-        # Australia
-        if (145.0 <= lon <= 145.5 and -38.0 <= lat <= -37.5):  # Port Phillip Bay
-            return True
-        if (151.0 <= lon <= 151.5 and -34.0 <= lat <= -33.5):  # Botany Bay
-            return True
-        
-        # 3. COASTAL MARGINS - Much wider to avoid near-coast areas
-        coastal_margin = 0.2  # 0.2 degrees from coast (much wider)
-        
-        # North America coasts - Only very close to actual coastlines
-        if (lon < -124 and 32 <= lat <= 42):  # California coast (very close)
-            return True
-        if (-75 <= lon <= -70 and 35 <= lat <= 45):  # East Coast (very close)
-            return True
-        
-        # Australia coasts - Only very close to actual coastlines
-        if (113 <= lon <= 115 and -44 <= lat <= -10):  # West Coast (very close)
-            return True
-        if (153 <= lon <= 155 and -44 <= lat <= -10):  # East Coast (very close)
-            return True
-        
-        # Europe coasts - Only very close to actual coastlines
-        if (-5 <= lon <= 5 and 50 <= lat <= 55):  # North Sea (very close)
-            return True
-        if (15 <= lon <= 25 and 35 <= lat <= 45):  # Mediterranean (very close)
-            return True
-        
-        # Asia coasts - Only very close to actual coastlines
-        if (100 <= lon <= 105 and 0 <= lat <= 15):  # Southeast Asia (very close)
-            return True
-        if (135 <= lon <= 140 and 35 <= lat <= 40):  # Japan (very close)
-            return True
-        
-        # 4. MAJOR SEAS AND GULFS
-        if (-5 <= lon <= 5 and 50 <= lat <= 60):  # North Sea
-            return True
-        if (25 <= lon <= 35 and 30 <= lat <= 45):  # Mediterranean
-            return True
-        if (50 <= lon <= 60 and 20 <= lat <= 30):  # Persian Gulf
-            return True
-        if (80 <= lon <= 90 and 5 <= lat <= 20):  # Bay of Bengal
-            return True
-        
-        # 5. ISLAND NATIONS - Avoid placing fires on small islands
-        if (lon < -170 or lon > 170):  # Very far east/west
-            return True
-        if (abs(lat) > 80):  # Very far north/south
-            return True
-        
-        return False
-    
-    # Use seed to generate deterministic coordinates
-    def seeded_random(min_val, max_val, idx):
-        x = (seed + index * 12345 + idx * 67890) % 2147483647
-        x = (x * 1103515245 + 12345) % 2147483647
-        return min_val + (x % 1000) / 1000.0 * (max_val - min_val)
-    
-    # Try deterministic locations
-    for attempt in range(20):  # Increased attempts
-        # Generate deterministic coordinates
-        lon = seeded_random(bounds[0], bounds[2], attempt * 2)
-        lat = seeded_random(bounds[1], bounds[3], attempt * 2 + 1)
-        
-        if not is_in_water(lon, lat):
-            return lon, lat
-    
-    # If deterministic attempts fail, try systematic search from center
-    center_lon = (bounds[0] + bounds[2]) / 2
-    center_lat = (bounds[1] + bounds[3]) / 2
-    
-    # Search in expanding circles from center
-    for radius in [0.01, 0.02, 0.05, 0.1, 0.2, 0.5]:
-        for angle in range(0, 360, 15):  # Check every 15 degrees
-            import math
-            test_lon = center_lon + radius * math.cos(math.radians(angle))
-            test_lat = center_lat + radius * math.sin(math.radians(angle))
-            
-            if (bounds[0] <= test_lon <= bounds[2] and 
-                bounds[1] <= test_lat <= bounds[3] and
-                not is_in_water(test_lon, test_lat)):
-                return test_lon, test_lat
-    
-    # Last resort: return a known land location within bounds
-    known_land_locations = [
-        # North America
-        (-120.0, 40.0),  # California
-        (-80.0, 40.0),   # Pennsylvania
-        (-100.0, 40.0),  # Kansas
-        
-        # Europe
-        (0.0, 50.0),     # London area
-        (10.0, 50.0),    # Germany
-        (-5.0, 40.0),    # Spain
-        
-        # Asia
-        (100.0, 40.0),   # China
-        (80.0, 20.0),    # India
-        (135.0, 35.0),   # Japan
-        
-        # Australia
-        (135.0, -25.0),  # Central Australia
-        (145.0, -37.0),  # Victoria
-        (150.0, -33.0),  # New South Wales
-    ]
-    
-    for land_lon, land_lat in known_land_locations:
-        if (bounds[0] <= land_lon <= bounds[2] and 
-            bounds[1] <= land_lat <= bounds[3]):
-            return land_lon, land_lat
-    
-    # Absolute fallback: return center with deterministic offset
-    offset_lon = seeded_random(-0.1, 0.1, index * 100)
-    offset_lat = seeded_random(-0.1, 0.1, index * 100 + 1)
-    return center_lon + offset_lon, center_lat + offset_lat
+    lon, lat = land_locations(bounds, seed, np.array([index]))
+    return float(lon[0]), float(lat[0])
 
 
 def get_deterministic_fire_size(lat, start_date, seed, index):
@@ -1192,6 +1910,8 @@ def get_deterministic_frp(lat, start_date, seed, index):
 
 
 if __name__ == "__main__":
+    import uvicorn
+    
     # Run the API server
     uvicorn.run(
         "simple_main:app",
@@ -0,0 +1,258 @@
+"""
+Vectorized Synthetic Hotspot Generation
+
+This module generates the deterministic demo hotspots served by
+GET /api/v1/hotspots. All coordinates and attributes are produced as NumPy
+arrays in one pass, using the same seeded LCG as the scalar helpers in
+simple_main so that a given seed yields identical hotspots.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.gazetteer import get_gazetteer
+from utils.land_mask import get_land_mask
+
+LCG_MODULUS = 2147483647
+LCG_MULTIPLIER = 1103515245
+LCG_INCREMENT = 12345
+
+# Upper bound on hotspots synthesized for a single request
+MAX_SYNTHETIC_HOTSPOTS = 100000
+
+# Fallback land points used when no sampled candidate is on land
+KNOWN_LAND_LOCATIONS = [
+    (-120.0, 40.0), (-80.0, 40.0), (-100.0, 40.0),
+    (0.0, 50.0), (10.0, 50.0), (-5.0, 40.0),
+    (100.0, 40.0), (80.0, 20.0), (135.0, 35.0),
+    (135.0, -25.0), (145.0, -37.0), (150.0, -33.0)
+]
+
+LAND_ATTEMPTS = 20
+
+
+def seeded_uniform(seed: int, offsets: np.ndarray, min_val, max_val) -> np.ndarray:
+    """
+    Vectorized form of the scalar ``seeded_random`` helpers.
+
+    Args:
+        seed: Request seed
+        offsets: Integer offsets added to the seed (index * 12345 + idx * 67890)
+        min_val: Lower bound (scalar or array)
+        max_val: Upper bound (scalar or array)
+
+    Returns:
+        Array of values in [min_val, max_val)
+    """
+    x = (np.int64(seed) + np.asarray(offsets, dtype=np.int64)) % LCG_MODULUS
+    x = (x * LCG_MULTIPLIER + LCG_INCREMENT) % LCG_MODULUS
+    return min_val + (x % 1000) / 1000.0 * (max_val - min_val)
+
+
+def _land_fallback(bounds) -> Optional[tuple]:
+    """Seed-independent fallback: spiral search from the centre, then known land."""
+    land_mask = get_land_mask()
+    center_lon = (bounds[0] + bounds[2]) / 2
+    center_lat = (bounds[1] + bounds[3]) / 2
+
+    for radius in [0.01, 0.02, 0.05, 0.1, 0.2, 0.5]:
+        angles = np.radians(np.arange(0, 360, 15))
+        test_lon = center_lon + radius * np.cos(angles)
+        test_lat = center_lat + radius * np.sin(angles)
+        ok = ((bounds[0] <= test_lon) & (test_lon <= bounds[2]) &
+              (bounds[1] <= test_lat) & (test_lat <= bounds[3]) &
+              land_mask.is_land(test_lon, test_lat))
+        if ok.any():
+            first = int(np.argmax(ok))
+            return float(test_lon[first]), float(test_lat[first])
+
+    for land_lon, land_lat in KNOWN_LAND_LOCATIONS:
+        if bounds[0] <= land_lon <= bounds[2] and bounds[1] <= land_lat <= bounds[3]:
+            return land_lon, land_lat
+
+    return None
+
+
+def land_locations(bounds, seed: int, indices: np.ndarray):
+    """
+    Vectorized ``get_deterministic_land_location`` for many indices.
+
+    Args:
+        bounds: [min_lon, min_lat, max_lon, max_lat]
+        seed: Request seed
+        indices: Hotspot indices
+
+    Returns:
+        Tuple of (lon, lat) arrays
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    attempts = np.arange(LAND_ATTEMPTS, dtype=np.int64)
+    base = indices[:, None] * 12345
+    lon = seeded_uniform(seed, base + attempts * 2 * 67890, bounds[0], bounds[2])
+    lat = seeded_uniform(seed, base + (attempts * 2 + 1) * 67890, bounds[1], bounds[3])
+
+    land = get_land_mask().is_land(lon, lat)
+    first = np.argmax(land, axis=1)
+    rows = np.arange(len(indices))
+    out_lon = lon[rows, first]
+    out_lat = lat[rows, first]
+
+    missing = ~land.any(axis=1)
+    if missing.any():
+        fallback = _land_fallback(bounds)
+        if fallback is not None:
+            out_lon[missing], out_lat[missing] = fallback
+        else:
+            center_lon = (bounds[0] + bounds[2]) / 2
+            center_lat = (bounds[1] + bounds[3]) / 2
+            idx = indices[missing]
+            out_lon[missing] = center_lon + seeded_uniform(seed, idx * 12345 + idx * 100 * 67890, -0.1, 0.1)
+            out_lat[missing] = center_lat + seeded_uniform(seed, idx * 12345 + (idx * 100 + 1) * 67890, -0.1, 0.1)
+
+    return out_lon, out_lat
+
+
+def _season_month(start_date: str) -> int:
+    """Month used for seasonal adjustments (defaults to summer)."""
+    try:
+        return datetime.strptime(start_date, "%Y-%m-%d").month
+    except (TypeError, ValueError):
+        return 6
+
+
+def brightness_temps(lat: np.ndarray, start_date: str, seed: int, indices: np.ndarray) -> np.ndarray:
+    """Vectorized ``get_deterministic_brightness_temp``."""
+    month = _season_month(start_date)
+    summer = month in [6, 7, 8]
+    abs_lat = np.abs(lat)
+    base_temp = np.where(abs_lat < 23.5, 320, np.where(abs_lat < 45, 330, 340))
+    multiplier = np.where(
+        abs_lat < 23.5, 1.1 if month in [12, 1, 2] else 1.0,
+        np.where(abs_lat < 45, 1.2 if summer else 0.9, 1.3 if summer else 0.8)
+    )
+    variation = seeded_uniform(seed, indices * 12345 + indices * 500 * 67890, -10, 20)
+    return base_temp * multiplier + variation
+
+
+def fire_radiative_power(lat: np.ndarray, start_date: str, seed: int, indices: np.ndarray) -> np.ndarray:
+    """Vectorized ``get_deterministic_frp``."""
+    month = _season_month(start_date)
+    summer = month in [6, 7, 8]
+    abs_lat = np.abs(lat)
+    base_frp = np.where(abs_lat < 23.5, 30, np.where(abs_lat < 45, 50, 80))
+    multiplier = np.where(
+        abs_lat < 23.5, 1.5 if month in [12, 1, 2] else 1.0,
+        np.where(abs_lat < 45, 2.0 if summer else 0.5, 2.5 if summer else 0.3)
+    )
+    variation = seeded_uniform(seed, indices * 12345 + indices * 600 * 67890, 0.5, 1.5)
+    return base_frp * multiplier * variation
+
+
+def confidences(source: str, cloud_cover: np.ndarray, seed: int, indices: np.ndarray) -> np.ndarray:
+    """Vectorized ``get_deterministic_confidence``."""
+    base_confidence = {
+        "sentinel2": 0.85,
+        "landsat": 0.80
+    }.get(source.lower(), 0.75)
+    cloud_penalty = np.minimum(0.3, cloud_cover / 100 * 0.5)
+    variation = seeded_uniform(seed, indices * 12345 + indices * 300 * 67890, -0.1, 0.1)
+    return np.maximum(0.5, np.minimum(0.95, base_confidence - cloud_penalty + variation))
+
+
+def hotspot_count(bounds, seed: int, fire_zones: List[Dict]) -> int:
+    """Default number of hotspots for an area (the legacy density-based rule)."""
+    area_size = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+    base_hotspots = len(fire_zones) * 2 if fire_zones else 1
+    max_hotspots = min(15, max(0, int(base_hotspots + area_size * 50)))
+    return int(seeded_uniform(seed, 0, 0, max_hotspots + 1))
+
+
+def generate_hotspots(bounds, start_date: str, source: str, seed: int,
+                      fire_zones: List[Dict], count: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Generate deterministic hotspot attributes as columnar arrays.
+
+    Args:
+        bounds: [min_lon, min_lat, max_lon, max_lat]
+        start_date: Start date (YYYY-MM-DD), drives seasonal adjustments
+        source: Hotspot source ('viirs' or 'modis')
+        seed: Request seed
+        fire_zones: Fire-prone zones inside the bounds
+        count: Number of hotspots (defaults to the density-based count)
+
+    Returns:
+        Dictionary of equally sized arrays: index, lon, lat, confidence, brightness, frp
+    """
+    if count is None:
+        count = hotspot_count(bounds, seed, fire_zones)
+    count = int(min(max(count, 0), MAX_SYNTHETIC_HOTSPOTS))
+    indices = np.arange(count, dtype=np.int64)
+
+    lon = np.empty(count)
+    lat = np.empty(count)
+
+    # Hotspots near known fire zones first, the rest on deterministic land points
+    n_zoned = min(count, len(fire_zones) * 2) if fire_zones else 0
+    if n_zoned:
+        zoned = indices[:n_zoned]
+        centers = np.array([zone['center'] for zone in fire_zones], dtype=float)[zoned % len(fire_zones)]
+        lon[:n_zoned] = centers[:, 0] + seeded_uniform(seed, zoned * 2 * 12345, -0.01, 0.01)
+        lat[:n_zoned] = centers[:, 1] + seeded_uniform(seed, (zoned * 2 + 1) * 12345, -0.01, 0.01)
+    if count > n_zoned:
+        lon[n_zoned:], lat[n_zoned:] = land_locations(bounds, seed, indices[n_zoned:])
+
+    cloud_cover = seeded_uniform(seed, indices * 10 * 12345, 0, 30)
+
+    return {
+        "index": indices,
+        "lon": lon,
+        "lat": lat,
+        "confidence": confidences(source, cloud_cover, seed, indices),
+        "brightness": brightness_temps(lat, start_date, seed, indices),
+        "frp": fire_radiative_power(lat, start_date, seed, indices)
+    }
+
+
+def hotspot_features(hotspots: Dict[str, np.ndarray], start_date: str, source: str, seed: int) -> List[Dict]:
+    """
+    Convert columnar hotspot arrays into GeoJSON features.
+
+    Args:
+        hotspots: Output of generate_hotspots
+        start_date: Acquisition date reported on each feature
+        source: Hotspot source
+        seed: Request seed, embedded in feature ids
+
+    Returns:
+        List of GeoJSON Feature dictionaries
+    """
+    names = get_gazetteer().names_for(hotspots["lon"], hotspots["lat"])
+    return [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [lon, lat]
+            },
+            "properties": {
+                "id": f"hotspot_{i}_{seed}_{i}",
+                "confidence": confidence,
+                "brightness": brightness,
+                "frp": frp,  # Fire Radiative Power
+                "date": start_date,
+                "source": source,
+                "location": name
+            }
+        }
+        for i, lon, lat, confidence, brightness, frp, name in zip(
+            hotspots["index"].tolist(),
+            hotspots["lon"].tolist(),
+            hotspots["lat"].tolist(),
+            hotspots["confidence"].tolist(),
+            hotspots["brightness"].tolist(),
+            hotspots["frp"].tolist(),
+            names
+        )
+    ]
@@ -0,0 +1,467 @@
+"""
+Vector Tiles
+
+This module renders detections and hotspots as Mapbox Vector Tiles (MVT)
+for XYZ web-map tiles. Geometries are projected to Web Mercator, clipped to
+the tile (plus a small buffer) and snapped to the tile grid, which simplifies
+them to the zoom level and bounds the payload per viewport. The protobuf
+encoding is written by hand so no tile library is required.
+
+Rendered tiles are kept in a TileCache (memory LRU + optional size-bounded disk layer)
+keyed by the detection and hotspot store versions, so new data invalidates them.
+"""
+
+import math
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .response_cache import ResponseCache
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # tile units rendered beyond each edge
+MAX_ZOOM = 22
+MAX_TILE_FEATURES = 5000  # per layer
+MIN_RING_AREA = (TILE_EXTENT / 256) ** 2  # one screen pixel on a 256px tile
+
+MAX_LATITUDE = 85.0511287798066
+
+# A full disk layer is trimmed to this fraction of its budget, so eviction scans stay rare
+DISK_EVICTION_TARGET = 0.9
+
+# Geometry types and commands from the MVT 2.1 specification
+GEOM_POINT = 1
+GEOM_POLYGON = 3
+CMD_MOVE_TO = 1
+CMD_LINE_TO = 2
+CMD_CLOSE_PATH = 7
+
+
+def validate_tile(z: int, x: int, y: int):
+    """Raise ValueError for tile coordinates outside the XYZ pyramid."""
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"Zoom must be between 0 and {MAX_ZOOM}")
+    n = 1 << z
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError(f"Tile {z}/{x}/{y} does not exist")
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0.0) -> List[float]:
+    """
+    Geographic bounds of an XYZ tile.
+
+    Args:
+        z, x, y: Tile coordinates
+        buffer: Extra margin as a fraction of the tile size
+
+    Returns:
+        [min_lon, min_lat, max_lon, max_lat]
+    """
+    n = 1 << z
+
+    def lon(tx):
+        return tx / n * 360.0 - 180.0
+
+    def lat(ty):
+        ty = min(max(ty, 0.0), float(n))
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return [
+        max(lon(x - buffer), -180.0), lat(y + 1 + buffer),
+        min(lon(x + 1 + buffer), 180.0), lat(y - buffer)
+    ]
+
+
+def project(lon: float, lat: float, z: int, x: int, y: int, extent: int = TILE_EXTENT) -> Tuple[float, float]:
+    """Project a lon/lat pair to tile coordinates (y pointing down)."""
+    n = 1 << z
+    lat = min(max(lat, -MAX_LATITUDE), MAX_LATITUDE)
+    sin_lat = math.sin(math.radians(lat))
+    px = ((lon + 180.0) / 360.0 * n - x) * extent
+    py = ((0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * n - y) * extent
+    return px, py
+
+
+def clip_ring(ring: List[Tuple[float, float]], lo: float, hi: float) -> List[Tuple[float, float]]:
+    """Sutherland-Hodgman clip of a closed ring to the square [lo, hi]^2."""
+    edges = [
+        (lambda p: p[0] >= lo, lambda a, b: (lo, a[1] + (b[1] - a[1]) * (lo - a[0]) / (b[0] - a[0]))),
+        (lambda p: p[0] <= hi, lambda a, b: (hi, a[1] + (b[1] - a[1]) * (hi - a[0]) / (b[0] - a[0]))),
+        (lambda p: p[1] >= lo, lambda a, b: (a[0] + (b[0] - a[0]) * (lo - a[1]) / (b[1] - a[1]), lo)),
+        (lambda p: p[1] <= hi, lambda a, b: (a[0] + (b[0] - a[0]) * (hi - a[1]) / (b[1] - a[1]), hi)),
+    ]
+    for inside, intersect in edges:
+        if not ring:
+            break
+        clipped = []
+        previous = ring[-1]
+        for current in ring:
+            if inside(current):
+                if not inside(previous):
+                    clipped.append(intersect(previous, current))
+                clipped.append(current)
+            elif inside(previous):
+                clipped.append(intersect(previous, current))
+            previous = current
+        ring = clipped
+    return ring
+
+
+def ring_area(ring: Sequence[Tuple[int, int]]) -> float:
+    """Signed shoelace area; positive for MVT exterior rings (y down)."""
+    area = 0.0
+    for i in range(len(ring)):
+        x0, y0 = ring[i - 1]
+        x1, y1 = ring[i]
+        area += x0 * y1 - x1 * y0
+    return area / 2.0
+
+
+def snap_ring(ring: List[Tuple[float, float]]) -> List[Tuple[int, int]]:
+    """Round to the tile grid and drop repeated vertices."""
+    snapped = []
+    for px, py in ring:
+        point = (int(round(px)), int(round(py)))
+        if not snapped or point != snapped[-1]:
+            snapped.append(point)
+    if len(snapped) > 1 and snapped[0] == snapped[-1]:
+        snapped.pop()
+    return snapped
+
+
+def tile_polygon(polygon: Sequence, z: int, x: int, y: int,
+                 extent: int = TILE_EXTENT, buffer: int = TILE_BUFFER) -> List[List[Tuple[int, int]]]:
+    """
+    Project, clip and simplify one GeoJSON polygon (list of rings).
+
+    Returns:
+        Rings in tile coordinates with MVT winding; empty if nothing visible
+    """
+    rings = []
+    for i, ring in enumerate(polygon):
+        projected = [project(lon, lat, z, x, y, extent) for lon, lat in (p[:2] for p in ring)]
+        snapped = snap_ring(clip_ring(projected, -buffer, extent + buffer))
+        area = ring_area(snapped) if len(snapped) >= 3 else 0.0
+        if abs(area) < MIN_RING_AREA:
+            if i == 0:
+                return []  # exterior too small at this zoom
+            continue
+        exterior = i == 0
+        if (area > 0) != exterior:
+            snapped.reverse()
+        rings.append(snapped)
+    return rings
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 31)
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def encode_points(points: Sequence[Tuple[int, int]]) -> List[int]:
+    """Geometry commands for a (multi)point."""
+    geometry = [_command(CMD_MOVE_TO, len(points))]
+    cx = cy = 0
+    for px, py in points:
+        geometry += [_zigzag(px - cx), _zigzag(py - cy)]
+        cx, cy = px, py
+    return geometry
+
+
+def encode_polygon(rings: Sequence[Sequence[Tuple[int, int]]]) -> List[int]:
+    """Geometry commands for a (multi)polygon given as a flat list of rings."""
+    geometry = []
+    cx = cy = 0
+    for ring in rings:
+        px, py = ring[0]
+        geometry += [_command(CMD_MOVE_TO, 1), _zigzag(px - cx), _zigzag(py - cy)]
+        cx, cy = px, py
+        geometry.append(_command(CMD_LINE_TO, len(ring) - 1))
+        for px, py in ring[1:]:
+            geometry += [_zigzag(px - cx), _zigzag(py - cy)]
+            cx, cy = px, py
+        geometry.append(_command(CMD_CLOSE_PATH, 1))
+    return geometry
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Iterable[int]) -> bytes:
+    return _length_delimited(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        return _key(6, 0) + _varint(((value << 1) ^ (value >> 63)) & 0xFFFFFFFFFFFFFFFF)
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _length_delimited(1, str(value).encode("utf-8"))
+
+
+def encode_layer(name: str, features: Sequence[Tuple[int, List[int], Dict[str, Any]]],
+                 extent: int = TILE_EXTENT) -> bytes:
+    """
+    Encode one MVT layer.
+
+    Args:
+        name: Layer name
+        features: (geometry type, geometry commands, properties) tuples
+        extent: Tile extent
+
+    Returns:
+        Serialized Layer message
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, Any], int] = {}
+    encoded_features = []
+
+    for geom_type, geometry, properties in features:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+        encoded_features.append(
+            _packed(2, tags) + _key(3, 0) + _varint(geom_type) + _packed(4, geometry)
+        )
+
+    layer = _key(15, 0) + _varint(2) + _length_delimited(1, name.encode("utf-8"))
+    layer += b"".join(_length_delimited(2, feature) for feature in encoded_features)
+    layer += b"".join(_length_delimited(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(_length_delimited(4, _encode_value(value)) for _, value in values)
+    layer += _key(5, 0) + _varint(extent)
+    return layer
+
+
+def render_tile(layers: Dict[str, List[Dict]], z: int, x: int, y: int,
+                extent: int = TILE_EXTENT, buffer: int = TILE_BUFFER,
+                max_features: int = MAX_TILE_FEATURES) -> bytes:
+    """
+    Render GeoJSON features into a vector tile.
+
+    Args:
+        layers: Layer name -> GeoJSON Feature dictionaries (Point, MultiPoint,
+            Polygon or MultiPolygon geometries)
+        z, x, y: Tile coordinates
+        extent: Tile extent
+        buffer: Buffer around the tile in tile units
+        max_features: Maximum features kept per layer
+
+    Returns:
+        Serialized MVT tile (empty bytes when nothing is visible)
+    """
+    tile = b""
+    for name, features in layers.items():
+        encoded = []
+        for feature in features:
+            if len(encoded) >= max_features:
+                break
+            geometry = feature.get("geometry") or {}
+            properties = {
+                k: v for k, v in (feature.get("properties") or {}).items()
+                if isinstance(v, (str, int, float, bool))
+            }
+            geom_type = geometry.get("type")
+
+            if geom_type in ("Point", "MultiPoint"):
+                coords = [geometry["coordinates"]] if geom_type == "Point" else geometry["coordinates"]
+                points = []
+                for lon, lat in (c[:2] for c in coords):
+                    px, py = project(lon, lat, z, x, y, extent)
+                    if -buffer <= px <= extent + buffer and -buffer <= py <= extent + buffer:
+                        points.append((int(round(px)), int(round(py))))
+                if points:
+                    encoded.append((GEOM_POINT, encode_points(points), properties))
+
+            elif geom_type in ("Polygon", "MultiPolygon"):
+                polygons = [geometry["coordinates"]] if geom_type == "Polygon" else geometry["coordinates"]
+                rings = []
+                for polygon in polygons:
+                    rings += tile_polygon(polygon, z, x, y, extent, buffer)
+                if rings:
+                    encoded.append((GEOM_POLYGON, encode_polygon(rings), properties))
+
+        if encoded:
+            tile += _length_delimited(3, encode_layer(name, encoded, extent))
+    return tile
+
+
+class TileCache:
+    """
+    Two-level tile cache: an in-memory LRU bounded by bytes, backed by an
+    optional directory of tile files.
+
+    Entries are keyed by a data version; when the version changes (new
+    detections or hotspots were ingested) all tiles of older versions are discarded.
+    Within a version, the least recently used tile files are evicted once
+    the disk layer exceeds ``max_disk_bytes``. Lookups read and write files,
+    so callers on an event loop should run them in an executor; the cache is
+    safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024,
+                 disk_dir: Optional[str] = None, max_disk_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of tiles held in memory
+            max_bytes: Maximum total size of tiles held in memory
+            disk_dir: Directory for persisted tiles (None keeps tiles in memory only)
+            max_disk_bytes: Maximum total size of the tile files (None for no limit)
+        """
+        self._memory = ResponseCache(max_entries=max_entries, max_weight=max_bytes, ttl_seconds=None)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._version: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # unknown until the first eviction scan
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def _path(self, key: str, version: Any) -> str:
+        return os.path.join(self.disk_dir, str(version), key[:2], f"{key}.mvt")
+
+    def _set_version(self, version: Any):
+        # Called with the lock held
+        if version == self._version:
+            return
+        self._memory.clear()
+        self._version = version
+        self._disk_bytes = None
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for entry in os.listdir(self.disk_dir):
+                if entry != str(version):
+                    shutil.rmtree(os.path.join(self.disk_dir, entry), ignore_errors=True)
+
+    def get(self, key: str, version: Any) -> Optional[bytes]:
+        """Return the cached tile for ``key`` at ``version`` or None."""
+        with self._lock:
+            self._set_version(version)
+            data = self._memory.get(key)
+        if data is not None or not self.disk_dir:
+            return data
+
+        path = self._path(key, version)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # The access time orders eviction
+            os.utime(path)
+        except OSError:
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._memory.put(key, data, weight=len(data) + 1)
+        return data
+
+    def put(self, key: str, version: Any, data: bytes):
+        """Store a rendered tile."""
+        with self._lock:
+            self._set_version(version)
+            self._memory.put(key, data, weight=len(data) + 1)
+        if not self.disk_dir:
+            return
+
+        path = self._path(key, version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write tile cache file {path}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+            over_budget = self.max_disk_bytes is not None and (
+                self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes
+            )
+        if over_budget:
+            self.evict_disk()
+
+    def evict_disk(self) -> int:
+        """
+        Remove the least recently used tile files until the disk layer is
+        back under its budget.
+
+        Returns:
+            Number of files removed
+        """
+        entries = []
+        for directory, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if not name.endswith(".mvt"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if self.max_disk_bytes is not None and total > self.max_disk_bytes:
+            target = self.max_disk_bytes * DISK_EVICTION_TARGET
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self.disk_evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory cache statistics plus disk hits and evictions."""
+        with self._lock:
+            return {**self._memory.stats(), "disk_hits": self.disk_hits, "disk_evictions": self.disk_evictions,
+                    "disk_bytes": self._disk_bytes, "version": self._version}
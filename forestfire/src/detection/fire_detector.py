@@ -5,13 +5,11 @@ This module implements the core fire detection algorithm that combines
 thermal hotspot detection with optical confirmation using spectral indices.
 """
 
+import os
+import uuid
 import numpy as np
-import geopandas as gpd
-from shapely.geometry import Point, Polygon
-from rasterio.features import shapes
-from rasterio.transform import from_bounds
-from typing import Dict, List, Tuple, Optional, Union
-import pandas as pd
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Union
 from datetime import datetime, timedelta
 # Import logger with fallback
 try:
@@ -22,6 +20,28 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 from .spectral_indices import SpectralIndices, validate_band_data
+from utils.land_mask import get_land_mask
+from utils.geometry import build_geometry_levels, meters_to_degrees
+from utils.metrics import stage_timer
+from utils.execution import MIN_TILE_SIZE, ExecutionEngine, raster_shape
+from storage.array_store import ArrayStore
+from storage.disk_cache import DiskCache, cache_key
+from utils.memory_budget import MemoryReport, output_bytes, stage_bytes_per_pixel, track_peak
+
+# geopandas, shapely and rasterio are imported where used so that loading
+# this module (and the API importing it) stays cheap
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# Context pixels read around each tile: covers the 3x3 opening followed by
+# the 5x5 closing of the hotspot mask, so tiled masks equal whole-scene ones
+TILE_HALO = 8
+
+# Stage outputs persisted to the output store, by stage: output key -> raster name
+RASTER_OUTPUTS = {
+    'masks': {'index:nbr': 'nbr', 'hotspot_mask': 'hotspot_mask', 'combined_mask': 'optical_mask'},
+    'dnbr': {'dnbr': 'dnbr'},
+}
 
 
 class FireDetector:
@@ -41,9 +61,45 @@ class FireDetector:
         
         Args:
             config: Configuration dictionary containing detection parameters
+                (a ConfigSnapshot works as well)
         """
-        self.config = config
         self.spectral_indices = SpectralIndices()
+        self.apply_config(config)
+    
+    @classmethod
+    def from_loader(cls, loader) -> "FireDetector":
+        """
+        Create a detector that follows a ConfigLoader.
+        
+        Detection and performance settings changed on disk are applied to
+        the detector when the loader reloads, without restarting the worker.
+        Runs already in progress keep the settings they started with.
+        """
+        detector = cls(loader.snapshot)
+        loader.subscribe(detector._on_config_change, prefix=('detection', 'performance'))
+        return detector
+    
+    def _on_config_change(self, snapshot, changed_keys):
+        self.apply_config(snapshot)
+        logger.info(f"Detection settings reloaded ({len(changed_keys)} changed)")
+    
+    def _pinned(self) -> "FireDetector":
+        """
+        Copy of the detector for one run.
+        
+        apply_config rebinds attributes rather than mutating them, so the
+        copy keeps every threshold of the run even if the configuration is
+        reloaded while it executes.
+        """
+        if self.__dict__.get('_is_pinned'):
+            return self
+        pinned = object.__new__(type(self))
+        pinned.__dict__.update(self.__dict__, _is_pinned=True)
+        return pinned
+    
+    def apply_config(self, config: Dict):
+        """Read detection parameters from a configuration dictionary or snapshot."""
+        self.config = config
         
         # Extract detection parameters
         self.thermal_config = config.get('detection', {}).get('thermal', {})
@@ -55,9 +111,44 @@ class FireDetector:
         self.nbr_threshold = self.optical_config.get('nbr_threshold', 0.1)
         self.dnbr_threshold = self.optical_config.get('dnbr_threshold', -0.2)
         self.bai_threshold = self.optical_config.get('bai_threshold', 0.3)
-        self.min_burn_area = self.spatial_config.get('min_burn_area', 10000)
+        self.min_burn_area = self.spatial_config.get(
+            'min_burn_area', self.spatial_config.get('min_polygon_area', 10000)
+        )
+        self.simplify_tolerance = self.spatial_config.get('simplify_tolerance', 0)  # meters
+        self.geometry_zoom_levels = self.spatial_config.get('geometry_zoom_levels', [4, 8, 12])
         self.buffer_distance = self.spatial_config.get('buffer_distance', 2000)
-        
+        self.mask_water = self.spatial_config.get('mask_water', False)
+        
+        # Tiling and parallelism follow the performance section; the worker
+        # pool is only replaced when its own settings change
+        from utils.config_loader import thaw
+        performance = config.get('performance', {})
+        engine_settings = {section: thaw(performance.get(section) or {}) for section in ('parallel', 'memory')}
+        previous_engine = getattr(self, 'engine', None)
+        if previous_engine is None or engine_settings != getattr(self, '_engine_settings', None):
+            self.engine = ExecutionEngine.from_config(performance)
+            self._engine_settings = engine_settings
+            if previous_engine is not None:
+                previous_engine.shutdown(wait=False)
+        self.track_memory = config.get('performance', {}).get('memory', {}).get('track_peak', True)
+        
+        # Index rasters and masks are reused across runs when caching is enabled
+        self.cache = DiskCache.from_config(config.get('performance', {}).get('caching', {}))
+        self.memoize_runs = config.get('performance', {}).get('caching', {}).get('memoize_runs', True)
+        self.output_store_config = config.get('performance', {}).get('output_store', {})
+    
+    def __getstate__(self):
+        # Process workers get plain settings and run their tile serially
+        from utils.config_loader import thaw
+        state = {key: thaw(value) for key, value in self.__dict__.items() if key not in ('engine', 'config', 'cache')}
+        state['config'] = {}
+        state['cache'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.engine = ExecutionEngine(backend='serial')
+    
     def detect_thermal_hotspots(self, thermal_data: np.ndarray, 
                                brightness_temp: np.ndarray,
                                mir_band: Optional[np.ndarray] = None,
@@ -97,19 +188,21 @@ class FireDetector:
         return hotspot_mask
     
     def confirm_with_optical_data(self, bands: Dict[str, np.ndarray],
-                                 cloud_mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+                                 cloud_mask: Optional[np.ndarray] = None,
+                                 validate: bool = True) -> Dict[str, np.ndarray]:
         """
         Confirm fire detection using optical bands and spectral indices.
         
         Args:
             bands: Dictionary of optical bands (red, nir, swir1, swir2, blue)
             cloud_mask: Cloud mask (True = cloudy, False = clear)
+            validate: Check the bands first (skipped for tiles of a validated scene)
             
         Returns:
             Dictionary containing detection masks and indices
         """
         # Validate input bands
-        if not validate_band_data(bands):
+        if validate and not validate_band_data(bands):
             raise ValueError("Invalid band data provided")
         
         # Calculate spectral indices
@@ -148,6 +241,202 @@ class FireDetector:
         
         return masks
     
+    def detect_masks(self, thermal_data: Dict[str, np.ndarray], optical_data: Dict[str, np.ndarray],
+                     cloud_mask: Optional[np.ndarray] = None,
+                     report: Optional[MemoryReport] = None,
+                     store: Optional[ArrayStore] = None) -> Tuple[np.ndarray, Dict]:
+        """
+        Thermal hotspot mask and optical confirmation for a scene.
+        
+        Scenes whose estimated working set exceeds the memory budget are
+        processed tile by tile (with a halo, so results match whole-scene
+        processing) on the configured execution backend.
+        
+        If ``store`` is given, NBR and the masks are written to it tile by
+        tile as they are computed.
+        
+        Returns:
+            Tuple of (hotspot mask, dict with 'combined_mask' and 'indices')
+        """
+        rasters = {
+            'brightness_temp': thermal_data.get('brightness_temp', np.zeros((100, 100))),
+            'mir': thermal_data.get('mir'),
+            'thermal_nir': thermal_data.get('nir'),
+            'cloud_mask': cloud_mask,
+            **{f'band:{name}': band for name, band in optical_data.items()}
+        }
+        
+        if not validate_band_data(optical_data):
+            raise ValueError("Invalid band data provided")
+        sink = self._raster_sink(store, 'masks')
+        outputs = self._cached_stage(
+            'masks', rasters, (self.thermal_config, self.nbr_threshold, self.bai_threshold),
+            lambda: self._run_stage('masks', rasters, self._tile_masks,
+                                    lambda: self._tile_masks(rasters), TILE_HALO, report, sink,
+                                    align=store.alignment if store is not None else 1),
+            sink
+        )
+        
+        indices = {name[6:]: values for name, values in outputs.items() if name.startswith('index:')}
+        return outputs['hotspot_mask'], {'combined_mask': outputs['combined_mask'], 'indices': indices}
+    
+    def _tile_masks(self, tile: Dict[str, Optional[np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Masks and indices of one tile (runs on an engine worker)."""
+        bands = {key[5:]: value for key, value in tile.items() if key.startswith('band:')}
+        hotspot_mask = self.detect_thermal_hotspots(None, tile['brightness_temp'], tile['mir'], tile['thermal_nir'])
+        optical = self.confirm_with_optical_data(bands, tile['cloud_mask'], validate=False)
+        outputs = {'hotspot_mask': hotspot_mask, 'combined_mask': optical['combined_mask']}
+        outputs.update({f'index:{name}': values for name, values in optical['indices'].items()})
+        return outputs
+    
+    def _run_stage(self, stage: str, rasters: Dict[str, Optional[np.ndarray]], tile_func, whole_scene,
+                   halo: int = 0, report: Optional[MemoryReport] = None, sink=None,
+                   align: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Run a per-pixel stage on the whole scene or on tiles sized by the memory budget.
+        
+        ``tile_func`` maps a dict of tile rasters to a dict of tile-shaped
+        outputs and ``whole_scene`` computes the same outputs untiled. If a
+        run fails with MemoryError the stage is retried with tiles of half
+        the side, down to MIN_TILE_SIZE, instead of failing the detection.
+        ``sink(window, outputs)`` receives each finished tile (or the whole
+        scene once); tile sizes are multiples of ``align`` so the output
+        store can build overviews from each tile.
+        """
+        present = [value for value in rasters.values() if value is not None]
+        shape = present[0].shape[:2] if present else None
+        tileable = shape is not None and all(value.shape == shape for value in present)
+        bytes_per_pixel = stage_bytes_per_pixel(stage, present)
+        tile_size = self.engine.tile_size(bytes_per_pixel)
+        tile_size = max(align, tile_size - tile_size % align)
+        if self.engine.max_memory_bytes and shape is not None:
+            assembled = output_bytes(stage, shape, present)
+            if assembled > self.engine.max_memory_bytes:
+                logger.warning(f"{stage}: full-scene outputs alone ({assembled / 2 ** 20:.0f} MB) exceed the memory budget")
+        
+        retries = 0
+        while True:
+            direct = not tileable or (shape[0] <= tile_size and shape[1] <= tile_size)
+            try:
+                with stage_timer(stage), (track_peak() if self.track_memory else nullcontext({})) as peak:
+                    if direct:
+                        outputs, tiles = whole_scene(), 1
+                        if sink is not None:
+                            sink(None, outputs)
+                    else:
+                        outputs, tiles = self._map_stage(tile_func, rasters, shape, tile_size, halo, sink)
+                break
+            except MemoryError:
+                current = min(tile_size, max(shape)) if tileable else 0
+                if current <= MIN_TILE_SIZE:
+                    raise
+                tile_size = max(MIN_TILE_SIZE, current // 2)
+                tile_size = max(align, tile_size - tile_size % align)
+                retries += 1
+                logger.warning(f"{stage}: out of memory, retrying with {tile_size}px tiles")
+        
+        if report is not None:
+            if direct:
+                estimated = shape[0] * shape[1] * bytes_per_pixel if shape else 0
+            else:
+                tile_pixels = (min(tile_size, shape[0]) + 2 * halo) * (min(tile_size, shape[1]) + 2 * halo)
+                concurrent = 1 if self.engine.backend == 'serial' else min(tiles, self.engine.max_workers)
+                estimated = tile_pixels * bytes_per_pixel * concurrent + output_bytes(stage, shape, present)
+            report.record(stage, estimated, peak.get('peak_bytes'),
+                          tile_size=None if direct else tile_size, tiles=tiles, retries=retries)
+        return outputs
+    
+    def _cached_stage(self, stage: str, rasters: Dict[str, Optional[np.ndarray]], parameters: tuple,
+                      compute, sink=None) -> Dict[str, np.ndarray]:
+        """Outputs of a stage from the disk cache, keyed by its input content and parameters."""
+        if self.cache is None:
+            return compute()
+        key = cache_key(stage, rasters, *parameters)
+        outputs = self.cache.get(key)
+        if outputs is None:
+            outputs = compute()
+            self.cache.put(key, outputs)
+        elif sink is not None:
+            sink(None, outputs)
+        return outputs
+    
+    def _raster_sink(self, store: Optional[ArrayStore], stage: str):
+        """Callback writing a stage's tile outputs (and derived severity classes) to the output store."""
+        if store is None:
+            return None
+        names = RASTER_OUTPUTS[stage]
+        
+        def sink(window, outputs):
+            for key, name in names.items():
+                if key in outputs:
+                    store.write(name, window, outputs[key])
+            if stage == 'dnbr':
+                store.write('severity', window, self.spectral_indices.classify_burn_severity(outputs['dnbr']))
+        
+        return sink
+    
+    def finalize_output_store(self, store: ArrayStore, detection_mask: np.ndarray) -> Dict:
+        """Write the final detection mask, complete the overviews and describe the store for the results."""
+        store.write('detection_mask', None, detection_mask)
+        return {'path': store.root, 'shape': list(store.shape), 'levels': store.finish()}
+    
+    def open_output_store(self, shape: Optional[Tuple[int, int]], metadata: Dict) -> Optional[ArrayStore]:
+        """
+        Output store for one run when ``performance.output_store.enabled`` is set.
+        
+        Rasters go to ``<path>/<run id>``, where the run id is taken from
+        metadata 'run_id' or 'scene_id' (a random id otherwise).
+        """
+        if not self.output_store_config.get('enabled', False) or shape is None:
+            return None
+        run_id = metadata.get('run_id') or metadata.get('scene_id') or uuid.uuid4().hex
+        root = os.path.join(self.output_store_config.get('path', 'data/rasters'), str(run_id))
+        return ArrayStore(
+            root, shape=shape,
+            chunk_size=self.output_store_config.get('chunk_size', 256),
+            compression_level=self.output_store_config.get('compression_level', 1),
+            overviews=self.output_store_config.get('overviews', True)
+        )
+    
+    def _map_stage(self, tile_func, rasters: Dict[str, Optional[np.ndarray]], shape: Tuple[int, int],
+                   tile_size: int, halo: int, sink=None) -> Tuple[Dict[str, np.ndarray], int]:
+        """Run ``tile_func`` over tiles, stitching tile cores into full-scene outputs as they complete."""
+        outputs: Dict[str, np.ndarray] = {}
+        tiles = 0
+        for window, core, tile_outputs in self.engine.imap_tiles(tile_func, rasters, tile_size=tile_size, halo=halo):
+            tile_outputs = {name: values[core] for name, values in tile_outputs.items()}
+            for name, values in tile_outputs.items():
+                if name not in outputs:
+                    outputs[name] = np.empty(shape, dtype=values.dtype)
+                outputs[name][window] = values
+            if sink is not None:
+                sink(window, tile_outputs)
+            tiles += 1
+        logger.info(f"Processed {tiles} tiles of up to {tile_size}px on the {self.engine.backend} backend")
+        return outputs, tiles
+    
+    def compute_dnbr(self, pre_fire_bands: Dict[str, np.ndarray], post_fire_bands: Dict[str, np.ndarray],
+                     report: Optional[MemoryReport] = None, store: Optional[ArrayStore] = None) -> np.ndarray:
+        """dNBR of a scene, tiled when it does not fit the memory budget."""
+        rasters = {
+            'pre:nir': pre_fire_bands['nir'], 'pre:swir2': pre_fire_bands['swir2'],
+            'post:nir': post_fire_bands['nir'], 'post:swir2': post_fire_bands['swir2']
+        }
+        sink = self._raster_sink(store, 'dnbr')
+        outputs = self._cached_stage(
+            'dnbr', rasters, (),
+            lambda: self._run_stage('dnbr', rasters, self._tile_dnbr,
+                                    lambda: self._tile_dnbr(rasters), report=report, sink=sink,
+                                    align=store.alignment if store is not None else 1),
+            sink
+        )
+        return outputs['dnbr']
+    
+    def _tile_dnbr(self, tile: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        pre = {'nir': tile['pre:nir'], 'swir2': tile['pre:swir2']}
+        post = {'nir': tile['post:nir'], 'swir2': tile['post:swir2']}
+        return {'dnbr': self.calculate_dnbr(pre, post)}
+    
     def calculate_dnbr(self, pre_fire_bands: Dict[str, np.ndarray],
                       post_fire_bands: Dict[str, np.ndarray]) -> np.ndarray:
         """
@@ -173,9 +462,28 @@ class FireDetector:
         
         return dnbr
     
+    def mask_water_pixels(self, detection_mask: np.ndarray, transform, crs: str) -> np.ndarray:
+        """
+        Remove ocean and large water-body pixels from a detection mask.
+        
+        Args:
+            detection_mask: Boolean detection mask
+            transform: Raster transform parameters
+            crs: Coordinate reference system (only EPSG:4326 is supported)
+            
+        Returns:
+            Detection mask restricted to land pixels
+        """
+        if str(crs).upper() != "EPSG:4326":
+            logger.warning(f"Water masking requires geographic coordinates, skipping for {crs}")
+            return detection_mask
+        
+        land_mask = get_land_mask(self.spatial_config.get('land_mask_path'))
+        return detection_mask & land_mask.land_mask_for_transform(transform, detection_mask.shape)
+    
     def delineate_burn_area(self, detection_mask: np.ndarray,
                            transform: Tuple[float, float, float, float, float, float],
-                           crs: str = "EPSG:4326") -> gpd.GeoDataFrame:
+                           crs: str = "EPSG:4326") -> "gpd.GeoDataFrame":
         """
         Convert detection mask to burn area polygons.
         
@@ -187,13 +495,17 @@ class FireDetector:
         Returns:
             GeoDataFrame containing burn area polygons
         """
+        import geopandas as gpd
+        from rasterio.features import shapes
+        from shapely.geometry import shape
+        
         # Convert mask to polygons
         burn_polygons = []
         
         for geom, value in shapes(detection_mask.astype(np.uint8), 
                                 transform=transform):
             if value == 1:  # Burned pixel
-                polygon = Polygon(geom['coordinates'][0])
+                polygon = shape(geom)  # keeps unburned holes
                 if polygon.area > self.min_burn_area:  # Filter small areas
                     burn_polygons.append(polygon)
         
@@ -201,6 +513,13 @@ class FireDetector:
         if burn_polygons:
             gdf = gpd.GeoDataFrame(geometry=burn_polygons, crs=crs)
             
+            # Remove the pixel staircase without changing topology
+            if self.simplify_tolerance > 0:
+                tolerance = self.simplify_tolerance
+                if gdf.crs is not None and gdf.crs.is_geographic:
+                    tolerance = meters_to_degrees(tolerance, gdf.total_bounds[[1, 3]].mean())
+                gdf['geometry'] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+            
             # Calculate area and other properties
             gdf['area_m2'] = gdf.geometry.area
             gdf['area_ha'] = gdf['area_m2'] / 10000
@@ -229,63 +548,151 @@ class FireDetector:
             metadata: Additional metadata (timestamps, location, etc.)
             
         Returns:
-            Dictionary containing detection results
+            Dictionary containing detection results. With caching enabled,
+            results also carry a 'provenance' entry and identical runs are
+            served from the cache.
         """
+        detector = self._pinned()
+        
+        def compute():
+            return detector._run_pipeline(thermal_data, optical_data, pre_fire_data, cloud_mask, metadata)[0]
+        
+        if detector.cache is None or not detector.memoize_runs:
+            return compute()
+        
+        from storage.run_cache import memoized_run
+        return memoized_run(detector.cache, compute, detector.run_parameters(), metadata,
+                            thermal=thermal_data, optical=optical_data, pre_fire=pre_fire_data,
+                            cloud_mask=cloud_mask)
+    
+    def run_parameters(self) -> Dict:
+        """Settings that detection results depend on (part of the run cache key)."""
+        from utils.config_loader import thaw
+        return {
+            'thermal': thaw(self.thermal_config),
+            'nbr_threshold': self.nbr_threshold,
+            'dnbr_threshold': self.dnbr_threshold,
+            'bai_threshold': self.bai_threshold,
+            'min_burn_area': self.min_burn_area,
+            'simplify_tolerance': self.simplify_tolerance,
+            'geometry_zoom_levels': thaw(self.geometry_zoom_levels),
+            'mask_water': self.mask_water,
+            'land_mask_path': self.spatial_config.get('land_mask_path'),
+            'output_store': thaw(self.output_store_config),
+        }
+    
+    def detect_progressive(self,
+                           thermal_data: Dict[str, np.ndarray],
+                           optical_data: Dict[str, np.ndarray],
+                           pre_fire_data: Optional[Dict[str, np.ndarray]] = None,
+                           cloud_mask: Optional[np.ndarray] = None,
+                           metadata: Optional[Dict] = None,
+                           deadline_seconds: Optional[float] = None,
+                           on_update=None) -> Dict:
+        """
+        Coarse-to-fine detection that returns the best result available
+        within ``deadline_seconds``.
+        
+        The whole scene is first processed at reduced resolution; candidate
+        regions are then refined at full resolution until the deadline.
+        ``on_update`` receives the intermediate results after each step.
+        See detection.progressive for details.
+        
+        Returns:
+            Dictionary containing detection results, with a 'progressive' entry
+        """
+        from .progressive import DEFAULT_COARSE_SIZE, DEFAULT_WINDOW_MARGIN, run_progressive
+        
+        detector = self._pinned()
+        settings = detector.config.get('performance', {}).get('progressive', {})
+        return run_progressive(
+            detector, thermal_data, optical_data, pre_fire_data, cloud_mask, metadata,
+            deadline_seconds=deadline_seconds, on_update=on_update,
+            coarse_size=settings.get('coarse_size', DEFAULT_COARSE_SIZE),
+            margin=settings.get('window_margin', DEFAULT_WINDOW_MARGIN)
+        )
+    
+    def _run_pipeline(self, thermal_data: Dict[str, np.ndarray], optical_data: Dict[str, np.ndarray],
+                      pre_fire_data: Optional[Dict[str, np.ndarray]], cloud_mask: Optional[np.ndarray],
+                      metadata: Optional[Dict], persist: bool = True) -> Tuple[Dict, Optional[np.ndarray]]:
+        """
+        Run the detection pipeline.
+        
+        Returns:
+            Tuple of (results, candidate mask). The candidate mask marks
+            confirmed burn pixels and thermal hotspots (None if the run
+            failed before the masks were computed).
+        """
+        # Thresholds stay fixed for the whole run, even across a config reload
+        detector = self._pinned()
+        metadata = metadata or {}
+        candidates = None
         results = {
             'timestamp': datetime.now(),
-            'metadata': metadata or {},
+            'metadata': metadata,
             'detections': [],
             'summary': {}
         }
+        memory_report = MemoryReport(detector.engine.max_memory_bytes)
         
         try:
             # Step 1: Thermal hotspot detection
-            logger.info("Detecting thermal hotspots...")
-            hotspot_mask = self.detect_thermal_hotspots(
-                thermal_data.get('thermal', np.zeros((100, 100))),
-                thermal_data.get('brightness_temp', np.zeros((100, 100))),
-                thermal_data.get('mir'),
-                thermal_data.get('nir')
-            )
+            # Step 2: Optical confirmation (both per-pixel, tiled for large scenes)
+            logger.info("Detecting thermal hotspots and confirming with optical data...")
+            store = detector.open_output_store(raster_shape(optical_data), metadata) if persist else None
+            hotspot_mask, optical_results = detector.detect_masks(thermal_data, optical_data, cloud_mask,
+                                                              memory_report, store)
             
-            # Step 2: Optical confirmation
-            logger.info("Confirming with optical data...")
-            optical_results = self.confirm_with_optical_data(optical_data, cloud_mask)
+            transform = metadata.get('transform', (1, 0, 0, 0, 1, 0))
+            crs = metadata.get('crs', 'EPSG:4326')
+            
+            # Optionally drop water pixels before delineation
+            if detector.mask_water:
+                with stage_timer("water_mask"):
+                    optical_results['combined_mask'] = detector.mask_water_pixels(
+                        optical_results['combined_mask'], transform, crs
+                    )
             
             # Step 3: Calculate dNBR if pre-fire data available
             dnbr = None
             if pre_fire_data is not None:
                 logger.info("Calculating dNBR...")
-                dnbr = self.calculate_dnbr(pre_fire_data, optical_data)
+                dnbr = detector.compute_dnbr(pre_fire_data, optical_data, memory_report, store)
                 
                 # Apply dNBR threshold
-                dnbr_mask = dnbr < self.dnbr_threshold
+                dnbr_mask = dnbr < detector.dnbr_threshold
                 optical_results['combined_mask'] &= dnbr_mask
                 optical_results['indices']['dnbr'] = dnbr
             
+            candidates = optical_results['combined_mask'] | hotspot_mask
+            
+            # Persist the final detection mask and overviews of every raster
+            if store is not None:
+                results['rasters'] = detector.finalize_output_store(store, optical_results['combined_mask'])
+            
             # Step 4: Delineate burn areas
             logger.info("Delineating burn areas...")
-            transform = metadata.get('transform', (1, 0, 0, 0, 1, 0))
-            crs = metadata.get('crs', 'EPSG:4326')
-            
-            burn_areas = self.delineate_burn_area(
-                optical_results['combined_mask'],
-                transform,
-                crs
-            )
+            with stage_timer("delineation"):
+                burn_areas = detector.delineate_burn_area(
+                    optical_results['combined_mask'],
+                    transform,
+                    crs
+                )
             
             # Step 5: Calculate confidence scores
-            confidence_scores = self.calculate_confidence_scores(
-                hotspot_mask, optical_results, burn_areas, metadata
-            )
+            with stage_timer("confidence"):
+                confidence_scores = detector.calculate_confidence_scores(
+                    hotspot_mask, optical_results, burn_areas, metadata
+                )
             
             # Step 6: Compile results
-            results['detections'] = self.compile_detections(
-                burn_areas, confidence_scores, optical_results['indices'], metadata
-            )
+            with stage_timer("compile"):
+                results['detections'] = detector.compile_detections(
+                    burn_areas, confidence_scores, optical_results['indices'], metadata
+                )
             
             # Step 7: Generate summary statistics
-            results['summary'] = self.generate_summary(results['detections'])
+            results['summary'] = detector.generate_summary(results['detections'])
             
             logger.info(f"Detection complete: {len(results['detections'])} fire events found")
             
@@ -293,12 +700,15 @@ class FireDetector:
             logger.error(f"Error in fire detection pipeline: {e}")
             results['error'] = str(e)
         
-        return results
+        # Estimated vs measured peak memory of the per-pixel stages
+        results['memory'] = memory_report.to_dict()
+        
+        return results, candidates
     
     def calculate_confidence_scores(self, 
                                    hotspot_mask: np.ndarray,
                                    optical_results: Dict,
-                                   burn_areas: gpd.GeoDataFrame,
+                                   burn_areas: "gpd.GeoDataFrame",
                                    metadata: Optional[Dict]) -> List[float]:
         """
         Calculate confidence scores for detected fire events.
@@ -346,7 +756,7 @@ class FireDetector:
         return confidence_scores
     
     def compile_detections(self, 
-                          burn_areas: gpd.GeoDataFrame,
+                          burn_areas: "gpd.GeoDataFrame",
                           confidence_scores: List[float],
                           indices: Dict[str, np.ndarray],
                           metadata: Optional[Dict]) -> List[Dict]:
@@ -362,8 +772,14 @@ class FireDetector:
         Returns:
             List of detection dictionaries
         """
+        from shapely.geometry import mapping
+        
         detections = []
         
+        # Per-zoom geometries are only meaningful for geographic coordinates
+        crs = str((metadata or {}).get('crs', 'EPSG:4326')).upper()
+        zoom_levels = self.geometry_zoom_levels if crs == 'EPSG:4326' else []
+        
         for idx, (_, burn_area) in enumerate(burn_areas.iterrows()):
             detection = {
                 'id': f"fire_{idx}_{int(datetime.now().timestamp())}",
@@ -381,6 +797,8 @@ class FireDetector:
                 },
                 'metadata': metadata or {}
             }
+            if zoom_levels:
+                detection['geometry_levels'] = build_geometry_levels(mapping(burn_area.geometry), zoom_levels)
             detections.append(detection)
         
         return detections
@@ -410,7 +828,7 @@ class FireDetector:
         # Severity distribution based on dNBR
         severity_counts = {'low': 0, 'moderate': 0, 'high': 0}
         for detection in detections:
-            dnbr_mean = detection['indices'].get('dnbr_mean', 0)
+            dnbr_mean = detection['indices'].get('dnbr_mean') or 0  # None without pre-fire data
             if dnbr_mean < -0.1:
                 severity_counts['low'] += 1
             elif dnbr_mean < 0.44:
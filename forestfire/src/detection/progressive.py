@@ -0,0 +1,273 @@
+"""
+Progressive Detection
+
+Coarse-to-fine detection under a latency deadline. The pipeline first runs
+on a downsampled copy of the scene (a few hundred pixels across) to find
+candidate regions cheaply, then refines those regions window by window at
+full resolution, largest first, for as long as the deadline allows. Every
+step hands the best result so far to a callback, so callers can publish it
+while the run continues.
+
+Detections of windows not refined in time keep their coarse geometry and
+are tagged ``resolution: 'coarse'``; ``progressive['complete']`` tells
+whether every candidate window was refined.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+from storage.pyramid import downsample_max, downsample_mean, downsample_mode
+from utils.execution import raster_shape
+from utils.metrics import REGISTRY
+
+# Longest side of the coarse scene
+DEFAULT_COARSE_SIZE = 512
+
+# Full-resolution pixels added around each candidate region
+DEFAULT_WINDOW_MARGIN = 16
+
+Window = Tuple[slice, slice]
+
+PROGRESSIVE_WINDOWS = REGISTRY.counter(
+    "forestfire_progressive_windows_total",
+    "Candidate windows of progressive runs, by outcome",
+    ("outcome",)
+)
+
+
+def coarse_factor(shape: Tuple[int, int], coarse_size: int = DEFAULT_COARSE_SIZE) -> int:
+    """Smallest power-of-two reduction that brings ``shape`` within ``coarse_size``."""
+    factor = 1
+    while max(shape) > coarse_size * factor:
+        factor *= 2
+    return factor
+
+
+def _reduce(array: Optional[np.ndarray], factor: int, reduce) -> Optional[np.ndarray]:
+    if array is None:
+        return None
+    while factor > 1:
+        array = reduce(array)
+        factor //= 2
+    return array
+
+
+def downsample_scene(thermal_data: Dict[str, np.ndarray], optical_data: Dict[str, np.ndarray],
+                     pre_fire_data: Optional[Dict[str, np.ndarray]], cloud_mask: Optional[np.ndarray],
+                     factor: int):
+    """
+    Reduce every raster of a scene by ``factor`` (a power of two).
+
+    Reflectances are averaged; brightness temperature keeps the block
+    maximum so that small hotspots survive, and a block is cloudy when
+    most of it is.
+    """
+    thermal = {
+        name: _reduce(band, factor, downsample_max if name == 'brightness_temp' else downsample_mean)
+        for name, band in thermal_data.items()
+    }
+    optical = {name: _reduce(band, factor, downsample_mean) for name, band in optical_data.items()}
+    pre = None
+    if pre_fire_data is not None:
+        pre = {name: _reduce(band, factor, downsample_mean) for name, band in pre_fire_data.items()}
+    return thermal, optical, pre, _reduce(cloud_mask, factor, downsample_mode)
+
+
+def scale_transform(transform, factor: int) -> Tuple[float, ...]:
+    """Affine transform (a, b, c, d, e, f) of a raster downsampled by ``factor``."""
+    a, b, c, d, e, f = tuple(transform)[:6]
+    return (a * factor, b * factor, c, d * factor, e * factor, f)
+
+
+def offset_transform(transform, row: int, col: int) -> Tuple[float, ...]:
+    """Affine transform of the window starting at pixel (row, col)."""
+    a, b, c, d, e, f = tuple(transform)[:6]
+    return (a, b, c + a * col + b * row, d, e, f + d * col + e * row)
+
+
+def window_bounds(transform, window: Window) -> Tuple[float, float, float, float]:
+    """(minx, miny, maxx, maxy) of a pixel window in transform coordinates."""
+    a, b, c, d, e, f = tuple(transform)[:6]
+    corners = [(window[1].start, window[0].start), (window[1].stop, window[0].start),
+               (window[1].start, window[0].stop), (window[1].stop, window[0].stop)]
+    xs = [a * col + b * row + c for col, row in corners]
+    ys = [d * col + e * row + f for col, row in corners]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _overlaps(first: Window, second: Window) -> bool:
+    return all(a.start < b.stop and b.start < a.stop for a, b in zip(first, second))
+
+
+def candidate_windows(mask: np.ndarray, factor: int, shape: Tuple[int, int],
+                      margin: int = DEFAULT_WINDOW_MARGIN) -> List[Window]:
+    """
+    Full-resolution windows around the connected regions of a coarse mask.
+
+    Overlapping windows are merged. Windows are ordered by the number of
+    candidate pixels they contain, largest first.
+    """
+    from scipy import ndimage
+
+    labels, count = ndimage.label(mask)
+    if count == 0:
+        return []
+    sizes = np.bincount(labels.ravel(), minlength=count + 1)
+    regions = []
+    for label, found in enumerate(ndimage.find_objects(labels), start=1):
+        window = tuple(
+            slice(max(part.start * factor - margin, 0), min(part.stop * factor + margin, size))
+            for part, size in zip(found, shape)
+        )
+        regions.append([window, int(sizes[label])])
+
+    # Merge until no two windows overlap
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                if _overlaps(regions[i][0], regions[j][0]):
+                    (first, first_size), (second, second_size) = regions[i], regions.pop(j)
+                    regions[i] = [tuple(slice(min(a.start, b.start), max(a.stop, b.stop))
+                                        for a, b in zip(first, second)), first_size + second_size]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    regions.sort(key=lambda region: -region[1])
+    return [window for window, _ in regions]
+
+
+def _crop(data: Optional[Dict[str, np.ndarray]], window: Window) -> Optional[Dict[str, np.ndarray]]:
+    if data is None:
+        return None
+    return {name: band[window] if getattr(band, 'ndim', 0) >= 2 else band for name, band in data.items()}
+
+
+def run_progressive(detector, thermal_data: Dict[str, np.ndarray], optical_data: Dict[str, np.ndarray],
+                    pre_fire_data: Optional[Dict[str, np.ndarray]] = None,
+                    cloud_mask: Optional[np.ndarray] = None,
+                    metadata: Optional[Dict] = None,
+                    deadline_seconds: Optional[float] = None,
+                    on_update: Optional[Callable[[Dict], None]] = None,
+                    coarse_size: int = DEFAULT_COARSE_SIZE,
+                    margin: int = DEFAULT_WINDOW_MARGIN) -> Dict:
+    """
+    Coarse-to-fine detection with a FireDetector.
+
+    Args:
+        detector: FireDetector running each pass
+        thermal_data, optical_data, pre_fire_data, cloud_mask, metadata: As for detect_fire_events
+        deadline_seconds: Time budget; windows predicted to overrun it are left
+            at coarse resolution. The coarse pass always runs.
+        on_update: Called with the current results after the coarse pass and
+            after every refined window
+        coarse_size: Longest side of the coarse scene
+        margin: Full-resolution pixels added around each candidate region
+
+    Returns:
+        Detection results as from detect_fire_events, with a 'progressive'
+        entry describing how far refinement got
+    """
+    started = time.monotonic()
+    metadata = metadata or {}
+    transform = metadata.get('transform', (1, 0, 0, 0, 1, 0))
+    shape = raster_shape(optical_data)
+    factor = coarse_factor(shape, coarse_size)
+
+    def elapsed():
+        return time.monotonic() - started
+
+    run_stamp = int(datetime.now().timestamp())
+
+    def publish(results, stage, windows_refined, windows_total):
+        # Every window numbers its detections from 0, so the merged list is renumbered
+        for idx, detection in enumerate(results['detections']):
+            detection['id'] = f"fire_{idx}_{run_stamp}"
+        results['progressive'] = {
+            'stage': stage,
+            'complete': stage == 'final' and windows_refined == windows_total and 'error' not in results,
+            'factor': factor,
+            'windows_refined': windows_refined,
+            'windows_total': windows_total,
+            'elapsed': round(elapsed(), 3),
+        }
+        if on_update is not None:
+            on_update(results)
+        return results
+
+    # Coarse pass over the whole scene
+    thermal, optical, pre, cloud = downsample_scene(thermal_data, optical_data, pre_fire_data, cloud_mask, factor)
+    coarse_metadata = {**metadata, 'transform': scale_transform(transform, factor)}
+    coarse_started = time.monotonic()
+    results, candidates = detector._run_pipeline(thermal, optical, pre, cloud, coarse_metadata, persist=False)
+    coarse_seconds = time.monotonic() - coarse_started
+    results['metadata'] = metadata
+    for detection in results['detections']:
+        detection['resolution'] = 'coarse' if factor > 1 else 'full'
+        detection['metadata'] = metadata
+
+    if 'error' in results:
+        return publish(results, 'final', 0, 0)
+    windows = candidate_windows(candidates, factor, shape, margin) if factor > 1 else []
+    if not windows:
+        return publish(results, 'final', 0, 0)
+    publish(results, 'coarse', 0, len(windows))
+
+    # Refine candidate windows at full resolution, largest region first;
+    # the cost of a window is predicted from the coarse pass's time per pixel
+    seconds_per_pixel = coarse_seconds / max(candidates.size, 1)
+    from shapely.geometry import box
+
+    detections = list(results['detections'])
+    refined = 0
+    for window in windows:
+        pixels = (window[0].stop - window[0].start) * (window[1].stop - window[1].start)
+        if deadline_seconds is not None and elapsed() + pixels * seconds_per_pixel > deadline_seconds:
+            PROGRESSIVE_WINDOWS.inc(outcome='skipped')
+            continue
+
+        window_metadata = {**metadata, 'transform': offset_transform(transform, window[0].start, window[1].start)}
+        window_results, _ = detector._run_pipeline(
+            _crop(thermal_data, window), _crop(optical_data, window), _crop(pre_fire_data, window),
+            cloud_mask[window] if cloud_mask is not None else None, window_metadata, persist=False
+        )
+        if 'error' in window_results:
+            logger.warning(f"Refinement of window {window} failed: {window_results['error']}")
+            PROGRESSIVE_WINDOWS.inc(outcome='failed')
+            continue
+
+        # Refined detections replace the coarse ones found inside the window
+        area = box(*window_bounds(transform, window))
+        detections = [
+            detection for detection in detections
+            if detection['resolution'] != 'coarse' or not area.contains(detection['geometry'].representative_point())
+        ]
+        for detection in window_results['detections']:
+            detection['resolution'] = 'full'
+            detection['metadata'] = metadata
+            detections.append(detection)
+        refined += 1
+        PROGRESSIVE_WINDOWS.inc(outcome='refined')
+
+        results['detections'] = detections
+        results['summary'] = detector.generate_summary(detections)
+        if refined < len(windows):
+            publish(results, 'refining', refined, len(windows))
+
+    if refined < len(windows):
+        logger.info(f"Deadline reached: refined {refined} of {len(windows)} candidate windows")
+    return publish(results, 'final', refined, len(windows))
@@ -5,6 +5,8 @@ This module implements various spectral indices used for detecting and analyzing
 forest fires from satellite imagery, including NBR, dNBR, BAI, and others.
 """
 
+import importlib.util
+import os
 import numpy as np
 from typing import Tuple, Optional, Union
 # Optional logger (fallback to stdlib logging if loguru is unavailable)
@@ -15,18 +17,8 @@ except Exception:  # pragma: no cover
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger("spectral_indices")
 
-# Optional geospatial dependencies (not required for demo)
-try:
-    import rasterio  # type: ignore
-    from rasterio.warp import reproject, Resampling  # type: ignore
-    from rasterio.transform import from_bounds  # type: ignore
-    RASTERIO_AVAILABLE = True
-except Exception:
-    RASTERIO_AVAILABLE = False
-    rasterio = None  # type: ignore
-    reproject = None  # type: ignore
-    Resampling = None  # type: ignore
-    from_bounds = None  # type: ignore
+# Optional geospatial dependencies (not required for demo); imported on first use
+RASTERIO_AVAILABLE = importlib.util.find_spec("rasterio") is not None
 
 
 class SpectralIndices:
@@ -261,8 +253,19 @@ class SpectralIndices:
         return severity
 
 
+def _source_identity(band_data) -> tuple:
+    """What identifies a band's content for the resampling cache."""
+    if isinstance(band_data, np.ndarray):
+        return (band_data,)
+    identity = tuple(getattr(band_data, attr, None) for attr in ('name', 'bounds', 'res', 'width', 'height'))
+    name = getattr(band_data, 'name', None)
+    if isinstance(name, str) and os.path.exists(name):
+        identity += (os.path.getmtime(name),)
+    return identity
+
+
 def resample_bands_to_match(bands: dict, target_resolution: float, 
-                           target_crs: str = "EPSG:4326") -> dict:
+                           target_crs: str = "EPSG:4326", cache=None) -> dict:
     """
     Resample all bands to match the same resolution and CRS.
     
@@ -270,6 +273,7 @@ def resample_bands_to_match(bands: dict, target_resolution: float,
         bands: Dictionary of band arrays with their metadata
         target_resolution: Target resolution in meters
         target_crs: Target coordinate reference system
+        cache: Optional DiskCache; resampled bands are reused across runs
         
     Returns:
         Dictionary of resampled bands
@@ -278,6 +282,9 @@ def resample_bands_to_match(bands: dict, target_resolution: float,
         logger.warning("rasterio not installed; skipping resampling and returning original bands")
         return bands
 
+    from rasterio.transform import from_bounds  # type: ignore
+    from rasterio.warp import reproject, Resampling  # type: ignore
+
     resampled_bands = {}
     
     # Find the band with the highest resolution as reference
@@ -296,26 +303,34 @@ def resample_bands_to_match(bands: dict, target_resolution: float,
     # Resample all bands to match the reference
     for band_name, band_data in bands.items():
         if hasattr(band_data, 'res') and band_data.res[0] != reference_resolution:
+            key = None
+            if cache is not None:
+                from storage.disk_cache import cache_key
+                key = cache_key('resampled', band_name, *_source_identity(band_data),
+                                reference_resolution, target_crs)
+                cached = cache.get(key)
+                if cached is not None:
+                    resampled_bands[band_name] = cached['data']
+                    continue
+            
             # Perform resampling
-            if reproject is None or from_bounds is None or Resampling is None or rasterio is None:
-                logger.warning("Resampling tools unavailable; returning original band for %s", band_name)
+            try:
+                destination = from_bounds(
+                    *band_data.bounds,
+                    width=int(band_data.width * band_data.res[0] / reference_resolution),
+                    height=int(band_data.height * band_data.res[0] / reference_resolution)
+                )
+                resampled = reproject(
+                    source=band_data,
+                    destination=destination,  # type: ignore[arg-type]
+                    resampling=Resampling.bilinear
+                )
+                resampled_bands[band_name] = resampled[0]
+                if key is not None:
+                    cache.put(key, {'data': resampled[0]})
+            except Exception as e:
+                logger.error(f"Failed to resample band {band_name}: {e}")
                 resampled_bands[band_name] = band_data
-            else:
-                try:
-                    destination = from_bounds(
-                        *band_data.bounds,
-                        width=int(band_data.width * band_data.res[0] / reference_resolution),
-                        height=int(band_data.height * band_data.res[0] / reference_resolution)
-                    )
-                    resampled = reproject(
-                        source=band_data,
-                        destination=destination,  # type: ignore[arg-type]
-                        resampling=Resampling.bilinear
-                    )
-                    resampled_bands[band_name] = resampled[0]
-                except Exception as e:
-                    logger.error(f"Failed to resample band {band_name}: {e}")
-                    resampled_bands[band_name] = band_data
         else:
             resampled_bands[band_name] = band_data
     
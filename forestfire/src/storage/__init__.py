@@ -0,0 +1 @@
+# Storage package for forest fire detection system
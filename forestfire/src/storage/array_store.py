@@ -0,0 +1,329 @@
+"""
+Chunked Array Store
+
+Persists detector rasters (NBR, dNBR, severity classes, masks) as chunked,
+zlib-compressed arrays in the Zarr v2 directory layout, so they can be
+written tile by tile while the pipeline runs and read back a window at a
+time, touching only the chunks the window overlaps. The layout is readable
+with zarr-python, which is not required here.
+
+Each output is a group holding one array per resolution level ("0" is full
+resolution, "1" half, ...) described by a ``multiscales`` attribute.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .pyramid import PyramidWriter
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+ZARR_FORMAT = 2
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_COMPRESSION_LEVEL = 1
+
+# Largest tile alignment requested from writers; overview levels beyond
+# log2 of it are completed from the level above when a raster is finished
+MAX_ALIGNMENT = 64
+
+Window = Tuple[slice, slice]
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write ``data`` to ``path`` via a temporary file so readers never see partial content."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _write_json(path: str, document: Dict):
+    _write_atomic(path, json.dumps(document, indent=2).encode("utf-8"))
+
+
+def _read_json(path: str) -> Dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _normalize_window(window: Optional[Window], shape: Tuple[int, int]) -> Window:
+    if window is None:
+        return slice(0, shape[0]), slice(0, shape[1])
+    rows, cols = (s.indices(n) for s, n in zip(window, shape))
+    if rows[2] != 1 or cols[2] != 1:
+        raise ValueError("Array store windows must be contiguous")
+    return slice(rows[0], max(rows[0], rows[1])), slice(cols[0], max(cols[0], cols[1]))
+
+
+class ChunkedArray:
+    """
+    2-D array stored as compressed chunks in a directory.
+
+    Partial chunk writes read, modify and rewrite the chunk; writes are
+    serialised per array, and every chunk is replaced atomically.
+    """
+
+    def __init__(self, path: str):
+        """Open an existing array directory."""
+        self.path = path
+        meta = _read_json(os.path.join(path, ".zarray"))
+        self.shape = tuple(meta["shape"])
+        self.chunks = tuple(meta["chunks"])
+        self.dtype = np.dtype(meta["dtype"])
+        self.fill_value = meta["fill_value"] if meta["fill_value"] is not None else 0
+        self.compression_level = (meta.get("compressor") or {}).get("level", DEFAULT_COMPRESSION_LEVEL)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: str, shape: Tuple[int, int], dtype: Any,
+               chunks: Tuple[int, int] = (DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_SIZE),
+               fill_value: Any = 0, compression_level: int = DEFAULT_COMPRESSION_LEVEL) -> "ChunkedArray":
+        """Create (or overwrite the metadata of) an array directory."""
+        dtype = np.dtype(dtype)
+        os.makedirs(path, exist_ok=True)
+        _write_json(os.path.join(path, ".zarray"), {
+            "zarr_format": ZARR_FORMAT,
+            "shape": [int(n) for n in shape],
+            "chunks": [int(min(c, max(n, 1))) for c, n in zip(chunks, shape)],
+            "dtype": dtype.str,
+            "compressor": {"id": "zlib", "level": int(compression_level)},
+            "fill_value": np.asarray(fill_value, dtype=dtype).item(),
+            "order": "C",
+            "filters": None,
+            "dimension_separator": "."
+        })
+        return cls(path)
+
+    def _chunk_path(self, row: int, col: int) -> str:
+        return os.path.join(self.path, f"{row}.{col}")
+
+    def _chunk_ranges(self, window: Window):
+        """Chunks overlapping ``window`` with their pixel bounds."""
+        (r0, r1), (c0, c1) = (window[0].start, window[0].stop), (window[1].start, window[1].stop)
+        if r1 <= r0 or c1 <= c0:
+            return
+        ch, cw = self.chunks
+        for row in range(r0 // ch, (r1 - 1) // ch + 1):
+            for col in range(c0 // cw, (c1 - 1) // cw + 1):
+                yield row, col, row * ch, col * cw
+
+    def read_chunk(self, row: int, col: int) -> np.ndarray:
+        """One full chunk (fill value where it was never written)."""
+        try:
+            with open(self._chunk_path(row, col), "rb") as f:
+                data = zlib.decompress(f.read())
+            return np.frombuffer(data, dtype=self.dtype).reshape(self.chunks).copy()
+        except FileNotFoundError:
+            return np.full(self.chunks, self.fill_value, dtype=self.dtype)
+
+    def write_chunk(self, row: int, col: int, chunk: np.ndarray):
+        """Replace one full chunk."""
+        data = np.ascontiguousarray(chunk, dtype=self.dtype).tobytes()
+        _write_atomic(self._chunk_path(row, col), zlib.compress(data, self.compression_level))
+
+    def read(self, window: Optional[Window] = None) -> np.ndarray:
+        """Values inside ``window`` (the whole array by default), reading only overlapping chunks."""
+        rows, cols = _normalize_window(window, self.shape)
+        out = np.empty((rows.stop - rows.start, cols.stop - cols.start), dtype=self.dtype)
+        ch, cw = self.chunks
+        for row, col, top, left in self._chunk_ranges((rows, cols)):
+            chunk = self.read_chunk(row, col)
+            r0, r1 = max(rows.start, top), min(rows.stop, top + ch)
+            c0, c1 = max(cols.start, left), min(cols.stop, left + cw)
+            out[r0 - rows.start:r1 - rows.start, c0 - cols.start:c1 - cols.start] = \
+                chunk[r0 - top:r1 - top, c0 - left:c1 - left]
+        return out
+
+    def write(self, window: Optional[Window], values: np.ndarray):
+        """Store ``values`` at ``window``; chunks only partly covered are merged with their content."""
+        rows, cols = _normalize_window(window, self.shape)
+        values = np.asarray(values)
+        if values.shape != (rows.stop - rows.start, cols.stop - cols.start):
+            raise ValueError(f"Values of shape {values.shape} do not fit window {rows}, {cols}")
+        ch, cw = self.chunks
+        with self._lock:
+            for row, col, top, left in self._chunk_ranges((rows, cols)):
+                r0, r1 = max(rows.start, top), min(rows.stop, top + ch)
+                c0, c1 = max(cols.start, left), min(cols.stop, left + cw)
+                full = (r1 - r0, c1 - c0) == (min(ch, self.shape[0] - top), min(cw, self.shape[1] - left))
+                chunk = np.full(self.chunks, self.fill_value, dtype=self.dtype) if full else self.read_chunk(row, col)
+                chunk[r0 - top:r1 - top, c0 - left:c1 - left] = \
+                    values[r0 - rows.start:r1 - rows.start, c0 - cols.start:c1 - cols.start]
+                self.write_chunk(row, col, chunk)
+
+    def __getitem__(self, window: Window) -> np.ndarray:
+        return self.read(window)
+
+    def nbytes_stored(self) -> int:
+        """Compressed size on disk."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.path)
+                   if entry.is_file() and not entry.name.startswith("."))
+
+
+class ArrayStore:
+    """
+    Group of named multi-resolution rasters in one directory.
+    """
+
+    def __init__(self, root: str, shape: Optional[Tuple[int, int]] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+                 overviews: bool = True):
+        """
+        Args:
+            root: Store directory (created if missing)
+            shape: Default shape of arrays created by write()
+            chunk_size: Chunk side in pixels for new arrays
+            compression_level: zlib level for new arrays
+            overviews: Build 2x overviews of rasters created by write()
+        """
+        self.root = os.path.abspath(root)
+        self.shape = tuple(shape) if shape is not None else None
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.overviews = overviews
+        self._pyramids: Dict[str, PyramidWriter] = {}
+        os.makedirs(self.root, exist_ok=True)
+        if not os.path.exists(os.path.join(self.root, ".zgroup")):
+            _write_json(os.path.join(self.root, ".zgroup"), {"zarr_format": ZARR_FORMAT})
+        self._arrays: Dict[Tuple[str, int], ChunkedArray] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        """Rasters in the store."""
+        return sorted(entry.name for entry in os.scandir(self.root)
+                      if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".zgroup")))
+
+    def attrs(self, name: str) -> Dict:
+        path = os.path.join(self.root, name, ".zattrs")
+        return _read_json(path) if os.path.exists(path) else {}
+
+    def set_attrs(self, name: str, attrs: Dict):
+        _write_json(os.path.join(self.root, name, ".zattrs"), attrs)
+
+    def levels(self, name: str) -> int:
+        """Number of resolution levels stored for ``name``."""
+        multiscales = self.attrs(name).get("multiscales") or [{}]
+        return len(multiscales[0].get("datasets", [])) or 1
+
+    def create_array(self, name: str, shape: Tuple[int, int], dtype: Any, level: int = 0,
+                     fill_value: Any = 0, attrs: Optional[Dict] = None) -> ChunkedArray:
+        """Create resolution ``level`` of raster ``name``."""
+        group = os.path.join(self.root, name)
+        os.makedirs(group, exist_ok=True)
+        if not os.path.exists(os.path.join(group, ".zgroup")):
+            _write_json(os.path.join(group, ".zgroup"), {"zarr_format": ZARR_FORMAT})
+        array = ChunkedArray.create(
+            os.path.join(group, str(level)), shape, dtype,
+            chunks=(self.chunk_size, self.chunk_size), fill_value=fill_value,
+            compression_level=self.compression_level
+        )
+        if level == 0 or attrs is not None:
+            current = self.attrs(name)
+            current.update(attrs or {})
+            current.setdefault("multiscales", [{"version": "0.4", "name": name, "datasets": [{"path": "0"}]}])
+            datasets = current["multiscales"][0]["datasets"]
+            if {"path": str(level)} not in datasets:
+                datasets.append({"path": str(level)})
+            self.set_attrs(name, current)
+        with self._lock:
+            self._arrays[(name, level)] = array
+        return array
+
+    def array(self, name: str, level: int = 0) -> ChunkedArray:
+        """Open resolution ``level`` of raster ``name``."""
+        with self._lock:
+            array = self._arrays.get((name, level))
+            if array is None:
+                path = os.path.join(self.root, name, str(level))
+                if not os.path.exists(os.path.join(path, ".zarray")):
+                    raise KeyError(f"No raster '{name}' at level {level} in {self.root}")
+                array = self._arrays[(name, level)] = ChunkedArray(path)
+            return array
+
+    @property
+    def alignment(self) -> int:
+        """
+        Pixel multiple that tile windows passed to write() should start at,
+        so that every overview is produced while the tiles are written.
+        """
+        if not self.overviews or self.shape is None:
+            return 1
+        alignment = 1
+        size = max(self.shape)
+        while size > self.chunk_size and alignment < MAX_ALIGNMENT:
+            size = (size + 1) // 2
+            alignment *= 2
+        return alignment
+
+    def write(self, name: str, window: Optional[Window], values: np.ndarray):
+        """
+        Write a window of full-resolution raster ``name``.
+
+        Rasters first written here are created with the store shape and, if
+        ``overviews`` is set, reduced into their overview levels on the fly;
+        call finish() once all tiles are written.
+        """
+        with self._lock:
+            pyramid = self._pyramids.get(name)
+        if pyramid is None:
+            try:
+                self.array(name).write(window, values)
+                return
+            except KeyError:
+                if self.shape is None:
+                    raise ValueError(f"Raster '{name}' does not exist and the store has no default shape")
+            pyramid = PyramidWriter(
+                self, name, self.shape, np.asarray(values).dtype,
+                min_size=None if self.overviews else max(self.shape),
+                streamed_levels=self.alignment.bit_length() - 1
+            )
+            with self._lock:
+                pyramid = self._pyramids.setdefault(name, pyramid)
+        pyramid.write(window, values)
+
+    def finish(self) -> Dict[str, int]:
+        """
+        Complete the overviews of the rasters written through write().
+
+        Returns:
+            Number of levels per raster
+        """
+        with self._lock:
+            pyramids = dict(self._pyramids)
+        return {name: pyramid.finish() for name, pyramid in sorted(pyramids.items())}
+
+    def read(self, name: str, window: Optional[Window] = None, level: int = 0) -> np.ndarray:
+        """Window of raster ``name`` at resolution ``level`` (window given in that level's pixels)."""
+        return self.array(name, level).read(window)
+
+    def build_overviews(self, name: str, min_size: Optional[int] = None,
+                        resampling: Optional[str] = None) -> int:
+        """
+        Add 2x overview levels to an existing raster until it fits
+        ``min_size`` (one chunk by default), reading the level above chunk by
+        chunk. Rasters written through write() get theirs from finish().
+
+        Returns:
+            Number of levels, including full resolution
+        """
+        base = self.array(name)
+        pyramid = PyramidWriter(self, name, base.shape, base.dtype, min_size=min_size,
+                                resampling=resampling, streamed_levels=0, fill_value=base.fill_value)
+        return pyramid.finish()
@@ -0,0 +1,320 @@
+"""
+Detection History Store
+
+This module persists compiled detections in SQLite with an R*Tree index
+over (longitude, latitude, time), so that bounding-box + date-range +
+confidence queries stay fast over millions of rows. Results are returned
+newest first with keyset (cursor) pagination.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    rowid INTEGER PRIMARY KEY,
+    detection_id TEXT NOT NULL UNIQUE,
+    request_id TEXT,
+    detected_at REAL NOT NULL,
+    confidence REAL NOT NULL,
+    area_ha REAL,
+    location TEXT,
+    geometry TEXT NOT NULL,
+    properties TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_detections_time ON detections (detected_at, rowid);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+"""
+
+RTREE_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS detections_index USING rtree(
+    id, min_lon, max_lon, min_lat, max_lat, min_t, max_t
+);
+"""
+
+# Used when SQLite was built without the R*Tree module
+FALLBACK_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections_index (
+    id INTEGER PRIMARY KEY,
+    min_lon REAL, max_lon REAL, min_lat REAL, max_lat REAL, min_t REAL, max_t REAL
+);
+CREATE INDEX IF NOT EXISTS idx_detections_index_bbox ON detections_index (min_lon, min_lat);
+"""
+
+
+def to_timestamp(value: Any) -> float:
+    """
+    Convert a datetime, ISO string or YYYY-MM-DD date to UTC epoch seconds.
+
+    Naive datetimes are interpreted as UTC.
+    """
+    if value is None:
+        return datetime.now(timezone.utc).timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def geometry_to_geojson(geometry: Any) -> Dict:
+    """Return a GeoJSON dict for a GeoJSON dict or an object with __geo_interface__."""
+    if hasattr(geometry, "__geo_interface__"):
+        geometry = geometry.__geo_interface__
+    return json.loads(json.dumps(geometry))
+
+
+def geometry_bounds(geometry: Dict) -> Tuple[float, float, float, float]:
+    """Bounding box (min_lon, min_lat, max_lon, max_lat) of a GeoJSON geometry."""
+    def points(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            yield coords
+        else:
+            for part in coords:
+                yield from points(part)
+
+    xs, ys = [], []
+    for point in points(geometry["coordinates"]):
+        xs.append(point[0])
+        ys.append(point[1])
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def encode_cursor(detected_at: float, rowid: int) -> str:
+    """Opaque pagination cursor for the last row of a page."""
+    return base64.urlsafe_b64encode(f"{detected_at!r}:{rowid}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    try:
+        detected_at, rowid = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(detected_at), int(rowid)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class DetectionStore:
+    """
+    SQLite-backed detection history with a spatio-temporal R*Tree index.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a detection store.
+
+        Args:
+            path: SQLite database file, or ':memory:'
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(RTREE_SCHEMA)
+            self.rtree = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite R*Tree module unavailable, using B-tree bounding box index")
+            self._conn.executescript(FALLBACK_INDEX_SCHEMA)
+            self.rtree = False
+        self._conn.commit()
+
+    @property
+    def version(self) -> int:
+        """
+        Write counter, bumped by every ingest.
+
+        It is persisted in the database so that caches keyed by it (e.g. map
+        tiles) stay valid across restarts and between processes.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    def close(self):
+        """Close the underlying connection (the shared store is reopened on next use)."""
+        global _detection_store
+        with self._lock:
+            self._conn.close()
+        with _detection_store_lock:
+            if _detection_store is self:
+                _detection_store = None
+
+    def ingest(self, detections: Iterable[Dict], request_id: Optional[str] = None) -> int:
+        """
+        Insert or update compiled detections.
+
+        Args:
+            detections: Detection dictionaries (id, geometry, confidence, area_ha,
+                timestamp, location, ...); geometry may be GeoJSON or a shapely object
+            request_id: Detection request that produced them
+
+        Returns:
+            Number of detections written
+        """
+        rows = []
+        for detection in detections:
+            geometry = geometry_to_geojson(detection["geometry"])
+            min_lon, min_lat, max_lon, max_lat = geometry_bounds(geometry)
+            detected_at = to_timestamp(detection.get("timestamp"))
+            properties = {
+                k: v for k, v in detection.items()
+                if k not in ("id", "geometry", "timestamp", "confidence", "area_ha", "location")
+            }
+            rows.append((
+                str(detection["id"]), request_id, detected_at,
+                float(detection.get("confidence", 0.0)),
+                detection.get("area_ha"), detection.get("location"),
+                json.dumps(geometry), json.dumps(properties, default=str),
+                (min_lon, max_lon, min_lat, max_lat, detected_at, detected_at)
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            with self._conn:
+                for *record, bbox in rows:
+                    self._conn.execute(
+                        """
+                        INSERT INTO detections (detection_id, request_id, detected_at, confidence,
+                                                area_ha, location, geometry, properties)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(detection_id) DO UPDATE SET
+                            request_id = excluded.request_id,
+                            detected_at = excluded.detected_at,
+                            confidence = excluded.confidence,
+                            area_ha = excluded.area_ha,
+                            location = excluded.location,
+                            geometry = excluded.geometry,
+                            properties = excluded.properties
+                        """,
+                        record
+                    )
+                    rowid = self._conn.execute(
+                        "SELECT rowid FROM detections WHERE detection_id = ?", (record[0],)
+                    ).fetchone()[0]
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO detections_index VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (rowid, *bbox)
+                    )
+                self._conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+
+        return len(rows)
+
+    def query(self, bounds: Sequence[float], start: Any = None, end: Any = None,
+              min_confidence: float = 0.0, limit: int = 100,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find detections intersecting a bounding box within a time range.
+
+        Args:
+            bounds: [min_lon, min_lat, max_lon, max_lat]
+            start: Earliest detection time (datetime, ISO string or epoch seconds)
+            end: Latest detection time
+            min_confidence: Minimum confidence
+            limit: Page size
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            Dictionary with 'detections' (newest first) and 'next_cursor'
+        """
+        start_ts = to_timestamp(start) if start is not None else float("-inf")
+        end_ts = to_timestamp(end) if end is not None else float("inf")
+
+        sql = """
+            SELECT d.rowid, d.detection_id, d.request_id, d.detected_at, d.confidence,
+                   d.area_ha, d.location, d.geometry, d.properties
+            FROM detections_index AS r
+            JOIN detections AS d ON d.rowid = r.id
+            WHERE r.max_lon >= ? AND r.min_lon <= ?
+              AND r.max_lat >= ? AND r.min_lat <= ?
+              AND r.max_t >= ? AND r.min_t <= ?
+              AND d.detected_at >= ? AND d.detected_at <= ?
+              AND d.confidence >= ?
+        """
+        params: List[Any] = [
+            bounds[0], bounds[2], bounds[1], bounds[3],
+            start_ts, end_ts, start_ts, end_ts, min_confidence
+        ]
+        if cursor:
+            cursor_ts, cursor_rowid = decode_cursor(cursor)
+            sql += " AND (d.detected_at, d.rowid) < (?, ?)"
+            params += [cursor_ts, cursor_rowid]
+        sql += " ORDER BY d.detected_at DESC, d.rowid DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        page = rows[:limit]
+        detections = [
+            {
+                "id": detection_id,
+                "request_id": request_id,
+                "timestamp": datetime.fromtimestamp(detected_at, timezone.utc).isoformat(),
+                "confidence": confidence,
+                "area_ha": area_ha,
+                "location": location,
+                "geometry": json.loads(geometry),
+                **json.loads(properties or "{}")
+            }
+            for _, detection_id, request_id, detected_at, confidence, area_ha, location, geometry, properties in page
+        ]
+        next_cursor = encode_cursor(page[-1][3], page[-1][0]) if len(rows) > limit else None
+
+        return {"detections": detections, "next_cursor": next_cursor}
+
+    def count(self) -> int:
+        """Total number of stored detections."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+
+
+_detection_store: Optional[DetectionStore] = None
+_detection_store_lock = threading.Lock()
+
+
+def get_detection_store(path: str = "data/detections.sqlite") -> DetectionStore:
+    """
+    Get the shared detection store, opening it on first use.
+
+    Args:
+        path: SQLite database file used when the store is first opened
+
+    Returns:
+        Shared DetectionStore instance
+    """
+    global _detection_store
+
+    if _detection_store is None:
+        with _detection_store_lock:
+            if _detection_store is None:
+                _detection_store = DetectionStore(path)
+                logger.info(f"Opened detection store at {path} (rtree={_detection_store.rtree})")
+
+    return _detection_store
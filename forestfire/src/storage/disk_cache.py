@@ -0,0 +1,288 @@
+"""
+Raster Disk Cache
+
+Content-addressed cache for band arrays, index rasters and masks, configured
+by ``performance.caching`` (cache_dir, max_cache_size_gb, ttl_hours). Each
+entry is one compressed ``.npz`` file named by the hash of its inputs, so
+repeated runs over the same scenes skip refetching and recomputation.
+
+Entries are written to a temporary file and renamed into place, so worker
+processes sharing the directory never read a partial entry. Eviction needs
+no index: the file modification time is the write time (TTL) and the access
+time, refreshed on every hit, gives least-recently-used order.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+from utils.hashing import fingerprint_array, stable_key
+from utils.metrics import REGISTRY
+
+ENTRY_SUFFIX = ".npz"
+
+# Temporary files older than this belong to a crashed writer
+STALE_TEMP_SECONDS = 3600
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "forestfire_disk_cache_requests_total",
+    "Raster disk cache lookups by namespace and result",
+    ("namespace", "result")
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "forestfire_disk_cache_evictions_total",
+    "Raster disk cache entries removed by reason",
+    ("reason",)
+)
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    """
+    Content address of a cache entry.
+
+    Arrays among ``parts`` are represented by their content fingerprint,
+    mappings by their sorted items; everything else by its string form.
+    """
+    def canonical(part):
+        if isinstance(part, np.ndarray):
+            return fingerprint_array(part)
+        if isinstance(part, Mapping):
+            return "{" + ",".join(f"{key}={canonical(value)}" for key, value in sorted(part.items())) + "}"
+        if isinstance(part, (list, tuple)):
+            return "[" + ",".join(canonical(value) for value in part) + "]"
+        return str(part)
+
+    return f"{namespace}-{stable_key(*(canonical(part) for part in parts))}"
+
+
+class DiskCache:
+    """
+    Size-bounded LRU + TTL cache of named array bundles on local disk.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: Optional[float] = None,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            cache_dir: Directory holding the entries (created if missing)
+            max_size_bytes: Total size above which least recently used entries are evicted
+            ttl_seconds: Age after which entries are ignored and removed
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._size_estimate: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, caching: Optional[Mapping[str, Any]]) -> Optional["DiskCache"]:
+        """Shared cache for a ``performance.caching`` section, or None when caching is disabled."""
+        caching = caching or {}
+        if not caching.get("enabled", False):
+            return None
+        max_gb = caching.get("max_cache_size_gb")
+        ttl_hours = caching.get("ttl_hours")
+        return get_disk_cache(
+            caching.get("cache_dir", "cache"),
+            max_size_bytes=float(max_gb) * 2 ** 30 if max_gb else None,
+            ttl_seconds=float(ttl_hours) * 3600 if ttl_hours else None
+        )
+
+    def _path(self, key: str) -> str:
+        digest = key.rsplit("-", 1)[-1]
+        return os.path.join(self.cache_dir, digest[:2], key + ENTRY_SUFFIX)
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stat.st_mtime > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Arrays stored under ``key``, or None on a miss.
+
+        Unreadable or expired entries count as misses and are removed.
+        """
+        namespace = key.rsplit("-", 1)[0]
+        path = self._path(key)
+        now = time.time()
+        try:
+            stat = os.stat(path)
+            if self._expired(stat, now):
+                self._remove(path, "ttl")
+                raise FileNotFoundError(path)
+            with np.load(path, allow_pickle=False) as bundle:
+                arrays = {name: bundle[name] for name in bundle.files}
+            # Access time orders eviction; keep the write time for the TTL
+            os.utime(path, (now, stat.st_mtime))
+        except FileNotFoundError:
+            arrays = None
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(path, "corrupt")
+            arrays = None
+
+        with self._lock:
+            if arrays is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        CACHE_REQUESTS.inc(namespace=namespace, result="miss" if arrays is None else "hit")
+        return arrays
+
+    def put(self, key: str, arrays: Mapping[str, np.ndarray]) -> bool:
+        """
+        Store ``arrays`` under ``key`` atomically.
+
+        Returns:
+            False if the entry could not be written (the cache is best effort)
+        """
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez_compressed(f, **{name: np.asarray(value) for name, value in arrays.items()})
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            return False
+
+        with self._lock:
+            self.writes += 1
+            if self._size_estimate is not None:
+                self._size_estimate += size
+            over_budget = self.max_size_bytes is not None and (
+                self._size_estimate is None or self._size_estimate > self.max_size_bytes
+            )
+        if over_budget:
+            self.evict()
+        return True
+
+    def get_or_compute(self, key: str, compute: Callable[[], Mapping[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Cached arrays for ``key``, computing and storing them on a miss."""
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = dict(compute())
+            self.put(key, arrays)
+        return arrays
+
+    def _remove(self, path: str, reason: str) -> int:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        with self._lock:
+            self.evictions += 1
+        CACHE_EVICTIONS.inc(reason=reason)
+        return size
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until the
+        cache fits ``max_size_bytes``.
+
+        Returns:
+            Number of bytes freed
+        """
+        now = time.time()
+        entries = []
+        freed = 0
+        for directory, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        freed += self._remove(path, "stale")
+                elif name.endswith(ENTRY_SUFFIX):
+                    if self._expired(stat, now):
+                        freed += self._remove(path, "ttl")
+                    else:
+                        entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if self.max_size_bytes is not None and total > self.max_size_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                removed = self._remove(path, "size")
+                total -= removed
+                freed += removed
+
+        with self._lock:
+            self._size_estimate = total
+        return freed
+
+    def clear(self):
+        """Remove every entry."""
+        for directory, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith((ENTRY_SUFFIX, ".tmp")):
+                    self._remove(os.path.join(directory, name), "clear")
+        with self._lock:
+            self._size_estimate = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache_dir": self.cache_dir,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "size_bytes": self._size_estimate
+            }
+
+
+_disk_caches: Dict[str, DiskCache] = {}
+_disk_caches_lock = threading.Lock()
+
+
+def get_disk_cache(cache_dir: str = "cache", max_size_bytes: Optional[float] = None,
+                   ttl_seconds: Optional[float] = None) -> DiskCache:
+    """
+    Get the shared cache for a directory, opening it on first use.
+
+    Limits given for a directory that is already open replace the previous ones.
+    """
+    path = os.path.abspath(cache_dir)
+    with _disk_caches_lock:
+        cache = _disk_caches.get(path)
+        if cache is None:
+            cache = _disk_caches[path] = DiskCache(path, max_size_bytes, ttl_seconds)
+            logger.info(f"Opened raster disk cache at {path}")
+        else:
+            cache.max_size_bytes = max_size_bytes
+            cache.ttl_seconds = ttl_seconds
+    return cache
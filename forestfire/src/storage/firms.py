@@ -0,0 +1,154 @@
+"""
+FIRMS Hotspot CSV Parsing
+
+Streams NASA FIRMS active-fire CSV files (VIIRS and MODIS, archive or
+near-real-time) into typed columnar NumPy arrays, a chunk of rows at a
+time, so files of any size are parsed with bounded memory. The format is
+recognised from the header: VIIRS files report ``bright_ti4`` and a
+categorical confidence (l/n/h), MODIS files ``brightness`` and a
+percentage.
+
+Each chunk is a dictionary of equally sized arrays:
+
+    lat, lon          float64, degrees
+    brightness        float32, Kelvin (I4 band for VIIRS, band 21/22 for MODIS)
+    frp               float32, fire radiative power in MW
+    confidence        float32, 0-1
+    acquired          int64, UTC epoch seconds of acq_date + acq_time
+    satellite         str, FIRMS satellite code (N, N20, Terra, Aqua, ...)
+
+Rows with missing coordinates or acquisition time are dropped.
+"""
+
+from typing import IO, Dict, Iterator, Optional, Union
+
+import numpy as np
+
+# Rows parsed per chunk
+DEFAULT_CHUNK_ROWS = 200000
+
+SOURCES = ("viirs", "modis")
+
+# Brightness temperature column of each source
+BRIGHTNESS_COLUMNS = {"viirs": "bright_ti4", "modis": "brightness"}
+
+# VIIRS reports confidence as low / nominal / high
+VIIRS_CONFIDENCE = {"l": 0.3, "n": 0.6, "h": 0.9}
+
+REQUIRED_COLUMNS = ("latitude", "longitude", "acq_date", "acq_time", "confidence", "frp")
+
+
+def detect_source(columns) -> str:
+    """'viirs' or 'modis' from the header of a FIRMS file."""
+    columns = set(columns)
+    for source, brightness in BRIGHTNESS_COLUMNS.items():
+        if brightness in columns:
+            return source
+    raise ValueError("Not a FIRMS hotspot file: no bright_ti4 or brightness column")
+
+
+def read_header(path: Union[str, IO]) -> list:
+    """Lower-case column names of a CSV file (the position of open files is kept)."""
+    if hasattr(path, "readline"):
+        position = path.tell()
+        header = path.readline()
+        path.seek(position)
+    else:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            header = f.readline()
+    if isinstance(header, bytes):
+        header = header.decode("utf-8-sig")
+    return [name.strip().lower() for name in header.lstrip("\ufeff").split(",")]
+
+
+def parse_confidence(values) -> np.ndarray:
+    """
+    Confidence as a 0-1 float from MODIS percentages or VIIRS l/n/h classes.
+
+    Unknown values become NaN.
+    """
+    import pandas as pd
+
+    text = pd.Series(values).astype(str).str.strip().str.lower()
+    percent = pd.to_numeric(text, errors="coerce") / 100
+    return percent.fillna(text.str[:1].map(VIIRS_CONFIDENCE)).to_numpy(np.float32, na_value=np.nan)
+
+
+def read_firms_csv(path: Union[str, IO], source: Optional[str] = None,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Parse a FIRMS CSV file into columnar chunks.
+
+    Args:
+        path: File path or open file
+        source: 'viirs' or 'modis' (detected from the header by default)
+        chunk_rows: Rows per chunk
+
+    Yields:
+        Dictionaries of typed column arrays (see module docstring)
+    """
+    import pandas as pd
+
+    columns = read_header(path)
+    source = source or detect_source(columns)
+    if source not in BRIGHTNESS_COLUMNS:
+        raise ValueError(f"Unknown hotspot source '{source}', expected one of: {', '.join(SOURCES)}")
+    missing = [name for name in REQUIRED_COLUMNS + (BRIGHTNESS_COLUMNS[source],) if name not in columns]
+    if missing:
+        raise ValueError(f"FIRMS file is missing columns: {', '.join(missing)}")
+
+    brightness = BRIGHTNESS_COLUMNS[source]
+    wanted = {"latitude", "longitude", brightness, "frp", "confidence", "acq_date", "acq_time", "satellite"}
+    # Dates, satellites and confidence take few distinct values per file: read
+    # them as categories and convert each distinct value once
+    reader = pd.read_csv(
+        path,
+        header=0,
+        names=columns,
+        usecols=[name for name in columns if name in wanted],
+        dtype={"latitude": np.float64, "longitude": np.float64, brightness: np.float32, "frp": np.float32,
+               "acq_time": np.float64, "acq_date": "category", "satellite": "category", "confidence": "category"},
+        chunksize=chunk_rows,
+        encoding="utf-8-sig",
+    )
+    for frame in reader:
+        days = _decode_categories(frame["acq_date"], _parse_days, np.float64)
+        valid = (frame["latitude"].notna() & frame["longitude"].notna() & frame["acq_time"].notna()).to_numpy()
+        valid = valid & ~np.isnan(days)
+        if not valid.all():
+            frame, days = frame[valid], days[valid]
+        if frame.empty:
+            continue
+
+        if "satellite" in frame:
+            satellite = _decode_categories(frame["satellite"], lambda values: np.asarray(values, dtype=str), str)
+        else:
+            satellite = np.full(len(frame), "", dtype=str)
+        hhmm = frame["acq_time"].to_numpy(np.int64)
+        yield {
+            "lat": frame["latitude"].to_numpy(np.float64),
+            "lon": frame["longitude"].to_numpy(np.float64),
+            "brightness": frame[brightness].to_numpy(np.float32, na_value=np.nan),
+            "frp": frame["frp"].to_numpy(np.float32, na_value=np.nan),
+            "confidence": _decode_categories(frame["confidence"], parse_confidence, np.float32),
+            "acquired": days.astype(np.int64) * 86400 + (hhmm // 100) * 3600 + (hhmm % 100) * 60,
+            "satellite": satellite,
+        }
+
+
+def _parse_days(values) -> np.ndarray:
+    """Days since the epoch of YYYY-MM-DD strings (NaN if unparseable)."""
+    import pandas as pd
+
+    dates = pd.to_datetime(pd.Series(values, dtype=object), format="%Y-%m-%d", errors="coerce")
+    return (dates - pd.Timestamp(0)).dt.days.to_numpy(np.float64, na_value=np.nan)
+
+
+def _decode_categories(column, convert, dtype) -> np.ndarray:
+    """Apply ``convert`` to the distinct values of a categorical column and expand by code."""
+    categories = column.cat.categories
+    codes = column.cat.codes.to_numpy()
+    missing = np.nan if np.dtype(dtype).kind == "f" else ""
+    decoded = np.append(np.asarray(convert(categories.astype(str)), dtype=dtype),
+                        np.asarray([missing], dtype=dtype))
+    return decoded[codes]  # code -1 (missing) picks the appended value
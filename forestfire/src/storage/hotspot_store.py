@@ -0,0 +1,347 @@
+"""
+Hotspot Store
+
+Persists FIRMS thermal hotspots in SQLite, next to the detection history.
+Rows are appended in bulk from the columnar chunks of storage.firms.
+
+Hotspots are points, so instead of an R*Tree (whose inserts are several
+times slower) a single B-tree over (grid cell, acquisition time, position,
+source, satellite) serves both purposes: it is the unique key that drops
+re-delivered rows (overlapping near-real-time and archive downloads), and
+bounding box + time queries scan only the cells they overlap. Each chunk is
+sorted by that key before insertion so the index is written sequentially.
+Queries return columnar arrays.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+from .detection_store import to_timestamp
+from .firms import DEFAULT_CHUNK_ROWS, detect_source, read_firms_csv, read_header
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotspots (
+    rowid INTEGER PRIMARY KEY,
+    cell INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    satellite TEXT NOT NULL,
+    acquired INTEGER NOT NULL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    brightness REAL,
+    frp REAL,
+    confidence REAL,
+    UNIQUE (cell, acquired, lat, lon, source, satellite)
+);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    inserted INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+"""
+
+# Side of the grid cells of the index, in degrees
+GRID_DEGREES = 1.0
+GRID_ROWS = int(180 / GRID_DEGREES)
+GRID_COLS = int(360 / GRID_DEGREES)
+
+# Columns returned by queries, in table order
+COLUMNS = ("id", "source", "satellite", "acquired", "lat", "lon", "brightness", "frp", "confidence")
+
+COLUMN_DTYPES = {
+    "id": np.int64, "acquired": np.int64, "lat": np.float64, "lon": np.float64,
+    "brightness": np.float32, "frp": np.float32, "confidence": np.float32,
+}
+
+
+def grid_cell(lat, lon) -> np.ndarray:
+    """Index grid cell of each position (row-major from 90S, 180W)."""
+    row = np.clip(np.floor((np.asarray(lat) + 90) / GRID_DEGREES), 0, GRID_ROWS - 1).astype(np.int64)
+    col = np.clip(np.floor((np.asarray(lon) + 180) / GRID_DEGREES), 0, GRID_COLS - 1).astype(np.int64)
+    return row * GRID_COLS + col
+
+
+def cell_ranges(bounds: Sequence[float]) -> List[Tuple[int, int]]:
+    """Inclusive ranges of grid cells covering a bounding box, one per grid row."""
+    lower, upper = grid_cell([bounds[1], bounds[3]], [bounds[0], bounds[2]]).tolist()
+    first_row, first_col = divmod(lower, GRID_COLS)
+    last_row, last_col = divmod(upper, GRID_COLS)
+    return [(row * GRID_COLS + first_col, row * GRID_COLS + last_col) for row in range(first_row, last_row + 1)]
+
+
+class HotspotStore:
+    """
+    SQLite-backed FIRMS hotspot archive indexed by grid cell and time.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a hotspot store.
+
+        Args:
+            path: SQLite database file, or ':memory:'
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @property
+    def version(self) -> int:
+        """Write counter, bumped by every append that added rows (part of the hotspot ETag)."""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    def close(self):
+        """Close the underlying connection (the shared store is reopened on next use)."""
+        global _hotspot_store
+        with self._lock:
+            self._conn.close()
+        with _hotspot_store_lock:
+            if _hotspot_store is self:
+                _hotspot_store = None
+
+    def append(self, columns: Dict[str, np.ndarray], source: str) -> int:
+        """
+        Append a columnar chunk of hotspots, ignoring rows already stored.
+
+        Args:
+            columns: Arrays as produced by storage.firms.read_firms_csv
+            source: 'viirs' or 'modis'
+
+        Returns:
+            Number of new rows
+        """
+        count = len(columns["lat"])
+        if count == 0:
+            return 0
+        cells = grid_cell(columns["lat"], columns["lon"])
+        order = np.lexsort((columns["acquired"], cells))
+        satellite = columns["satellite"][order].tolist() if "satellite" in columns else [""] * count
+        rows = zip(
+            cells[order].tolist(), [source] * count, satellite,
+            *(columns[name][order].tolist() for name in ("acquired", "lat", "lon", "brightness", "frp", "confidence"))
+        )  # SQLite stores NaN as NULL
+
+        with self._lock:
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO hotspots
+                        (cell, source, satellite, acquired, lat, lon, brightness, frp, confidence)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows
+                )
+                inserted = self._conn.total_changes - before
+                if inserted:
+                    self._conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+                    # Row counts per source, so existence checks never scan the table
+                    self._conn.execute(
+                        """
+                        INSERT INTO store_meta (key, value) VALUES (?, ?)
+                        ON CONFLICT (key) DO UPDATE SET value = value + excluded.value
+                        """,
+                        (f"rows:{source}", inserted)
+                    )
+        return inserted
+
+    def ingest(self, chunks: Iterable[Dict[str, np.ndarray]], source: str) -> Dict[str, int]:
+        """
+        Append every chunk of a parsed file.
+
+        Returns:
+            Dictionary with 'rows' read and 'inserted' new rows
+        """
+        rows = inserted = 0
+        for chunk in chunks:
+            rows += len(chunk["lat"])
+            inserted += self.append(chunk, source)
+        return {"rows": rows, "inserted": inserted}
+
+    def ingest_csv(self, path: str, source: Optional[str] = None,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS, force: bool = False) -> Dict[str, Any]:
+        """
+        Stream a FIRMS CSV file into the store.
+
+        Files already ingested with the same size and modification time are
+        skipped unless ``force`` is set.
+
+        Args:
+            path: FIRMS CSV file
+            source: 'viirs' or 'modis' (detected from the header by default)
+            chunk_rows: Rows parsed and appended per chunk
+            force: Re-read the file even if it is unchanged
+
+        Returns:
+            Dictionary with 'rows', 'inserted', 'duplicates', 'seconds' and 'skipped'
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        if not force:
+            with self._lock:
+                known = self._conn.execute(
+                    "SELECT size, mtime_ns FROM ingested_files WHERE path = ?", (path,)
+                ).fetchone()
+            if known == (stat.st_size, stat.st_mtime_ns):
+                return {"rows": 0, "inserted": 0, "duplicates": 0, "seconds": 0.0, "skipped": True}
+
+        if source is None:
+            source = detect_source(read_header(path))
+
+        started = time.perf_counter()
+        counts = self.ingest(read_firms_csv(path, source, chunk_rows), source)
+        seconds = time.perf_counter() - started
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, counts["rows"], counts["inserted"])
+                )
+        logger.info(f"Ingested {counts['inserted']} of {counts['rows']} {source} hotspots from {path} "
+                    f"({counts['rows'] / max(seconds, 1e-9):,.0f} rows/s)")
+        return {**counts, "duplicates": counts["rows"] - counts["inserted"],
+                "seconds": round(seconds, 3), "skipped": False}
+
+    def ingest_directory(self, directory: str, source: Optional[str] = None) -> Dict[str, int]:
+        """
+        Ingest every new or changed ``*.csv`` file of a directory.
+
+        Unreadable files are logged and skipped.
+
+        Returns:
+            Dictionary with 'files', 'rows' and 'inserted'
+        """
+        totals = {"files": 0, "rows": 0, "inserted": 0}
+        if not os.path.isdir(directory):
+            return totals
+        for name in sorted(os.listdir(directory)):
+            if not name.lower().endswith(".csv"):
+                continue
+            try:
+                stats = self.ingest_csv(os.path.join(directory, name), source)
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not ingest hotspot file {name}: {e}")
+                continue
+            if not stats["skipped"]:
+                totals["files"] += 1
+                totals["rows"] += stats["rows"]
+                totals["inserted"] += stats["inserted"]
+        return totals
+
+    def has_data(self, source: Optional[str] = None) -> bool:
+        """Whether any hotspot (of ``source``) is stored."""
+        return self.count(source) > 0
+
+    def query(self, bounds: Sequence[float], start: Any = None, end: Any = None,
+              source: Optional[str] = None, min_confidence: float = 0.0,
+              limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Hotspots inside a bounding box and time range, newest first.
+
+        Args:
+            bounds: [min_lon, min_lat, max_lon, max_lat]
+            start: Earliest acquisition time (datetime, ISO string or epoch seconds)
+            end: Latest acquisition time
+            source: Restrict to 'viirs' or 'modis'
+            min_confidence: Minimum confidence (0-1)
+            limit: Maximum number of hotspots
+
+        Returns:
+            Dictionary of column arrays (id, source, satellite, acquired, lat,
+            lon, brightness, frp, confidence)
+        """
+        start_ts = to_timestamp(start) if start is not None else float("-inf")
+        end_ts = to_timestamp(end) if end is not None else float("inf")
+
+        ranges = cell_ranges(bounds)
+        sql = f"""
+            SELECT rowid, source, satellite, acquired, lat, lon, brightness, frp, confidence
+            FROM hotspots
+            WHERE ({" OR ".join(["cell BETWEEN ? AND ?"] * len(ranges))})
+              AND acquired >= ? AND acquired <= ?
+              AND lon >= ? AND lon <= ? AND lat >= ? AND lat <= ?
+        """
+        params = [cell for cell_range in ranges for cell in cell_range]
+        params += [start_ts, end_ts, bounds[0], bounds[2], bounds[1], bounds[3]]
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        if min_confidence > 0:
+            sql += " AND confidence >= ?"
+            params.append(min_confidence)
+        sql += " ORDER BY acquired DESC, rowid DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        values = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        return {
+            name: np.array(column, dtype=COLUMN_DTYPES[name]) if name in COLUMN_DTYPES
+            else np.array(column, dtype=str)
+            for name, column in zip(COLUMNS, values)
+        }
+
+    def count(self, source: Optional[str] = None) -> int:
+        """Number of stored hotspots (of ``source``)."""
+        sql, params = "SELECT COALESCE(SUM(value), 0) FROM store_meta WHERE key LIKE 'rows:%'", ()
+        if source is not None:
+            sql, params = "SELECT COALESCE(SUM(value), 0) FROM store_meta WHERE key = ?", (f"rows:{source}",)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+
+_hotspot_store: Optional[HotspotStore] = None
+_hotspot_store_lock = threading.Lock()
+
+
+def get_hotspot_store(path: str = "data/hotspots.sqlite") -> HotspotStore:
+    """
+    Get the shared hotspot store, opening it on first use.
+
+    Args:
+        path: SQLite database file used when the store is first opened
+
+    Returns:
+        Shared HotspotStore instance
+    """
+    global _hotspot_store
+
+    if _hotspot_store is None:
+        with _hotspot_store_lock:
+            if _hotspot_store is None:
+                _hotspot_store = HotspotStore(path)
+                logger.info(f"Opened hotspot store at {path}")
+
+    return _hotspot_store
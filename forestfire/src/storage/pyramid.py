@@ -0,0 +1,192 @@
+"""
+Raster Pyramids
+
+Builds 2x overview levels of a raster in the same pass that writes it: each
+full-resolution tile is reduced in memory and written to every overview
+level straight away, so previews never require reading the full-resolution
+data back. Continuous rasters (indices, dNBR) are averaged; class rasters
+(severity, masks) take the most frequent class of each 2x2 block.
+"""
+
+import warnings
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+Window = Tuple[slice, slice]
+
+
+def _pad_even(block: np.ndarray, fill: Any) -> np.ndarray:
+    rows, cols = block.shape
+    if rows % 2 == 0 and cols % 2 == 0:
+        return block
+    padded = np.full((rows + rows % 2, cols + cols % 2), fill, dtype=block.dtype)
+    padded[:rows, :cols] = block
+    return padded
+
+
+def downsample_mean(block: np.ndarray) -> np.ndarray:
+    """
+    Mean of every 2x2 block, ignoring NaN and the padding of odd edges.
+
+    Integer input is averaged in floating point and rounded back.
+    """
+    values = block.astype(np.float64) if not np.issubdtype(block.dtype, np.floating) else block
+    padded = _pad_even(values, np.nan)
+    rows, cols = padded.shape[0] // 2, padded.shape[1] // 2
+    blocks = padded.reshape(rows, 2, cols, 2)
+    valid = ~np.isnan(blocks)
+    counts = valid.sum(axis=(1, 3))
+    sums = np.where(valid, blocks, 0).sum(axis=(1, 3))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+    if np.issubdtype(block.dtype, np.floating):
+        return mean.astype(block.dtype, copy=False)
+    return np.rint(mean).astype(block.dtype)
+
+
+def downsample_mode(block: np.ndarray) -> np.ndarray:
+    """
+    Most frequent value of every 2x2 block; ties go to the larger value
+    (the more severe class, or True for masks).
+    """
+    rows, cols = (block.shape[0] + 1) // 2, (block.shape[1] + 1) // 2
+
+    def blocks(array):
+        return array.reshape(rows, 2, cols, 2).transpose(0, 2, 1, 3).reshape(rows, cols, 4)
+
+    values = blocks(_pad_even(block, 0))
+    valid = blocks(_pad_even(np.ones(block.shape, dtype=bool), False))
+
+    counts = np.zeros((rows, cols, 4), dtype=np.int64)
+    for i in range(4):
+        counts[..., i] = ((values == values[..., i:i + 1]) & valid).sum(axis=-1)
+    counts[~valid] = -1
+    # Rank candidates by count, then by value
+    order = np.argsort(np.argsort(values, axis=-1, kind="stable"), axis=-1)
+    choice = np.argmax(counts * 4 + order, axis=-1)
+    return np.take_along_axis(values, choice[..., None], axis=-1)[..., 0]
+
+
+def downsample_max(block: np.ndarray) -> np.ndarray:
+    """Maximum of every 2x2 block, ignoring NaN (keeps small hot features visible)."""
+    fill = np.nan if np.issubdtype(block.dtype, np.floating) else block.min(initial=0)
+    padded = _pad_even(block, fill)
+    rows, cols = padded.shape[0] // 2, padded.shape[1] // 2
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN blocks stay NaN
+        return np.nanmax(padded.reshape(rows, 2, cols, 2), axis=(1, 3)).astype(block.dtype, copy=False)
+
+
+RESAMPLING: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "mean": downsample_mean,
+    "mode": downsample_mode,
+    "max": downsample_max,
+}
+
+
+def default_resampling(dtype: Any) -> str:
+    """Averaging for floating-point rasters, mode for class and mask rasters."""
+    return "mean" if np.issubdtype(np.dtype(dtype), np.floating) else "mode"
+
+
+def overview_shapes(shape: Tuple[int, int], min_size: int) -> List[Tuple[int, int]]:
+    """Shapes of the full-resolution level and each 2x overview until the raster fits ``min_size``."""
+    shapes = [tuple(shape)]
+    while max(shapes[-1]) > min_size:
+        rows, cols = shapes[-1]
+        shapes.append(((rows + 1) // 2, (cols + 1) // 2))
+    return shapes
+
+
+def _halve(window: Window) -> Window:
+    return slice(window[0].start // 2, (window[0].stop + 1) // 2), slice(window[1].start // 2, (window[1].stop + 1) // 2)
+
+
+def _reducible(window: Window, shape: Tuple[int, int]) -> bool:
+    """Whether a window covers whole 2x2 blocks (odd sizes only at the raster edge)."""
+    return all(
+        part.start % 2 == 0 and (part.stop % 2 == 0 or part.stop == size)
+        for part, size in zip(window, shape)
+    )
+
+
+class PyramidWriter:
+    """
+    Writes one raster of an ArrayStore together with its overviews.
+
+    Tiles whose windows are aligned to ``2 ** streamed_levels`` pixels are
+    reduced through that many levels as they arrive. Deeper levels, which
+    are tiny, and any level a misaligned write touched are completed by
+    finish() from the level above.
+    """
+
+    def __init__(self, store, name: str, shape: Tuple[int, int], dtype: Any,
+                 min_size: Optional[int] = None, resampling: Optional[str] = None,
+                 streamed_levels: Optional[int] = None, fill_value: Any = 0):
+        """
+        Args:
+            store: ArrayStore receiving the levels
+            name: Raster name
+            shape: Full-resolution shape
+            dtype: Raster dtype
+            min_size: Stop adding levels once the raster fits this size (store chunk size by default)
+            resampling: 'mean', 'mode' or 'max' (chosen from the dtype by default)
+            streamed_levels: Levels reduced while tiles are written (all by default)
+            fill_value: Value of pixels never written
+        """
+        self.name = name
+        self.resampling = resampling or default_resampling(dtype)
+        if self.resampling not in RESAMPLING:
+            raise ValueError(f"Unknown resampling '{self.resampling}', expected one of: {', '.join(RESAMPLING)}")
+        self._reduce = RESAMPLING[self.resampling]
+
+        shapes = overview_shapes(shape, min_size or store.chunk_size)
+        try:
+            base = store.array(name)  # keep an existing full-resolution raster
+        except KeyError:
+            base = store.create_array(name, shapes[0], dtype, fill_value=fill_value)
+        self.arrays = [base] + [
+            store.create_array(name, level_shape, dtype, level=level, fill_value=fill_value,
+                               attrs={"resampling": self.resampling})
+            for level, level_shape in enumerate(shapes) if level > 0
+        ]
+        overviews = len(shapes) - 1
+        self.streamed_levels = overviews if streamed_levels is None else min(streamed_levels, overviews)
+        self._complete_from = self.streamed_levels + 1
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.arrays[0].shape
+
+    def write(self, window: Optional[Window], values: np.ndarray):
+        """Write a full-resolution window and its reductions to the streamed levels."""
+        window = window or (slice(0, self.shape[0]), slice(0, self.shape[1]))
+        self.arrays[0].write(window, values)
+        for level in range(1, self.streamed_levels + 1):
+            if not _reducible(window, self.arrays[level - 1].shape):
+                # Blocks straddle this tile and a neighbour; rebuild from here at the end
+                self._complete_from = min(self._complete_from, level)
+                return
+            values = self._reduce(values)
+            window = _halve(window)
+            self.arrays[level].write(window, values)
+
+    def finish(self) -> int:
+        """
+        Complete the levels not produced while streaming.
+
+        Returns:
+            Number of levels, including full resolution
+        """
+        for level in range(self._complete_from, len(self.arrays)):
+            source, target = self.arrays[level - 1], self.arrays[level]
+            rows, cols = target.chunks
+            for top in range(0, target.shape[0], rows):
+                for left in range(0, target.shape[1], cols):
+                    window = (slice(2 * top, min(2 * (top + rows), source.shape[0])),
+                              slice(2 * left, min(2 * (left + cols), source.shape[1])))
+                    block = self._reduce(source.read(window))
+                    target.write((slice(top, top + block.shape[0]), slice(left, left + block.shape[1])), block)
+        self._complete_from = len(self.arrays)
+        return len(self.arrays)
@@ -0,0 +1,159 @@
+"""
+Detection Run Memoization
+
+Whole-run cache for FireDetector.detect_fire_events. A run is addressed by
+the content fingerprints of its input rasters, the detection parameters,
+the scene metadata and a hash of the detection source code. When all of
+them match an earlier run, its results are read back from the disk cache
+instead of running the pipeline again, which makes reprocessing an archive
+with unchanged inputs and thresholds nearly free. Changing any band,
+threshold or detection module changes the address, so stale results are
+never served and nothing has to be invalidated by hand.
+
+Results carry a 'provenance' entry recording what they were derived from
+and whether they were served from the cache.
+"""
+
+import hashlib
+import importlib.util
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+from utils.hashing import fingerprint_array
+from .disk_cache import DiskCache, cache_key
+
+RUN_NAMESPACE = "run"
+
+# Modules whose source determines detection results
+CODE_MODULES = (
+    "detection.fire_detector",
+    "detection.spectral_indices",
+    "utils.geometry",
+    "utils.land_mask",
+)
+
+
+@lru_cache(maxsize=None)
+def code_version(modules: Sequence[str] = CODE_MODULES) -> str:
+    """Hash of the source files of ``modules`` (changes with any edit to the detection code)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in modules:
+        spec = importlib.util.find_spec(name)
+        digest.update(name.encode("utf-8"))
+        if spec is not None and spec.origin and spec.has_location:
+            with open(spec.origin, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def input_fingerprints(**groups: Any) -> Dict[str, str]:
+    """
+    Content fingerprints of the input rasters of a run.
+
+    Each keyword is a dict of bands (fingerprinted as ``<group>:<band>``)
+    or a single array; None values are skipped.
+    """
+    fingerprints = {}
+    for group, value in groups.items():
+        if value is None:
+            continue
+        if isinstance(value, Mapping):
+            for name, band in value.items():
+                fingerprints[f"{group}:{name}"] = fingerprint_array(band)
+        else:
+            fingerprints[group] = fingerprint_array(value)
+    return fingerprints
+
+
+def _encode(value: Any) -> Any:
+    # Types that JSON cannot represent are stored tagged and restored on load
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return {"__array__": value.tolist(), "dtype": value.dtype.str}
+    if hasattr(value, "__geo_interface__"):
+        return {"__geometry__": value.__geo_interface__}
+    raise TypeError(f"Object of type {type(value).__name__} cannot be cached")
+
+
+def _decode(obj: Dict) -> Any:
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__array__" in obj:
+        return np.asarray(obj["__array__"], dtype=obj["dtype"])
+    if "__geometry__" in obj:
+        from shapely.geometry import shape
+        return shape(obj["__geometry__"])
+    return obj
+
+
+def encode_results(results: Dict) -> np.ndarray:
+    """Detection results as a byte array for the disk cache."""
+    payload = json.dumps(results, default=_encode, separators=(",", ":")).encode("utf-8")
+    return np.frombuffer(payload, dtype=np.uint8)
+
+
+def decode_results(payload: np.ndarray) -> Dict:
+    """Inverse of encode_results (tuples come back as lists)."""
+    return json.loads(payload.tobytes().decode("utf-8"), object_hook=_decode)
+
+
+def memoized_run(cache: DiskCache, compute: Callable[[], Dict], parameters: Mapping[str, Any],
+                 metadata: Optional[Mapping[str, Any]], **inputs: Any) -> Dict:
+    """
+    Results of a detection run, from the cache when an identical run was stored.
+
+    Args:
+        cache: Disk cache holding the results
+        compute: Runs the pipeline on a miss
+        parameters: Detection parameters the results depend on
+        metadata: Scene metadata passed to the pipeline
+        **inputs: Input rasters, as for input_fingerprints
+
+    Returns:
+        Detection results with a 'provenance' entry. Failed runs are not stored.
+    """
+    fingerprints = input_fingerprints(**inputs)
+    version = code_version()
+    key = cache_key(RUN_NAMESPACE, fingerprints, parameters, metadata or {}, version)
+
+    cached = cache.get(key)
+    if cached is not None and "results" in cached:
+        try:
+            results = decode_results(cached["results"])
+        except (ValueError, TypeError, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cached run {key}: {e}")
+        else:
+            results["provenance"]["cached"] = True
+            logger.info(f"Detection run served from cache ({key})")
+            return results
+
+    results = compute()
+    results["provenance"] = {
+        "run_key": key,
+        "code_version": version,
+        "inputs": fingerprints,
+        "parameters": parameters,
+        "computed_at": datetime.now(),
+        "cached": False,
+    }
+    if "error" not in results:
+        try:
+            cache.put(key, {"results": encode_results(results)})
+        except TypeError as e:
+            logger.warning(f"Detection results not cached: {e}")
+    return results
@@ -6,10 +6,13 @@ with support for environment variables, multiple formats, and validation.
 """
 
 import os
+import threading
+import types
+import weakref
 import yaml
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field, validator
 from pydantic_settings import BaseSettings
 import logging
@@ -17,7 +20,7 @@ import warnings
 
 # Create a simple logger if loguru is not available
 try:
-from loguru import logger
+    from loguru import logger
 except ImportError:
     # Fallback to standard logging
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,6 +34,7 @@ class SystemConfig(BaseModel):
     debug: bool = Field(default=False)
     log_level: str = Field(default="INFO")
     timezone: str = Field(default="UTC")
+    config_reload_interval: float = Field(default=0, ge=0)  # seconds between file checks, 0 disables
 
 class APIConfig(BaseModel):
     host: str = Field(default="0.0.0.0")
@@ -40,6 +44,10 @@ class APIConfig(BaseModel):
     timeout: int = Field(default=300, ge=1)
     rate_limit: Dict[str, int] = Field(default_factory=dict)
     cors: Dict[str, Any] = Field(default_factory=dict)
+    scheduler: Dict[str, Any] = Field(default_factory=dict)
+    compression: Dict[str, Any] = Field(default_factory=dict)
+    batch: Dict[str, Any] = Field(default_factory=dict)
+    cache_control: Dict[str, str] = Field(default_factory=dict)
 
 class DatabaseConfig(BaseModel):
     type: str = Field(default="postgresql")
@@ -51,6 +59,9 @@ class DatabaseConfig(BaseModel):
     pool_size: int = Field(default=20, ge=1)
     max_overflow: int = Field(default=30, ge=0)
     echo: bool = Field(default=False)
+    detection_store_path: str = Field(default="data/detections.sqlite")
+    hotspot_store_path: str = Field(default="data/hotspots.sqlite")
+    hotspot_scan_interval: int = Field(default=3600, ge=0)
 
 class RedisConfig(BaseModel):
     host: str = Field(default="localhost")
@@ -101,6 +112,8 @@ class PerformanceConfig(BaseModel):
     parallel: Dict[str, Any] = Field(default_factory=dict)
     memory: Dict[str, Any] = Field(default_factory=dict)
     caching: Dict[str, Any] = Field(default_factory=dict)
+    output_store: Dict[str, Any] = Field(default_factory=dict)
+    progressive: Dict[str, Any] = Field(default_factory=dict)
 
 class MonitoringConfig(BaseModel):
     metrics: Dict[str, Any] = Field(default_factory=dict)
@@ -153,9 +166,84 @@ class MainConfig(BaseModel):
                    for k, region_data in v.items()}
         return v
 
+def _freeze(value: Any) -> Any:
+    """Read-only copy of nested dicts (MappingProxyType) and lists (tuples)."""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen value."""
+    if isinstance(value, types.MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ConfigSnapshot:
+    """
+    Immutable, flattened view of a validated configuration.
+    
+    Every dotted path (``detection``, ``detection.optical``,
+    ``detection.optical.nbr_threshold``) is precomputed, so lookups are a
+    single dictionary access. Sections are read-only mappings built once;
+    ``snapshot.get('detection', {})`` therefore also works where a plain
+    configuration dictionary is expected.
+    """
+    
+    def __init__(self, data: Dict[str, Any]):
+        self._values: Dict[str, Any] = {}
+        self._leaves: Dict[str, Any] = {}
+        self._root = _freeze(data)
+        self._flatten("", self._root)
+    
+    def _flatten(self, prefix: str, value: Any):
+        if isinstance(value, types.MappingProxyType):
+            if prefix:
+                self._values[prefix] = value
+            for key, item in value.items():
+                self._flatten(f"{prefix}.{key}" if prefix else str(key), item)
+        else:
+            self._values[prefix] = value
+            self._leaves[prefix] = value
+    
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """Value at a dotted path, or ``default`` if the path does not exist."""
+        return self._values.get(key_path, default)
+    
+    def __getitem__(self, key_path: str) -> Any:
+        return self._values[key_path]
+    
+    def __contains__(self, key_path: str) -> bool:
+        return key_path in self._values
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy of the whole configuration."""
+        return thaw(self._root)
+    
+    def changed_keys(self, other: Optional["ConfigSnapshot"]) -> FrozenSet[str]:
+        """Leaf paths whose value differs between this snapshot and ``other``."""
+        if other is None:
+            return frozenset(self._leaves)
+        keys = self._leaves.keys() | other._leaves.keys()
+        missing = object()
+        return frozenset(
+            key for key in keys if self._leaves.get(key, missing) != other._leaves.get(key, missing)
+        )
+
+
 class ConfigLoader:
     """
     Advanced configuration loader with validation and environment variable support.
+    
+    Reads go through an immutable ConfigSnapshot. ``start_watching`` polls
+    the configuration file and, when it changes, validates it, swaps in a
+    new snapshot and notifies subscribers. An invalid file keeps the
+    previous configuration.
     """
     
     def __init__(self, config_path: Optional[str] = None, env_prefix: str = "FORESTFIRE"):
@@ -169,34 +257,53 @@ class ConfigLoader:
         self.config_path = config_path
         self.env_prefix = env_prefix
         self.config: Optional[MainConfig] = None
+        self.snapshot: Optional[ConfigSnapshot] = None
+        self._subscribers: List[tuple] = []
+        self._subscribers_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._file_stamp = self._stat_config_file()
         self._load_config()
     
+    def _read_config(self) -> MainConfig:
+        """Read, merge and validate file and environment configuration."""
+        # Load from file if specified
+        if self.config_path and os.path.exists(self.config_path):
+            with open(self.config_path, 'r') as f:
+                file_config = yaml.safe_load(f) or {}
+        else:
+            file_config = {}
+        
+        # Load from environment variables
+        env_config = self._load_from_env()
+        
+        # Merge configurations (env overrides file)
+        merged_config = self._merge_configs(file_config, env_config)
+        
+        # Validate configuration
+        return MainConfig(**merged_config)
+    
     def _load_config(self):
         """Load configuration from file and environment variables."""
         try:
-            # Load from file if specified
-            if self.config_path and os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    file_config = yaml.safe_load(f) or {}
-            else:
-                file_config = {}
-            
-            # Load from environment variables
-            env_config = self._load_from_env()
-            
-            # Merge configurations (env overrides file)
-            merged_config = self._merge_configs(file_config, env_config)
-            
-            # Validate configuration
-            self.config = MainConfig(**merged_config)
-            
+            config = self._read_config()
             logger.info(f"Configuration loaded successfully from {self.config_path or 'defaults'}")
             
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
             # Load default configuration
-            self.config = MainConfig()
+            config = MainConfig()
             logger.warning("Using default configuration")
+        
+        self._swap(config)
+    
+    def _swap(self, config: MainConfig):
+        """Install a validated configuration and notify subscribers of what changed."""
+        snapshot = ConfigSnapshot(config.model_dump())
+        previous = self.snapshot
+        # Readers see either the old or the new snapshot, never a mix
+        self.config, self.snapshot = config, snapshot
+        if previous is not None:
+            self._notify(snapshot, snapshot.changed_keys(previous))
     
     def _load_from_env(self) -> Dict[str, Any]:
         """Load configuration from environment variables."""
@@ -281,18 +388,56 @@ class ConfigLoader:
         Returns:
             Configuration value or default
         """
-        if not self.config:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return default
+        return snapshot.get(key_path, default)
+    
+    def _get_typed(self, key_path: str, default: Any, cast: Callable[[Any], Any]) -> Any:
+        value = self.get(key_path)
+        if value is None:
             return default
-        
         try:
-            keys = key_path.split('.')
-            value = self.config
-            for key in keys:
-                value = getattr(value, key)
-            return value
-        except (AttributeError, KeyError):
+            return cast(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Configuration value {key_path}={value!r} is not a valid {cast.__name__}, using {default!r}")
             return default
     
+    def get_int(self, key_path: str, default: Optional[int] = None) -> Optional[int]:
+        """Integer setting (numeric strings are converted)."""
+        return self._get_typed(key_path, default, int)
+    
+    def get_float(self, key_path: str, default: Optional[float] = None) -> Optional[float]:
+        """Float setting (numeric strings are converted)."""
+        return self._get_typed(key_path, default, float)
+    
+    def get_bool(self, key_path: str, default: Optional[bool] = None) -> Optional[bool]:
+        """Boolean setting; accepts true/false, yes/no, on/off and 1/0 strings."""
+        def to_bool(value):
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered in ('true', 'yes', 'on', '1'):
+                    return True
+                if lowered in ('false', 'no', 'off', '0'):
+                    return False
+                raise ValueError(value)
+            return bool(value)
+        to_bool.__name__ = 'bool'
+        return self._get_typed(key_path, default, to_bool)
+    
+    def get_str(self, key_path: str, default: Optional[str] = None) -> Optional[str]:
+        """String setting."""
+        return self._get_typed(key_path, default, str)
+    
+    def get_list(self, key_path: str, default: Optional[list] = None) -> Optional[list]:
+        """List setting (a new list; the snapshot stores tuples)."""
+        def to_list(value):
+            if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+                raise TypeError(value)
+            return thaw(tuple(value))
+        to_list.__name__ = 'list'
+        return self._get_typed(key_path, default, to_list)
+    
     def get_section(self, section: str) -> Optional[Dict[str, Any]]:
         """
         Get entire configuration section.
@@ -301,16 +446,12 @@ class ConfigLoader:
             section: Section name
             
         Returns:
-            Configuration section as dictionary
+            Read-only mapping of the section (the same object until the next reload)
         """
-        if not self.config:
-            return None
-        
-        try:
-            section_obj = getattr(self.config, section)
-            return section_obj.dict() if hasattr(section_obj, 'dict') else section_obj
-        except AttributeError:
+        snapshot = self.snapshot
+        if snapshot is None:
             return None
+        return snapshot.get(section)
     
     def validate(self) -> bool:
         """
@@ -328,9 +469,109 @@ class ConfigLoader:
             logger.error(f"Configuration validation failed: {e}")
             return False
     
-    def reload(self):
-        """Reload configuration from file and environment."""
-        self._load_config()
+    def reload(self) -> bool:
+        """
+        Reload configuration from file and environment.
+        
+        Returns:
+            True if a new configuration was installed; False if it failed to
+            validate (the current configuration is kept)
+        """
+        try:
+            config = self._read_config()
+        except Exception as e:
+            logger.error(f"Configuration reload failed, keeping the current configuration: {e}")
+            return False
+        self._swap(config)
+        logger.info(f"Configuration reloaded from {self.config_path or 'defaults'}")
+        return True
+    
+    def subscribe(self, callback: Callable[[ConfigSnapshot, FrozenSet[str]], None],
+                  prefix: Optional[Union[str, Tuple[str, ...]]] = None) -> Callable[[], None]:
+        """
+        Call ``callback(snapshot, changed_keys)`` after each reload that changes settings.
+        
+        Bound methods are held weakly, so subscribing an object (e.g. a
+        FireDetector) does not keep it alive.
+        
+        Args:
+            callback: Function or bound method
+            prefix: Only notify when a key under this dotted prefix (or one of
+                a tuple of prefixes) changed
+            
+        Returns:
+            Function removing the subscription
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        entry = (ref, (prefix,) if isinstance(prefix, str) else tuple(prefix or ()))
+        with self._subscribers_lock:
+            self._subscribers.append(entry)
+        
+        def unsubscribe():
+            with self._subscribers_lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+    
+    def _notify(self, snapshot: ConfigSnapshot, changed: FrozenSet[str]):
+        if not changed:
+            return
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for entry in subscribers:
+            ref, prefixes = entry
+            callback = ref()
+            if callback is None:
+                with self._subscribers_lock:
+                    if entry in self._subscribers:
+                        self._subscribers.remove(entry)
+                continue
+            if prefixes and not any(key == prefix or key.startswith(prefix + '.')
+                                    for prefix in prefixes for key in changed):
+                continue
+            try:
+                callback(snapshot, changed)
+            except Exception as e:
+                logger.error(f"Configuration subscriber failed: {e}")
+    
+    def _stat_config_file(self) -> Optional[tuple]:
+        if not self.config_path:
+            return None
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def check_for_changes(self) -> bool:
+        """Reload if the configuration file changed since it was last read."""
+        stamp = self._stat_config_file()
+        if stamp == self._file_stamp:
+            return False
+        self._file_stamp = stamp
+        return self.reload()
+    
+    def start_watching(self, interval: float = 2.0):
+        """Poll the configuration file every ``interval`` seconds in a daemon thread."""
+        if self._watch_stop is not None or not self.config_path:
+            return
+        stop = self._watch_stop = threading.Event()
+        
+        def watch():
+            while not stop.wait(interval):
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    logger.error(f"Configuration watch failed: {e}")
+        
+        threading.Thread(target=watch, name="config-watch", daemon=True).start()
+        logger.info(f"Watching {self.config_path} for changes every {interval}s")
+    
+    def stop_watching(self):
+        """Stop the file watch thread."""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
     
     def export(self, format: str = "yaml") -> str:
         """
@@ -0,0 +1,244 @@
+"""
+Execution Engine
+
+Runs work items serially, on a thread or process pool, or with dask,
+according to the ``performance`` configuration section, and splits rasters
+into tiles whose size follows the per-worker memory budget. FireDetector
+maps its per-pixel stages over tiles with it and the API job runner uses it
+to keep CPU-bound work off the event loop.
+"""
+
+import asyncio
+import importlib.util
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+BACKENDS = ("serial", "thread", "process", "dask")
+
+# Optional dask backend (imported on first use)
+DASK_AVAILABLE = importlib.util.find_spec("dask") is not None
+
+# Smallest tile side worth scheduling separately
+MIN_TILE_SIZE = 64
+
+# (row slice, column slice) of a tile, including its halo
+Window = Tuple[slice, slice]
+
+
+def iter_tiles(shape: Tuple[int, int], tile_size: int, halo: int = 0) -> List[Tuple[Window, Window]]:
+    """
+    Split a 2-D raster into square tiles.
+
+    Args:
+        shape: (rows, cols) of the raster
+        tile_size: Side of the tile core in pixels
+        halo: Extra pixels read around each core so neighbourhood operations
+            (morphology, filters) give the same result as on the full raster
+
+    Returns:
+        List of (read_window, core_window_within_read) pairs; writing
+        ``result[core_window_within_read]`` to the core's position in the full
+        raster reassembles it
+    """
+    rows, cols = shape
+    tiles = []
+    for row in range(0, rows, tile_size):
+        for col in range(0, cols, tile_size):
+            row_end, col_end = min(row + tile_size, rows), min(col + tile_size, cols)
+            read_row, read_col = max(row - halo, 0), max(col - halo, 0)
+            read = (slice(read_row, min(row_end + halo, rows)), slice(read_col, min(col_end + halo, cols)))
+            core = (slice(row - read_row, row_end - read_row), slice(col - read_col, col_end - read_col))
+            tiles.append((read, core))
+    return tiles
+
+
+def _is_raster(value: Any, shape: Tuple[int, int]) -> bool:
+    return getattr(value, "shape", None) is not None and tuple(value.shape[:2]) == tuple(shape)
+
+
+def raster_shape(arrays: Mapping[str, Any]) -> Optional[Tuple[int, int]]:
+    """(rows, cols) of the first 2-D array among ``arrays``."""
+    for value in arrays.values():
+        if getattr(value, "ndim", 0) >= 2:
+            return tuple(value.shape[:2])
+    return None
+
+
+def core_window(read: Window, core: Window) -> Window:
+    """Position of a tile core in the full raster."""
+    return (slice(read[0].start + core[0].start, read[0].start + core[0].stop),
+            slice(read[1].start + core[1].start, read[1].start + core[1].stop))
+
+
+class ExecutionEngine:
+    """
+    Uniform map API over serial, thread, process and dask backends.
+
+    Pools are created on first use and reused. Thread pools suit numpy
+    workloads, which release the GIL in most array operations; process
+    pools suit pure-Python work.
+    """
+
+    def __init__(self, backend: str = "thread", max_workers: Optional[int] = None,
+                 chunk_size: int = 1024, chunk_size_mb: float = 512, max_memory_gb: Optional[float] = None):
+        """
+        Args:
+            backend: 'serial', 'thread', 'process' or 'dask'
+            max_workers: Pool size (defaults to the CPU count)
+            chunk_size: Largest tile side in pixels
+            chunk_size_mb: Memory allowed per tile
+            max_memory_gb: Memory budget shared by all workers; caps the per-tile size
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown execution backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+        if backend == "dask" and not DASK_AVAILABLE:
+            logger.warning("dask not installed; using the thread backend")
+            backend = "thread"
+        self.backend = backend
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.chunk_size = max(MIN_TILE_SIZE, int(chunk_size))
+        chunk_bytes = float(chunk_size_mb) * 2 ** 20
+        if max_memory_gb:
+            workers = 1 if backend == "serial" else self.max_workers
+            chunk_bytes = min(chunk_bytes, float(max_memory_gb) * 2 ** 30 / workers)
+        self.chunk_bytes = chunk_bytes
+        self.max_memory_bytes = float(max_memory_gb) * 2 ** 30 if max_memory_gb else None
+        self._executor: Optional[Executor] = None
+
+    @classmethod
+    def from_config(cls, performance: Optional[Mapping[str, Any]]) -> "ExecutionEngine":
+        """
+        Build an engine from the ``performance`` configuration section.
+
+        ``parallel.backend`` selects the backend explicitly; otherwise dask is
+        used when ``memory.use_dask`` is set and dask is installed, threads
+        when ``parallel.enabled`` and serial execution when it is disabled.
+        """
+        performance = performance or {}
+        parallel = performance.get("parallel") or {}
+        memory = performance.get("memory") or {}
+
+        backend = parallel.get("backend")
+        if backend is None:
+            if not parallel.get("enabled", True):
+                backend = "serial"
+            elif memory.get("use_dask") and DASK_AVAILABLE:
+                backend = "dask"
+            else:
+                backend = "thread"
+
+        return cls(
+            backend=backend,
+            max_workers=parallel.get("max_workers"),
+            chunk_size=parallel.get("chunk_size", 1024),
+            chunk_size_mb=memory.get("chunk_size_mb", 512),
+            max_memory_gb=memory.get("max_memory_gb")
+        )
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="engine")
+        return self._executor
+
+    def tile_size(self, bytes_per_pixel: float) -> int:
+        """
+        Tile side so that one tile's working set fits the per-tile budget.
+
+        Args:
+            bytes_per_pixel: Peak bytes a stage allocates per input pixel
+        """
+        side = int(math.sqrt(self.chunk_bytes / max(bytes_per_pixel, 1.0)))
+        return max(MIN_TILE_SIZE, min(side, self.chunk_size))
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Apply ``func`` to every item with the configured backend; results keep input order."""
+        items = list(items)
+        if self.backend == "dask" and len(items) > 1:
+            import dask
+            return list(dask.compute(*[dask.delayed(func)(item) for item in items], num_workers=self.max_workers))
+        return list(self.imap(func, items))
+
+    def imap(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """Like map(), but yields results in input order as they complete."""
+        items = list(items)
+        if self.backend == "serial" or len(items) <= 1:
+            return (func(item) for item in items)
+        if self.backend == "dask":
+            return iter(self.map(func, items))
+        chunksize = max(1, len(items) // (self.max_workers * 4)) if self.backend == "process" else 1
+        return self._pool().map(func, items, chunksize=chunksize)
+
+    def map_tiles(self, func: Callable[[Dict[str, Any]], Any], arrays: Mapping[str, Any],
+                  bytes_per_pixel: float = 8.0, tile_size: Optional[int] = None,
+                  halo: int = 0) -> List[Tuple[Window, Window, Any]]:
+        """
+        Apply ``func`` to every tile of a set of co-registered rasters.
+
+        Args:
+            func: Called with a dict of the same keys holding each tile's
+                slices (including halo); values that are not rasters of the
+                common shape are passed through unchanged. Must be picklable
+                for the process backend.
+            arrays: Rasters sharing one 2-D shape (None values are allowed)
+            bytes_per_pixel: Working set per pixel, used to size tiles
+            tile_size: Explicit tile side (overrides the memory-based size)
+            halo: Pixels of context read around each tile
+
+        Returns:
+            List of (window in the full raster, core window within the
+            tile result, result) in tile order
+        """
+        return list(self.imap_tiles(func, arrays, bytes_per_pixel, tile_size, halo))
+
+    def imap_tiles(self, func: Callable[[Dict[str, Any]], Any], arrays: Mapping[str, Any],
+                   bytes_per_pixel: float = 8.0, tile_size: Optional[int] = None,
+                   halo: int = 0) -> Iterator[Tuple[Window, Window, Any]]:
+        """Like map_tiles(), but yields each tile as it completes so callers can stitch incrementally."""
+        shape = raster_shape(arrays)
+        if shape is None:
+            raise ValueError("map_tiles needs at least one 2-D array")
+        size = tile_size or self.tile_size(bytes_per_pixel)
+        tiles = iter_tiles(shape, size, halo)
+
+        def cut(read: Window) -> Dict[str, Any]:
+            return {
+                name: value[read] if _is_raster(value, shape) else value
+                for name, value in arrays.items()
+            }
+
+        results = self.imap(func, [cut(read) for read, _ in tiles])
+        for (read, core), result in zip(tiles, results):
+            yield core_window(read, core), core, result
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run one call off the event loop (inline for the serial backend)."""
+        if self.backend == "serial":
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), func, *args)
+
+    def shutdown(self, wait: bool = True):
+        """Release pool workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "max_workers": self.max_workers,
+            "chunk_size": self.chunk_size,
+            "chunk_mb": round(self.chunk_bytes / 2 ** 20, 1)
+        }
@@ -0,0 +1,269 @@
+"""
+Gazetteer with Grid-Bucket Spatial Index
+
+This module loads named places (cities, admin regions, national parks, ...)
+from a local CSV or GeoJSON file into a uniform grid of buckets and answers
+vectorized nearest-name queries for whole arrays of coordinates. Each query
+only inspects the 3x3 neighbourhood of its cell, so the per-point cost does
+not grow with the size of the gazetteer.
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+
+# Built-in places used when no gazetteer file is configured
+DEFAULT_PLACES = [
+    {"coords": [-122.4194, 37.7749], "name": "San Francisco Area"},
+    {"coords": [-118.2437, 34.0522], "name": "Los Angeles Area"},
+    {"coords": [-121.4944, 38.5816], "name": "Sacramento Area"},
+    {"coords": [145.0, -37.0], "name": "Victoria Region"},
+    {"coords": [150.0, -33.0], "name": "New South Wales"},
+    {"coords": [-3.5, -58.4], "name": "Amazon Basin"},
+    {"coords": [65.0, 65.0], "name": "Siberian Region"}
+]
+
+# Distances (degrees) for exact and "Near ..." names
+EXACT_DISTANCE = 0.1
+NEAR_DISTANCE = 0.5
+
+# Grid neighbourhood searched around each query cell
+_NEIGHBOURS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+
+
+class Gazetteer:
+    """
+    Named places indexed in uniform grid buckets.
+
+    Nearest-neighbour queries are exact within ``cell_size`` degrees; points
+    with no place that close are reported as having no match.
+    """
+
+    def __init__(self, names: Sequence[str], lon: Sequence[float], lat: Sequence[float],
+                 kinds: Optional[Sequence[str]] = None, cell_size: float = NEAR_DISTANCE):
+        """
+        Build the spatial index.
+
+        Args:
+            names: Place names
+            lon: Place longitudes (degrees)
+            lat: Place latitudes (degrees)
+            kinds: Optional place types (e.g. 'city', 'admin', 'park')
+            cell_size: Bucket size in degrees, also the maximum match distance
+        """
+        self.names = list(names)
+        self.lon = np.asarray(lon, dtype=float)
+        self.lat = np.asarray(lat, dtype=float)
+        self.kinds = list(kinds) if kinds is not None else [""] * len(self.names)
+        if not (len(self.names) == len(self.lon) == len(self.lat) == len(self.kinds)):
+            raise ValueError("Gazetteer columns must have the same length")
+
+        self.cell_size = float(cell_size)
+        self._cols = int(np.ceil(360.0 / self.cell_size)) + 3
+        cells = self._cell_ids(self.lon, self.lat)
+        self._order = np.argsort(cells, kind='stable')
+        self._sorted_cells = cells[self._order]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _cell_coords(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        row = np.floor((lat + 90.0) / self.cell_size).astype(np.int64) + 1
+        col = np.floor((lon + 180.0) / self.cell_size).astype(np.int64) + 1
+        return row, col
+
+    def _cell_ids(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        row, col = self._cell_coords(lon, lat)
+        return row * self._cols + col
+
+    @classmethod
+    def from_places(cls, places: List[Dict], **kwargs) -> "Gazetteer":
+        """Build from a list of {"coords": [lon, lat], "name": ..., "kind": ...} dictionaries."""
+        return cls(
+            [p["name"] for p in places],
+            [p["coords"][0] for p in places],
+            [p["coords"][1] for p in places],
+            [p.get("kind", "") for p in places],
+            **kwargs
+        )
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "Gazetteer":
+        """
+        Load places from a CSV (name, lon, lat[, kind]) or GeoJSON file.
+
+        Args:
+            path: Path to a .csv, .geojson or .json file
+
+        Returns:
+            Gazetteer instance
+        """
+        names, lons, lats, kinds = [], [], [], []
+
+        if path.lower().endswith(('.geojson', '.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                collection = json.load(f)
+            for feature in collection.get("features", []):
+                geometry = feature.get("geometry") or {}
+                if geometry.get("type") != "Point":
+                    continue
+                properties = feature.get("properties") or {}
+                names.append(properties.get("name", ""))
+                lons.append(geometry["coordinates"][0])
+                lats.append(geometry["coordinates"][1])
+                kinds.append(properties.get("kind", ""))
+        else:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    names.append(row["name"])
+                    lons.append(float(row["lon"]))
+                    lats.append(float(row["lat"]))
+                    kinds.append(row.get("kind") or "")
+
+        return cls(names, lons, lats, kinds, **kwargs)
+
+    def nearest(self, lon, lat, chunk_size: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest place within ``cell_size`` degrees of each point.
+
+        Ties are resolved in favour of the place listed first.
+
+        Args:
+            lon: Query longitudes (array-like)
+            lat: Query latitudes (array-like)
+            chunk_size: Queries processed per step to bound temporary memory
+
+        Returns:
+            Tuple of (place index, distance); index is -1 and distance inf
+            where no place is within range
+        """
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        index = np.full(len(lon), -1, dtype=np.int64)
+        distance = np.full(len(lon), np.inf)
+
+        if len(self.names) == 0:
+            return index, distance
+
+        for start in range(0, len(lon), chunk_size):
+            stop = min(start + chunk_size, len(lon))
+            index[start:stop], distance[start:stop] = self._nearest_chunk(lon[start:stop], lat[start:stop])
+
+        return index, distance
+
+    def _nearest_chunk(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        row, col = self._cell_coords(lon, lat)
+        query_ids, place_ids = [], []
+
+        # Gather every (query, place) pair from the 3x3 neighbouring buckets
+        for dr, dc in _NEIGHBOURS:
+            cells = (row + dr) * self._cols + (col + dc)
+            starts = np.searchsorted(self._sorted_cells, cells, side='left')
+            counts = np.searchsorted(self._sorted_cells, cells, side='right') - starts
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            queries = np.repeat(np.arange(len(lon)), counts)
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            query_ids.append(queries)
+            place_ids.append(self._order[np.repeat(starts, counts) + within])
+
+        index = np.full(len(lon), -1, dtype=np.int64)
+        distance = np.full(len(lon), np.inf)
+        if not query_ids:
+            return index, distance
+
+        queries = np.concatenate(query_ids)
+        places = np.concatenate(place_ids)
+        dist = np.sqrt((lon[queries] - self.lon[places]) ** 2 + (lat[queries] - self.lat[places]) ** 2)
+
+        # Closest place per query, first-listed place on ties
+        order = np.lexsort((places, dist, queries))
+        queries, places, dist = queries[order], places[order], dist[order]
+        first = np.ones(len(queries), dtype=bool)
+        first[1:] = queries[1:] != queries[:-1]
+        queries, places, dist = queries[first], places[first], dist[first]
+
+        in_range = dist <= self.cell_size
+        index[queries[in_range]] = places[in_range]
+        distance[queries[in_range]] = dist[in_range]
+        return index, distance
+
+    def names_for(self, lon, lat, exact_distance: float = EXACT_DISTANCE,
+                  near_distance: float = NEAR_DISTANCE) -> List[str]:
+        """
+        Human-readable location names for arrays of coordinates.
+
+        Args:
+            lon: Query longitudes
+            lat: Query latitudes
+            exact_distance: Distance below which the place name is used as is
+            near_distance: Distance below which "Near <place>" is used
+
+        Returns:
+            List of names, "Remote Area (lon, lat)" where nothing is close
+        """
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        index, distance = self.nearest(lon, lat)
+
+        names = []
+        for x, y, i, d in zip(lon.tolist(), lat.tolist(), index.tolist(), distance.tolist()):
+            if d < exact_distance:
+                names.append(self.names[i])
+            elif d < near_distance:
+                names.append(f"Near {self.names[i]}")
+            else:
+                names.append(f"Remote Area ({x:.2f}, {y:.2f})")
+        return names
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer(path: Optional[str] = None) -> Gazetteer:
+    """
+    Get the shared gazetteer, loading it on first use.
+
+    Args:
+        path: Optional CSV/GeoJSON place file; built-in places are used otherwise
+
+    Returns:
+        Shared Gazetteer instance
+    """
+    global _gazetteer
+
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                gazetteer = None
+                if path and os.path.exists(path):
+                    try:
+                        gazetteer = Gazetteer.from_file(path)
+                        logger.info(f"Loaded {len(gazetteer)} places from {path}")
+                    except Exception as e:
+                        logger.warning(f"Could not load gazetteer from {path}, using built-in places: {e}")
+                if gazetteer is None:
+                    gazetteer = Gazetteer.from_places(DEFAULT_PLACES)
+                _gazetteer = gazetteer
+
+    return _gazetteer
+
+
+def is_gazetteer_loaded() -> bool:
+    """Whether the shared gazetteer has been loaded."""
+    return _gazetteer is not None
@@ -0,0 +1,274 @@
+"""
+GeoJSON Geometry Helpers
+
+Lightweight operations on GeoJSON geometries used when serving detections:
+centroids, bounds, Douglas-Peucker simplification with ring validity
+preserved, and precomputed per-zoom geometry levels (topology-preserving
+when shapely is installed).
+"""
+
+import importlib.util
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Optional topology-preserving simplification (shapely is imported on first use)
+SHAPELY_AVAILABLE = importlib.util.find_spec("shapely") is not None
+
+# Metres per degree of latitude (spherical approximation)
+METERS_PER_DEGREE = 111320.0
+
+
+def meters_to_degrees(meters: float, latitude: float = 0.0) -> float:
+    """
+    Convert a distance in metres to degrees.
+
+    The longitude scale at ``latitude`` is used so that the tolerance is
+    not overly coarse away from the equator.
+    """
+    return meters / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+
+
+def _rings(geometry: Dict) -> List[Sequence]:
+    """Rings (or point lists) of a Polygon/MultiPolygon/LineString/Point geometry."""
+    geom_type = geometry.get("type")
+    coords = geometry.get("coordinates") or []
+    if geom_type == "Polygon":
+        return list(coords)
+    if geom_type == "MultiPolygon":
+        return [ring for polygon in coords for ring in polygon]
+    if geom_type in ("LineString", "MultiPoint"):
+        return [coords]
+    if geom_type == "MultiLineString":
+        return list(coords)
+    if geom_type == "Point":
+        return [[coords]]
+    return []
+
+
+def vertex_count(geometry: Optional[Dict]) -> int:
+    """Number of coordinate pairs of a GeoJSON geometry."""
+    return sum(len(ring) for ring in _rings(geometry)) if geometry else 0
+
+
+def geometry_bounds(geometry: Dict) -> Optional[List[float]]:
+    """[min_lon, min_lat, max_lon, max_lat] of a geometry, or None if empty."""
+    points = [np.asarray(ring, dtype=float)[:, :2] for ring in _rings(geometry) if len(ring)]
+    if not points:
+        return None
+    stacked = np.concatenate(points)
+    return [float(stacked[:, 0].min()), float(stacked[:, 1].min()),
+            float(stacked[:, 0].max()), float(stacked[:, 1].max())]
+
+
+def centroid(geometry: Dict) -> Optional[Dict]:
+    """
+    Area-weighted centroid of a (multi)polygon as a GeoJSON Point.
+
+    Other geometry types (and degenerate polygons) use the vertex mean.
+    """
+    geom_type = geometry.get("type")
+    if geom_type == "Point":
+        return {"type": "Point", "coordinates": list(geometry["coordinates"][:2])}
+
+    if geom_type in ("Polygon", "MultiPolygon"):
+        polygons = [geometry["coordinates"]] if geom_type == "Polygon" else geometry["coordinates"]
+        # Work relative to the first vertex to avoid cancellation in the cross products
+        origin = np.asarray(polygons[0][0][0][:2], dtype=float)
+        total_area = cx = cy = 0.0
+        for polygon in polygons:
+            for i, ring in enumerate(polygon):
+                xy = np.asarray(ring, dtype=float)[:, :2] - origin
+                x0, y0 = xy[:-1, 0], xy[:-1, 1]
+                x1, y1 = xy[1:, 0], xy[1:, 1]
+                cross = x0 * y1 - x1 * y0
+                area = cross.sum() / 2.0
+                # Holes subtract from the shell regardless of their winding
+                sign = 1.0 if i == 0 else -1.0
+                weight = sign * abs(area)
+                if area != 0:
+                    cx += weight * ((x0 + x1) * cross).sum() / (6.0 * area)
+                    cy += weight * ((y0 + y1) * cross).sum() / (6.0 * area)
+                total_area += weight
+        if total_area > 0:
+            return {"type": "Point", "coordinates": [
+                float(origin[0] + cx / total_area), float(origin[1] + cy / total_area)
+            ]}
+
+    bounds_points = [np.asarray(ring, dtype=float)[:, :2] for ring in _rings(geometry) if len(ring)]
+    if not bounds_points:
+        return None
+    mean = np.concatenate(bounds_points).mean(axis=0)
+    return {"type": "Point", "coordinates": [float(mean[0]), float(mean[1])]}
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker line simplification.
+
+    Args:
+        points: (N, 2) array of vertices
+        tolerance: Maximum perpendicular deviation, in coordinate units
+
+    Returns:
+        Boolean mask of vertices to keep (end points are always kept)
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = math.hypot(segment[0], segment[1])
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def simplify_ring(ring: Sequence, tolerance: float) -> Optional[List[List[float]]]:
+    """
+    Simplify a closed ring, keeping it a valid ring.
+
+    The ring is split at its vertex farthest from the start so that the
+    closing point is not the only anchor. Returns None when the ring
+    collapses below a triangle.
+    """
+    points = np.asarray(ring, dtype=float)[:, :2]
+    if len(points) <= 4:
+        return points.tolist()
+
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    keep = np.zeros(len(points), dtype=bool)
+    keep[:far + 1] |= douglas_peucker(points[:far + 1], tolerance)
+    keep[far:] |= douglas_peucker(points[far:], tolerance)
+    simplified = points[keep]
+    if len(simplified) < 4:
+        return None
+    return simplified.tolist()
+
+
+def simplify_geometry(geometry: Dict, tolerance: float) -> Optional[Dict]:
+    """
+    Simplify a GeoJSON geometry with Douglas-Peucker.
+
+    Polygon holes that collapse are dropped; a polygon whose shell collapses
+    is dropped entirely. Points are returned unchanged.
+
+    Args:
+        geometry: GeoJSON geometry
+        tolerance: Tolerance in coordinate units (degrees for EPSG:4326)
+
+    Returns:
+        Simplified geometry, or None if nothing is left
+    """
+    geom_type = geometry.get("type")
+    coords = geometry.get("coordinates")
+
+    if geom_type in ("Polygon", "MultiPolygon"):
+        polygons = [coords] if geom_type == "Polygon" else coords
+        simplified = []
+        for polygon in polygons:
+            shell = simplify_ring(polygon[0], tolerance)
+            if shell is None:
+                continue
+            holes = [hole for hole in (simplify_ring(ring, tolerance) for ring in polygon[1:]) if hole]
+            simplified.append([shell] + holes)
+        if not simplified:
+            return None
+        if geom_type == "Polygon":
+            return {"type": "Polygon", "coordinates": simplified[0]}
+        return {"type": "MultiPolygon", "coordinates": simplified}
+
+    if geom_type == "LineString":
+        points = np.asarray(coords, dtype=float)[:, :2]
+        return {"type": "LineString", "coordinates": points[douglas_peucker(points, tolerance)].tolist()}
+
+    return geometry
+
+
+def zoom_tolerance(zoom: int, tile_size: int = 256) -> float:
+    """Half a screen pixel at ``zoom``, in degrees of longitude."""
+    return 360.0 / (tile_size * 2 ** zoom) / 2
+
+
+def simplify_preserving_topology(geometry: Dict, tolerance: float) -> Optional[Dict]:
+    """
+    Simplify without creating self-intersections or crossing rings.
+
+    Uses shapely when it is installed and falls back to the ring-wise
+    Douglas-Peucker of ``simplify_geometry`` otherwise.
+    """
+    if not SHAPELY_AVAILABLE:
+        return simplify_geometry(geometry, tolerance)
+    from shapely.geometry import mapping, shape
+    simplified = shape(geometry).simplify(tolerance, preserve_topology=True)
+    if simplified.is_empty:
+        return None
+    return json.loads(json.dumps(mapping(simplified)))
+
+
+def build_geometry_levels(geometry: Dict, zooms: Sequence[int],
+                          min_area: float = 0.0) -> Dict[str, Optional[Dict]]:
+    """
+    Precompute simplified geometries for several zoom levels.
+
+    Levels are derived successively from the finest to the coarsest, so each
+    simplification works on an already reduced geometry. Polygons spanning
+    less than about one pixel at a level are replaced by their centroid so
+    that small fires stay visible as points.
+
+    Args:
+        geometry: GeoJSON geometry (EPSG:4326)
+        zooms: Web map zoom levels to prepare
+        min_area: Bounding box area (square degrees) below which a polygon
+            is always shown as a point
+
+    Returns:
+        Dictionary mapping str(zoom) to a geometry (None if it vanished)
+    """
+    levels: Dict[str, Optional[Dict]] = {}
+    current: Optional[Dict] = geometry
+    for zoom in sorted(zooms, reverse=True):
+        if current is not None and current.get("type") in ("Polygon", "MultiPolygon"):
+            tolerance = zoom_tolerance(zoom)
+            bounds = geometry_bounds(current)
+            extent = max(bounds[2] - bounds[0], bounds[3] - bounds[1])
+            if extent < 2 * tolerance or (bounds[2] - bounds[0]) * (bounds[3] - bounds[1]) < min_area:
+                current = centroid(current)
+            else:
+                current = simplify_preserving_topology(current, tolerance) or centroid(current)
+        levels[str(zoom)] = current
+    return levels
+
+
+def select_geometry(detection: Dict, zoom: Optional[int]) -> Optional[Dict]:
+    """
+    Geometry of a detection suited to a client zoom level.
+
+    Picks the coarsest precomputed level that is still accurate at ``zoom``
+    (the smallest level zoom >= ``zoom``); falls back to the full geometry.
+    """
+    levels = detection.get("geometry_levels") or {}
+    if zoom is None or not levels:
+        return detection.get("geometry")
+    candidates = sorted(int(z) for z in levels if int(z) >= zoom)
+    if not candidates:
+        return detection.get("geometry")
+    return levels[str(candidates[0])]
@@ -0,0 +1,90 @@
+"""
+Stable Hashing Utilities
+
+Python's built-in ``hash`` for strings is salted per process (PYTHONHASHSEED),
+so it cannot be used for seeds or cache keys that must agree across workers
+and restarts. These helpers use BLAKE2b, which is stable and fast.
+"""
+
+import hashlib
+from typing import Any
+
+
+def _canonical(parts: tuple) -> bytes:
+    """Join the parts into the byte string that is hashed."""
+    return "_".join(str(part) for part in parts).encode("utf-8")
+
+
+def stable_hash(*parts: Any, bits: int = 64) -> int:
+    """
+    Hash the string form of ``parts`` to a non-negative integer.
+
+    Args:
+        *parts: Values joined with '_' before hashing
+        bits: Size of the result in bits (multiple of 8, at most 512)
+
+    Returns:
+        Integer in [0, 2**bits)
+    """
+    digest = hashlib.blake2b(_canonical(parts), digest_size=bits // 8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def stable_seed(*parts: Any) -> int:
+    """
+    Derive a 32-bit seed that is identical in every process.
+
+    Args:
+        *parts: Values identifying the request
+
+    Returns:
+        Integer in [0, 2**32)
+    """
+    return stable_hash(*parts, bits=32)
+
+
+def stable_key(*parts: Any) -> str:
+    """
+    Derive a hex cache key from ``parts``.
+
+    Args:
+        *parts: Values identifying the cached content
+
+    Returns:
+        32-character hexadecimal string
+    """
+    return hashlib.blake2b(_canonical(parts), digest_size=16).hexdigest()
+
+
+# Bytes hashed per update when fingerprinting arrays; bounds the temporary
+# copy made for non-contiguous inputs
+FINGERPRINT_BLOCK_BYTES = 16 * 2 ** 20
+
+
+def fingerprint_array(array: Any) -> str:
+    """
+    Content hash of an array, including its dtype and shape.
+
+    Large arrays are hashed in blocks of rows, so views and memory-mapped
+    rasters are never copied whole.
+
+    Args:
+        array: numpy array (or anything numpy.asarray accepts)
+
+    Returns:
+        32-character hexadecimal string
+    """
+    import numpy as np
+
+    array = np.asarray(array)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.dtype.str}_{array.shape}".encode("utf-8"))
+    if array.ndim == 0 or array.size == 0:
+        digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    row_bytes = max(1, array[0].nbytes)
+    rows_per_block = max(1, FINGERPRINT_BLOCK_BYTES // row_bytes)
+    for start in range(0, array.shape[0], rows_per_block):
+        digest.update(memoryview(np.ascontiguousarray(array[start:start + rows_per_block])).cast("B"))
+    return digest.hexdigest()
@@ -0,0 +1,246 @@
+"""
+Global Land/Water Lookup
+
+This module rasterizes the water-body rules used by the mock data generators
+into a bit-packed global grid (one bit per cell) that is built once, can be
+saved and memory-mapped, and answers point queries in O(1) for whole arrays
+of coordinates.
+"""
+
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Import logger with fallback
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+
+# Water rectangles as (min_lon, max_lon, min_lat, max_lat), bounds inclusive
+WATER_BOXES = [
+    # Specific water bodies
+    (-87.5, -87.0, 41.5, 42.5),    # Lake Michigan
+    (-122.5, -122.0, 37.5, 38.5),  # San Francisco Bay
+    (-74.5, -74.0, 40.5, 41.5),    # New York Bay
+    (-118.5, -118.0, 33.5, 34.5),  # Santa Monica Bay
+    (145.0, 145.5, -38.0, -37.5),  # Port Phillip Bay
+    (151.0, 151.5, -34.0, -33.5),  # Botany Bay
+    # Coastal margins
+    (-75, -70, 35, 45),            # US East Coast
+    (113, 115, -44, -10),          # Australia west coast
+    (153, 155, -44, -10),          # Australia east coast
+    (15, 25, 35, 45),              # Mediterranean (west)
+    (100, 105, 0, 15),             # Southeast Asia
+    (135, 140, 35, 40),            # Japan
+    # Major seas and gulfs
+    (-5, 5, 50, 60),               # North Sea
+    (25, 35, 30, 45),              # Mediterranean (east)
+    (50, 60, 20, 30),              # Persian Gulf
+    (80, 90, 5, 20),               # Bay of Bengal
+]
+
+
+def water_rules(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the analytic water rules for arrays of coordinates.
+
+    This is only used to build the grid; lookups go through LandMask.
+
+    Args:
+        lon: Longitudes in degrees
+        lat: Latitudes in degrees
+
+    Returns:
+        Boolean array, True where the point is treated as water
+    """
+    # Major ocean basins
+    water = (lon < -130) & (lat < 60)                 # Pacific Ocean
+    water |= (-80 <= lon) & (lon < -60) & (lat < 60)  # Atlantic Ocean
+    water |= (lon >= 120) & (lat < 60)                # Western Pacific
+    water |= lat >= 70                                # Arctic Ocean
+
+    for min_lon, max_lon, min_lat, max_lat in WATER_BOXES:
+        water |= (min_lon <= lon) & (lon <= max_lon) & (min_lat <= lat) & (lat <= max_lat)
+
+    water |= (lon < -124) & (32 <= lat) & (lat <= 42)  # California coast
+    water |= (lon < -170) | (lon > 170)                # Small Pacific islands
+    water |= np.abs(lat) > 80                          # Polar regions
+    return water
+
+
+class LandMask:
+    """
+    Bit-packed global land/water grid in geographic coordinates.
+
+    Row 0 starts at 90N and column 0 at 180W. A set bit marks water.
+    """
+
+    def __init__(self, packed: np.ndarray, cells_per_degree: int):
+        """
+        Initialize from a packed grid.
+
+        Args:
+            packed: uint8 array of shape (180 * cpd, ceil(360 * cpd / 8))
+            cells_per_degree: Grid cells per degree of latitude/longitude
+        """
+        self.packed = packed
+        self.cells_per_degree = int(cells_per_degree)
+        self.rows = 180 * self.cells_per_degree
+        self.cols = 360 * self.cells_per_degree
+        if packed.shape != (self.rows, (self.cols + 7) // 8):
+            raise ValueError(f"Packed grid shape {packed.shape} does not match {cells_per_degree} cells/degree")
+
+    @classmethod
+    def build(cls, cells_per_degree: int = 10, rows_per_block: int = 200) -> "LandMask":
+        """
+        Rasterize the water rules at cell centres.
+
+        Args:
+            cells_per_degree: Grid resolution (10 gives 0.1 degree cells, ~810 KB)
+            rows_per_block: Rows evaluated per step to bound temporary memory
+
+        Returns:
+            LandMask instance
+        """
+        rows = 180 * cells_per_degree
+        cols = 360 * cells_per_degree
+        packed = np.empty((rows, (cols + 7) // 8), dtype=np.uint8)
+        lon = -180 + (np.arange(cols) + 0.5) / cells_per_degree
+
+        for start in range(0, rows, rows_per_block):
+            stop = min(start + rows_per_block, rows)
+            lat = 90 - (np.arange(start, stop) + 0.5) / cells_per_degree
+            block = water_rules(lon[None, :], lat[:, None])
+            packed[start:stop] = np.packbits(block, axis=1)
+
+        return cls(packed, cells_per_degree)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LandMask":
+        """
+        Load a grid saved with ``save``.
+
+        Args:
+            path: Path to the .npy file
+            mmap: Memory-map the file instead of reading it
+
+        Returns:
+            LandMask instance
+        """
+        packed = np.load(path, mmap_mode='r' if mmap else None)
+        cells_per_degree = packed.shape[0] // 180
+        return cls(packed, cells_per_degree)
+
+    def save(self, path: str):
+        """Write the packed grid atomically as a .npy file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(self.packed))
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def _cells(self, lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        row = np.floor((90.0 - lat) * self.cells_per_degree).astype(np.int64)
+        col = np.floor((lon + 180.0) * self.cells_per_degree).astype(np.int64)
+        np.clip(row, 0, self.rows - 1, out=row)
+        np.clip(col, 0, self.cols - 1, out=col)
+        return row, col
+
+    def is_water(self, lon, lat) -> np.ndarray:
+        """
+        Vectorized water lookup.
+
+        Args:
+            lon: Longitudes (scalar or array)
+            lat: Latitudes (scalar or array, broadcastable with lon)
+
+        Returns:
+            Boolean array, True where the cell is water
+        """
+        lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+        row, col = self._cells(lon, lat)
+        bits = self.packed[row, col >> 3] >> (7 - (col & 7)).astype(np.uint8)
+        return (bits & 1).astype(bool)
+
+    def is_land(self, lon, lat) -> np.ndarray:
+        """Vectorized land lookup (inverse of ``is_water``)."""
+        return ~self.is_water(lon, lat)
+
+    def is_water_point(self, lon: float, lat: float) -> bool:
+        """Scalar water lookup without array overhead."""
+        row = min(max(int((90.0 - lat) * self.cells_per_degree // 1), 0), self.rows - 1)
+        col = min(max(int((lon + 180.0) * self.cells_per_degree // 1), 0), self.cols - 1)
+        return bool((int(self.packed[row, col >> 3]) >> (7 - (col & 7))) & 1)
+
+    def land_mask_for_transform(self, transform, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        Land mask for a raster in geographic (EPSG:4326) coordinates.
+
+        Args:
+            transform: Affine transform as (a, b, c, d, e, f) or rasterio Affine
+            shape: Raster shape (rows, cols)
+
+        Returns:
+            Boolean array of ``shape``, True over land pixels
+        """
+        a, b, c, d, e, f = tuple(transform)[:6]
+        rows = np.arange(shape[0]) + 0.5
+        cols = np.arange(shape[1]) + 0.5
+        lon = a * cols[None, :] + b * rows[:, None] + c
+        lat = d * cols[None, :] + e * rows[:, None] + f
+        return self.is_land(lon, lat)
+
+
+_land_mask: Optional[LandMask] = None
+_land_mask_lock = threading.Lock()
+
+
+def get_land_mask(path: Optional[str] = None, cells_per_degree: int = 10) -> LandMask:
+    """
+    Get the shared land mask, building it on first use.
+
+    Args:
+        path: Optional .npy file; memory-mapped if present, written after a build
+        cells_per_degree: Grid resolution used when building
+
+    Returns:
+        Shared LandMask instance
+    """
+    global _land_mask
+
+    if _land_mask is None:
+        with _land_mask_lock:
+            if _land_mask is None:
+                mask = None
+                if path and os.path.exists(path):
+                    try:
+                        mask = LandMask.load(path)
+                    except Exception as e:
+                        logger.warning(f"Could not load land mask from {path}, rebuilding: {e}")
+                if mask is None:
+                    mask = LandMask.build(cells_per_degree)
+                    if path:
+                        try:
+                            mask.save(path)
+                        except OSError as e:
+                            logger.warning(f"Could not save land mask to {path}: {e}")
+                _land_mask = mask
+
+    return _land_mask
+
+
+def is_land_mask_loaded() -> bool:
+    """Whether the shared land mask has been built or loaded."""
+    return _land_mask is not None
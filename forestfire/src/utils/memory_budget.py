@@ -0,0 +1,143 @@
+"""
+Memory Budget
+
+Estimates the peak working set of the detector's per-pixel stages from array
+shapes and dtypes, so the scene can be tiled to fit
+``performance.memory.max_memory_gb`` before anything is allocated, and
+measures the actual peak (via tracemalloc, which numpy reports its buffers
+to) for comparison.
+"""
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .metrics import REGISTRY
+
+# Temporaries allocated per pixel by each stage, beyond its inputs, as
+# (float arrays of the input precision, boolean arrays). Calibrated with
+# tracemalloc against the implementations in detection/.
+STAGE_PROFILES: Dict[str, Tuple[int, int]] = {
+    # Thermal hotspots then optical confirmation: six indices plus one
+    # temporary, per-index, hotspot and cleaned masks (the optical part dominates)
+    "masks": (7, 10),
+    # Pre/post NBR and their difference
+    "dnbr": (3, 1),
+}
+
+# Full-scene outputs a tiled stage assembles, as (float arrays, boolean arrays)
+STAGE_OUTPUTS: Dict[str, Tuple[int, int]] = {
+    "masks": (6, 2),
+    "dnbr": (1, 0),
+}
+
+STAGE_PEAK_BYTES = REGISTRY.gauge(
+    "forestfire_detector_stage_peak_bytes",
+    "Estimated and measured peak memory of the last detector run per stage",
+    ("stage", "kind")
+)
+
+_tracking_lock = threading.Lock()
+_tracking_users = 0
+_tracking_started = False
+
+
+def _float_itemsize(arrays: Iterable[Any]) -> int:
+    sizes = [value.dtype.itemsize for value in arrays if np.issubdtype(value.dtype, np.floating)]
+    return max(sizes) if sizes else 8
+
+
+def stage_bytes_per_pixel(stage: str, inputs: Iterable[Optional[np.ndarray]]) -> float:
+    """
+    Peak bytes per pixel while ``stage`` runs on co-registered ``inputs``.
+
+    Indices follow the precision of the input bands, so float32 scenes need
+    half the temporaries of float64 ones.
+    """
+    arrays = [value for value in inputs if value is not None]
+    floats, bools = STAGE_PROFILES[stage]
+    input_bytes = sum(value.dtype.itemsize for value in arrays)
+    return input_bytes + floats * _float_itemsize(arrays) + bools
+
+
+def estimate_peak_bytes(stage: str, shape: Tuple[int, int], inputs: Iterable[Optional[np.ndarray]]) -> int:
+    """Estimated peak bytes of ``stage`` over a raster of ``shape``."""
+    return int(shape[0] * shape[1] * stage_bytes_per_pixel(stage, inputs))
+
+
+def output_bytes(stage: str, shape: Tuple[int, int], inputs: Iterable[Optional[np.ndarray]]) -> int:
+    """Bytes of the full-scene outputs a tiled ``stage`` assembles."""
+    floats, bools = STAGE_OUTPUTS.get(stage, (0, 0))
+    arrays = [value for value in inputs if value is not None]
+    return shape[0] * shape[1] * (floats * _float_itemsize(arrays) + bools)
+
+
+@contextmanager
+def track_peak():
+    """
+    Measure the peak traced allocation inside the block.
+
+    Yields a dict whose ``peak_bytes`` is filled in on exit. Tracing is
+    process-wide, so stages overlapping in other threads are included.
+    """
+    global _tracking_users, _tracking_started
+    with _tracking_lock:
+        if _tracking_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracking_started = True
+        _tracking_users += 1
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    measurement = {"peak_bytes": None}
+    try:
+        yield measurement
+    finally:
+        with _tracking_lock:
+            measurement["peak_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            _tracking_users -= 1
+            # Leave tracing alone if someone else started it
+            if _tracking_users == 0 and _tracking_started:
+                tracemalloc.stop()
+                _tracking_started = False
+
+
+class MemoryReport:
+    """Estimated vs measured peak memory per stage of one detector run."""
+
+    def __init__(self, budget_bytes: Optional[float] = None):
+        self.budget_bytes = budget_bytes
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, stage: str, estimated_bytes: int, actual_bytes: Optional[int] = None,
+               tile_size: Optional[int] = None, tiles: int = 1, retries: int = 0):
+        self.stages[stage] = {
+            "estimated_bytes": int(estimated_bytes),
+            "actual_bytes": actual_bytes,
+            "tile_size": tile_size,
+            "tiles": tiles,
+            "retries": retries
+        }
+        STAGE_PEAK_BYTES.set(estimated_bytes, stage=stage, kind="estimated")
+        if actual_bytes is not None:
+            STAGE_PEAK_BYTES.set(actual_bytes, stage=stage, kind="actual")
+
+    def to_dict(self) -> Dict[str, Any]:
+        def mb(value):
+            return None if value is None else round(value / 2 ** 20, 2)
+
+        return {
+            "budget_mb": mb(self.budget_bytes),
+            "stages": {
+                stage: {
+                    "estimated_mb": mb(entry["estimated_bytes"]),
+                    "actual_mb": mb(entry["actual_bytes"]),
+                    "tile_size": entry["tile_size"],
+                    "tiles": entry["tiles"],
+                    "retries": entry["retries"]
+                }
+                for stage, entry in self.stages.items()
+            }
+        }
@@ -0,0 +1,113 @@
+"""
+Test module for the chunked array store and the detector's raster outputs.
+"""
+
+import unittest
+import json
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage.array_store import ArrayStore, ChunkedArray
+from detection.fire_detector import FireDetector
+
+
+class TestArrayStore(unittest.TestCase):
+    """Test cases for chunked writes, windowed reads and the on-disk layout."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data = np.random.default_rng(0).random((100, 70)).astype(np.float32)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tiled_writes_round_trip(self):
+        """Test writes that straddle chunk boundaries."""
+        array = ChunkedArray.create(os.path.join(self.tmpdir.name, "a"), self.data.shape, np.float32, chunks=(32, 32))
+        for top in range(0, 100, 45):
+            for left in range(0, 70, 25):
+                window = (slice(top, min(top + 45, 100)), slice(left, min(left + 25, 70)))
+                array.write(window, self.data[window])
+        np.testing.assert_array_equal(array.read(), self.data)
+        np.testing.assert_array_equal(array[10:50, 33:69], self.data[10:50, 33:69])
+        self.assertLess(array.nbytes_stored(), self.data.nbytes * 1.1)
+
+    def test_window_reads_touch_needed_chunks(self):
+        """Test that a window read opens only the chunks it overlaps."""
+        array = ChunkedArray.create(os.path.join(self.tmpdir.name, "a"), self.data.shape, np.float32, chunks=(32, 32))
+        array.write(None, self.data)
+        read = []
+        original = array.read_chunk
+        array.read_chunk = lambda row, col: read.append((row, col)) or original(row, col)
+        array.read((slice(40, 60), slice(0, 20)))
+        self.assertEqual(read, [(1, 0)])
+
+    def test_zarr_layout(self):
+        """Test the Zarr v2 metadata and multiscales attribute."""
+        store = ArrayStore(os.path.join(self.tmpdir.name, "run"), shape=self.data.shape, chunk_size=32)
+        store.write("nbr", None, self.data)
+        store.write("mask", (slice(0, 10), slice(0, 10)), np.ones((10, 10), dtype=bool))
+        self.assertEqual(store.names(), ["mask", "nbr"])
+
+        with open(os.path.join(store.root, "nbr", "0", ".zarray")) as f:
+            meta = json.load(f)
+        self.assertEqual(meta["dtype"], "<f4")
+        self.assertEqual(meta["chunks"], [32, 32])
+        self.assertEqual(meta["compressor"]["id"], "zlib")
+        self.assertFalse(store.read("mask")[50, 50])
+
+        self.assertEqual(store.finish(), {"mask": 3, "nbr": 3})
+        self.assertEqual(store.levels("nbr"), 3)
+        self.assertEqual(store.array("nbr", level=2).shape, (25, 18))
+
+        # Rasters created directly get overviews on request
+        store.create_array("dnbr", self.data.shape, np.float32).write(None, self.data)
+        self.assertEqual(store.build_overviews("dnbr"), 3)
+        np.testing.assert_array_equal(store.read("dnbr", level=2), store.read("nbr", level=2))
+
+
+class TestDetectorOutputs(unittest.TestCase):
+    """Test that detection runs persist their rasters."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_rasters_written_per_tile(self):
+        """Test that tiled outputs in the store equal the in-memory ones."""
+        detector = FireDetector({"performance": {
+            "parallel": {"backend": "thread", "max_workers": 2, "chunk_size": 64},
+            "output_store": {"enabled": True, "path": self.tmpdir.name, "chunk_size": 50}
+        }})
+        rng = np.random.default_rng(2)
+        shape = (150, 130)
+        optical = {name: rng.uniform(0.05, 0.6, shape) for name in ("red", "nir", "swir1", "swir2", "blue")}
+        pre = {name: band + 0.1 for name, band in optical.items()}
+        thermal = {"brightness_temp": rng.normal(300, 30, shape)}
+
+        store = detector.open_output_store(shape, {"run_id": "scene-1"})
+        hotspots, results = detector.detect_masks(thermal, optical, store=store)
+        dnbr = detector.compute_dnbr(pre, optical, store=store)
+
+        self.assertEqual(store.root, os.path.join(os.path.abspath(self.tmpdir.name), "scene-1"))
+        np.testing.assert_array_equal(store.read("nbr"), results["indices"]["nbr"])
+        np.testing.assert_array_equal(store.read("hotspot_mask"), hotspots)
+        np.testing.assert_array_equal(store.read("optical_mask"), results["combined_mask"])
+        np.testing.assert_array_equal(store.read("dnbr", (slice(20, 90), slice(5, 60))), dnbr[20:90, 5:60])
+        np.testing.assert_array_equal(store.read("severity"),
+                                      detector.spectral_indices.classify_burn_severity(dnbr))
+
+        described = detector.finalize_output_store(store, results["combined_mask"])
+        self.assertEqual(described["levels"]["detection_mask"], 3)
+        self.assertIn("severity", described["levels"])
+
+
+if __name__ == '__main__':
+    unittest.main()
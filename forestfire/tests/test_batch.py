@@ -0,0 +1,99 @@
+"""
+Test module for batch detection planning.
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.batch import plan_batch, batch_status
+
+
+def aoi(bounds, start_date="2024-07-01", satellite="sentinel2"):
+    return {"bounds": bounds, "start_date": start_date, "end_date": "2024-07-10",
+            "satellite": satellite, "max_cloud_cover": 40, "include_historical": True}
+
+
+class TestBatchPlanning(unittest.TestCase):
+    """Test cases for plan_batch and batch_status."""
+
+    def test_duplicates_share_results(self):
+        """Test that identical AOIs map to the first occurrence."""
+        plan = plan_batch([
+            aoi([-121, 37, -119, 39]),
+            aoi([-121.000001, 37, -119, 39]),
+            aoi([-121, 37, -119, 39], satellite="landsat"),
+        ])
+        self.assertEqual(plan["canonical"], [0, 0, 2])
+
+    def test_overlapping_aois_are_grouped(self):
+        """Test transitive grouping of overlapping AOIs with the same scenes."""
+        plan = plan_batch([
+            aoi([0, 0, 2, 2]),
+            aoi([1, 1, 3, 3]),
+            aoi([2.5, 2.5, 4, 4]),
+            aoi([10, 10, 11, 11]),
+            aoi([0, 0, 2, 2], start_date="2024-08-01"),
+        ])
+        self.assertEqual(plan["groups"], [[0, 1, 2], [3], [4]])
+        self.assertEqual(plan["group_bounds"][0], [0.0, 0.0, 4.0, 4.0])
+
+    def test_batch_status(self):
+        """Test overall status derived from item statuses."""
+        self.assertEqual(batch_status(["queued", "queued"]), "queued")
+        self.assertEqual(batch_status(["completed", "queued"]), "processing")
+        self.assertEqual(batch_status(["completed", "completed"]), "completed")
+        self.assertEqual(batch_status(["completed", "failed"]), "partial")
+        self.assertEqual(batch_status(["failed"]), "failed")
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    """Test admission of batches through the detection scheduler."""
+
+    def test_batch_larger_than_client_limit(self):
+        """Test that a batch with more AOIs than the per-client job limit is admitted and completes."""
+        from starlette.requests import Request
+        from api import simple_main
+        from api.scheduler import JobScheduler
+
+        # Five disjoint AOIs, so five scene groups
+        batch = simple_main.BatchDetectionRequest(requests=[
+            aoi([lon, 37.0, lon + 0.1, 37.1]) for lon in (-122.0, -120.0, -118.0, -116.0, -114.0)
+        ])
+        http_request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        async def analyze(request_id, request, seed):
+            simple_main.detection_tasks[request_id]["status"] = "completed"
+
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=2, max_queue_size=10, per_client_limit=2)
+            with mock.patch.object(simple_main, "scheduler", scheduler), \
+                    mock.patch.object(simple_main, "analyze_detection_task", analyze):
+                response = await simple_main.detect_fires_batch(batch, http_request)
+                self.assertEqual(scheduler.stats()["active_clients"], 1)
+                await scheduler._queue.join()
+                await scheduler.stop()
+            return response
+
+        with mock.patch.object(simple_main, "detection_tasks", {}), \
+                mock.patch.object(simple_main, "detection_batches", {}):
+            response = asyncio.run(scenario())
+            self.assertEqual(response["unique_items"], 5)
+            self.assertEqual(
+                [simple_main.detection_tasks[request_id]["status"] for request_id in response["request_ids"]],
+                ["completed"] * 5
+            )
+
+        with mock.patch.object(simple_main, "MAX_BATCH_UNIQUE_ITEMS", 4):
+            with self.assertRaises(simple_main.HTTPException) as raised:
+                asyncio.run(simple_main.detect_fires_batch(batch, http_request))
+        self.assertEqual(raised.exception.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
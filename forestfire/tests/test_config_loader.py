@@ -0,0 +1,138 @@
+"""
+Test module for configuration snapshots and hot reload.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.config_loader import ConfigLoader, ConfigSnapshot
+from detection.fire_detector import FireDetector
+
+
+CONFIG_TEMPLATE = """
+detection:
+  optical:
+    nbr_threshold: {nbr}
+  spatial:
+    geometry_zoom_levels: [4, 8]
+api:
+  port: 8100
+"""
+
+
+class TestConfigLoader(unittest.TestCase):
+    """Test cases for snapshot lookups, typed accessors and reload notifications."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "config.yaml")
+        self.write(0.1)
+        self.loader = ConfigLoader(self.path)
+
+    def tearDown(self):
+        self.loader.stop_watching()
+        self.tmpdir.cleanup()
+
+    def write(self, nbr, extra=""):
+        with open(self.path, "w") as f:
+            f.write(CONFIG_TEMPLATE.format(nbr=nbr) + extra)
+        # Make sure the modification is visible even on coarse mtime filesystems
+        stamp = time.time_ns() + int(nbr * 1e9)
+        os.utime(self.path, ns=(stamp, stamp))
+
+    def test_snapshot_lookups(self):
+        """Test dotted paths, sections and immutability."""
+        self.assertEqual(self.loader.get("detection.optical.nbr_threshold"), 0.1)
+        self.assertEqual(self.loader.get("api.port"), 8100)
+        self.assertEqual(self.loader.get("missing.key", "fallback"), "fallback")
+
+        section = self.loader.get_section("detection")
+        self.assertIs(section, self.loader.get_section("detection"))
+        self.assertEqual(section.get("optical", {}).get("nbr_threshold"), 0.1)
+        with self.assertRaises(TypeError):
+            section["optical"] = {}
+
+    def test_typed_accessors(self):
+        """Test conversion and fallbacks of typed getters."""
+        self.assertEqual(self.loader.get_int("api.port"), 8100)
+        self.assertEqual(self.loader.get_float("api.port"), 8100.0)
+        self.assertEqual(self.loader.get_list("detection.spatial.geometry_zoom_levels"), [4, 8])
+        self.assertEqual(self.loader.get_bool("system.debug", True), False)
+        self.assertEqual(self.loader.get_int("api.host", 7), 7)
+        self.assertEqual(self.loader.get_str("missing", "x"), "x")
+
+    def test_changed_keys(self):
+        """Test that snapshot diffs report changed leaves only."""
+        old = ConfigSnapshot({"a": {"b": 1, "c": [1, 2]}})
+        new = ConfigSnapshot({"a": {"b": 2, "c": [1, 2]}, "d": 0})
+        self.assertEqual(new.changed_keys(old), {"a.b", "d"})
+
+    def test_reload_notifies_detector(self):
+        """Test that a detector follows threshold changes on disk."""
+        detector = FireDetector.from_loader(self.loader)
+        self.assertEqual(detector.nbr_threshold, 0.1)
+
+        notified = []
+        self.loader.subscribe(lambda snapshot, changed: notified.append(changed), prefix="api")
+
+        self.write(0.25)
+        self.assertTrue(self.loader.check_for_changes())
+        self.assertEqual(detector.nbr_threshold, 0.25)
+        self.assertEqual(self.loader.get("detection.optical.nbr_threshold"), 0.25)
+        self.assertEqual(notified, [])  # no api.* key changed
+        self.assertFalse(self.loader.check_for_changes())
+
+    def test_performance_changes_reach_detector(self):
+        """Test that a detector follows performance.* edits without any detection.* change."""
+        detector = FireDetector.from_loader(self.loader)
+        self.assertTrue(detector.memoize_runs)
+        self.write(0.1, extra="performance:\n  caching:\n    memoize_runs: false\n")
+        self.assertTrue(self.loader.check_for_changes())
+        self.assertFalse(detector.memoize_runs)
+
+    def test_engine_kept_unless_its_settings_change(self):
+        """Test that threshold edits do not respawn the worker pool."""
+        detector = FireDetector.from_loader(self.loader)
+        engine = detector.engine
+        self.write(0.2)
+        self.assertTrue(self.loader.check_for_changes())
+        self.assertIs(detector.engine, engine)
+
+        self.write(0.2, extra="performance:\n  parallel:\n    backend: serial\n")
+        self.assertTrue(self.loader.check_for_changes())
+        self.assertIsNot(detector.engine, engine)
+        self.assertEqual(detector.engine.backend, "serial")
+
+    def test_run_keeps_its_parameters(self):
+        """Test that a reload during a run does not change the thresholds of that run."""
+        detector = FireDetector.from_loader(self.loader)
+        pinned = detector._pinned()
+        self.assertIs(pinned._pinned(), pinned)
+        self.write(0.3)
+        self.assertTrue(self.loader.check_for_changes())
+        self.assertEqual(detector.nbr_threshold, 0.3)
+        self.assertEqual(pinned.nbr_threshold, 0.1)
+
+    def test_invalid_file_keeps_snapshot(self):
+        """Test that a file failing validation does not replace the configuration."""
+        snapshot = self.loader.snapshot
+        self.write(0.3, extra="  port: 99999999\n")
+        self.assertFalse(self.loader.check_for_changes())
+        self.assertIs(self.loader.snapshot, snapshot)
+
+    def test_subscriber_held_weakly(self):
+        """Test that subscribing a detector does not keep it alive."""
+        FireDetector.from_loader(self.loader)
+        self.write(0.4)
+        self.loader.check_for_changes()
+        self.assertEqual(self.loader._subscribers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Test module for the R*Tree detection history store.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage.detection_store import DetectionStore, decode_cursor, get_detection_store
+
+
+def make_detection(i, lon, lat, day, confidence=0.8):
+    """Square detection polygon around (lon, lat)."""
+    return {
+        "id": f"fire_{i}",
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[
+                [lon - 0.01, lat - 0.01], [lon + 0.01, lat - 0.01],
+                [lon + 0.01, lat + 0.01], [lon - 0.01, lat + 0.01],
+                [lon - 0.01, lat - 0.01]
+            ]]
+        },
+        "confidence": confidence,
+        "area_ha": 10.0 + i,
+        "timestamp": f"2024-07-{day:02d}T12:00:00",
+        "location": "Test Area",
+        "severity": "high"
+    }
+
+
+class TestDetectionStore(unittest.TestCase):
+    """Test cases for DetectionStore."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = DetectionStore(os.path.join(self.temp_dir, "detections.sqlite"))
+        self.store.ingest([
+            make_detection(0, -120.0, 38.0, 1, 0.9),
+            make_detection(1, -120.5, 38.5, 5, 0.6),
+            make_detection(2, -119.5, 37.5, 10, 0.95),
+            make_detection(3, 145.0, -37.0, 10, 0.9),
+        ], request_id="req_1")
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def ids(self, page):
+        return [d["id"] for d in page["detections"]]
+
+    def test_bbox_query_newest_first(self):
+        """Test bounding box filtering and ordering."""
+        page = self.store.query([-121.0, 37.0, -119.0, 39.0])
+        self.assertEqual(self.ids(page), ["fire_2", "fire_1", "fire_0"])
+        self.assertIsNone(page["next_cursor"])
+        self.assertEqual(page["detections"][0]["request_id"], "req_1")
+        self.assertEqual(page["detections"][0]["severity"], "high")
+        self.assertEqual(page["detections"][0]["geometry"]["type"], "Polygon")
+
+    def test_time_and_confidence_filters(self):
+        """Test date range and minimum confidence filters."""
+        page = self.store.query([-121.0, 37.0, -119.0, 39.0], start="2024-07-02", end="2024-07-09")
+        self.assertEqual(self.ids(page), ["fire_1"])
+        page = self.store.query([-180.0, -90.0, 180.0, 90.0], min_confidence=0.9)
+        self.assertEqual(sorted(self.ids(page)), ["fire_0", "fire_2", "fire_3"])
+
+    def test_pagination(self):
+        """Test that cursors walk every match exactly once."""
+        seen = []
+        cursor = None
+        while True:
+            page = self.store.query([-180.0, -90.0, 180.0, 90.0], limit=1, cursor=cursor)
+            seen.extend(self.ids(page))
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_reingest_updates_in_place(self):
+        """Test that re-ingesting a detection id replaces the row and index entry."""
+        version = self.store.version
+        self.store.ingest([make_detection(0, 10.0, 48.0, 2, 0.7)], request_id="req_2")
+        self.assertEqual(self.store.count(), 4)
+        self.assertGreater(self.store.version, version)
+        self.assertNotIn("fire_0", self.ids(self.store.query([-121.0, 37.0, -119.0, 39.0])))
+        page = self.store.query([9.0, 47.0, 11.0, 49.0])
+        self.assertEqual(self.ids(page), ["fire_0"])
+        self.assertEqual(page["detections"][0]["request_id"], "req_2")
+
+    def test_shared_store_reopens_after_close(self):
+        """Test that closing the shared store (e.g. on shutdown) does not leave a dead connection."""
+        path = os.path.join(self.temp_dir, "shared.sqlite")
+        get_detection_store(path).close()
+        store = get_detection_store(path)
+        try:
+            self.assertEqual(store.count(), 0)
+        finally:
+            store.close()
+
+
+class TestDetectionEndpoints(unittest.TestCase):
+    """Test the date filters of the detection search and tile endpoints."""
+
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        from api import simple_main
+        self.main = simple_main
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = DetectionStore(os.path.join(self.temp_dir, "detections.sqlite"))
+        afternoon = make_detection(0, -120.0, 38.0, 10)
+        afternoon["timestamp"] = "2024-07-10T15:00:00"
+        self.store.ingest([afternoon, make_detection(1, -120.0, 38.0, 11)], request_id="req_1")
+        self.patch = mock.patch.object(simple_main, "get_detection_store", lambda path=None: self.store)
+        self.patch.start()
+        self.client = TestClient(simple_main.app)
+
+    def tearDown(self):
+        self.patch.stop()
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_end_date_includes_the_whole_day(self):
+        """Test that a detection at 15:00 is found with end_date set to that day."""
+        response = self.client.get("/api/v1/detections", params={
+            "bounds": [-121.0, 37.0, -119.0, 39.0], "start_date": "2024-07-10", "end_date": "2024-07-10"
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([f["properties"]["id"] for f in response.json()["features"]], ["fire_0"])
+
+        tile = self.main.build_map_tile(6, 10, 24, ["detections"], "2024-07-10", "2024-07-10", 0.0, "viirs")
+        self.assertIn(b"fire_0", tile)
+        self.assertNotIn(b"fire_1", tile)
+
+        bad = self.client.get("/api/v1/detections", params={"bounds": [0, 0, 1, 1], "end_date": "tomorrow"})
+        self.assertEqual(bad.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Test module for the raster disk cache.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage.disk_cache import DiskCache, cache_key
+from utils.hashing import fingerprint_array
+from detection.fire_detector import FireDetector
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test cases for content addressing, eviction and detector integration."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fingerprint(self):
+        """Test that fingerprints follow content, dtype and shape but not memory layout."""
+        data = np.arange(12.0).reshape(3, 4)
+        self.assertEqual(fingerprint_array(data), fingerprint_array(np.asfortranarray(data)))
+        self.assertEqual(fingerprint_array(data[:, 1]), fingerprint_array(data[:, 1].copy()))
+        self.assertNotEqual(fingerprint_array(data), fingerprint_array(data.astype(np.float32)))
+        self.assertNotEqual(fingerprint_array(data), fingerprint_array(data.reshape(4, 3)))
+        self.assertEqual(cache_key("x", {"b": 1, "a": data}), cache_key("x", {"a": data.copy(), "b": 1}))
+
+    def test_round_trip_and_stats(self):
+        """Test storage, hits and misses."""
+        key = cache_key("indices", np.ones((4, 4)))
+        self.assertIsNone(self.cache.get(key))
+        arrays = {"nbr": np.linspace(-1, 1, 16).reshape(4, 4), "mask": np.eye(4, dtype=bool)}
+        self.assertTrue(self.cache.put(key, arrays))
+        loaded = self.cache.get(key)
+        np.testing.assert_array_equal(loaded["nbr"], arrays["nbr"])
+        self.assertEqual(loaded["mask"].dtype, bool)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["writes"]), (1, 1, 1))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry goes first."""
+        for name in ("a", "b", "c"):
+            self.cache.put(name + "-0", {"data": np.random.default_rng(0).random(2000)})
+            time.sleep(0.01)
+        size = os.path.getsize(self.cache._path("a-0"))
+        self.cache.get("a-0")  # a becomes most recently used
+
+        self.cache.max_size_bytes = 2.5 * size
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.get("a-0"))
+        self.assertIsNone(self.cache.get("b-0"))
+        self.assertIsNotNone(self.cache.get("c-0"))
+
+    def test_ttl_and_corrupt_entries(self):
+        """Test that expired and unreadable entries are misses."""
+        self.cache.put("old-0", {"data": np.zeros(3)})
+        old = time.time() - 7200
+        os.utime(self.cache._path("old-0"), (old, old))
+        self.cache.ttl_seconds = 3600
+        self.assertIsNone(self.cache.get("old-0"))
+        self.assertFalse(os.path.exists(self.cache._path("old-0")))
+
+        path = self.cache._path("bad-0")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        self.assertIsNone(self.cache.get("bad-0"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_detector_reuses_masks(self):
+        """Test that a second run over the same bands is served from the cache."""
+        detector = FireDetector({"performance": {
+            "parallel": {"backend": "serial"},
+            "caching": {"enabled": True, "cache_dir": self.tmpdir.name}
+        }})
+        rng = np.random.default_rng(1)
+        optical = {name: rng.uniform(0.05, 0.6, (80, 80)) for name in ("red", "nir", "swir2")}
+        thermal = {"brightness_temp": rng.normal(300, 30, (80, 80))}
+
+        first_hotspots, first = detector.detect_masks(thermal, optical)
+        before = detector.cache.stats()
+        second_hotspots, second = detector.detect_masks(thermal, optical)
+        after = detector.cache.stats()
+        self.assertEqual(after["hits"], before["hits"] + 1)
+        np.testing.assert_array_equal(first_hotspots, second_hotspots)
+        np.testing.assert_array_equal(first["indices"]["nbr"], second["indices"]["nbr"])
+
+        detector.nbr_threshold = 0.3  # different parameters, different entry
+        detector.detect_masks(thermal, optical)
+        self.assertEqual(detector.cache.stats()["misses"], after["misses"] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
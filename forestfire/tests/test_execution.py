@@ -0,0 +1,126 @@
+"""
+Test module for the execution engine and tiled detection.
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.execution import ExecutionEngine, MIN_TILE_SIZE, iter_tiles
+from detection.fire_detector import FireDetector
+
+
+def square(value):
+    return value * value
+
+
+def tile_sum(tile):
+    return float(tile["data"].sum()) + tile["offset"]
+
+
+class TestExecutionEngine(unittest.TestCase):
+    """Test cases for tiling, backend selection and ordered mapping."""
+
+    def test_tiles_cover_raster(self):
+        """Test that tile cores cover every pixel exactly once and halos stay in bounds."""
+        shape = (130, 70)
+        coverage = np.zeros(shape, dtype=int)
+        for read, core in iter_tiles(shape, 32, halo=5):
+            block = np.zeros(shape, dtype=int)[read]
+            self.assertLessEqual(read[0].stop, shape[0])
+            self.assertLessEqual(read[1].stop, shape[1])
+            window = (slice(read[0].start + core[0].start, read[0].start + core[0].stop),
+                      slice(read[1].start + core[1].start, read[1].start + core[1].stop))
+            coverage[window] += 1
+            self.assertEqual(block[core].shape, coverage[window].shape)
+        self.assertTrue((coverage == 1).all())
+
+    def test_map_keeps_order(self):
+        """Test that every backend returns results in input order."""
+        for backend in ("serial", "thread", "process"):
+            engine = ExecutionEngine(backend=backend, max_workers=2)
+            try:
+                self.assertEqual(engine.map(square, range(10)), [i * i for i in range(10)])
+            finally:
+                engine.shutdown()
+
+    def test_map_tiles(self):
+        """Test that non-raster values pass through and tiles add up to the raster."""
+        engine = ExecutionEngine(backend="thread", max_workers=2)
+        data = np.arange(200 * 150, dtype=float).reshape(200, 150)
+        results = engine.map_tiles(tile_sum, {"data": data, "offset": 1.0}, tile_size=64)
+        engine.shutdown()
+        self.assertEqual(len(results), 4 * 3)
+        self.assertAlmostEqual(sum(result for _, _, result in results), data.sum() + len(results))
+
+    def test_tile_size_follows_budget(self):
+        """Test that the shared memory budget caps tile sizes."""
+        engine = ExecutionEngine(backend="thread", max_workers=4, chunk_size=4096,
+                                 chunk_size_mb=512, max_memory_gb=1)
+        self.assertEqual(engine.chunk_bytes, 2 ** 30 / 4)
+        self.assertEqual(engine.tile_size(64), 2048)
+        self.assertEqual(engine.tile_size(1e12), MIN_TILE_SIZE)
+        self.assertEqual(ExecutionEngine(chunk_size=256).tile_size(1), 256)
+
+    def test_from_config(self):
+        """Test backend selection from the performance section."""
+        self.assertEqual(ExecutionEngine.from_config({}).backend, "thread")
+        self.assertEqual(ExecutionEngine.from_config({"parallel": {"enabled": False}}).backend, "serial")
+        engine = ExecutionEngine.from_config({"parallel": {"backend": "process", "max_workers": 3}})
+        self.assertEqual((engine.backend, engine.max_workers), ("process", 3))
+        # dask falls back to threads when it is not installed
+        self.assertIn(ExecutionEngine.from_config({"memory": {"use_dask": True}}).backend, ("dask", "thread"))
+        with self.assertRaises(ValueError):
+            ExecutionEngine(backend="gpu")
+
+    def test_run_off_loop(self):
+        """Test that run() executes on the pool and returns the result."""
+        engine = ExecutionEngine(backend="thread", max_workers=1)
+        self.assertEqual(asyncio.run(engine.run(square, 7)), 49)
+        engine.shutdown()
+
+
+class TestTiledDetection(unittest.TestCase):
+    """Test that tiled mask computation matches whole-scene processing."""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        shape = (150, 170)
+        self.optical = {name: rng.uniform(0.05, 0.6, shape) for name in ("red", "nir", "swir1", "swir2", "blue")}
+        # A burnt patch crossing tile boundaries
+        self.optical["nir"][40:110, 50:140] = 0.05
+        self.optical["swir2"][40:110, 50:140] = 0.5
+        brightness = rng.normal(300, 5, shape)
+        brightness[60:100, 70:130] = 340
+        self.thermal = {"brightness_temp": brightness}
+        self.cloud_mask = np.zeros(shape, dtype=bool)
+        self.cloud_mask[:10, :] = True
+
+    def detector(self, backend):
+        return FireDetector({"performance": {"parallel": {"backend": backend, "max_workers": 2, "chunk_size": 64}}})
+
+    def test_tiled_masks_match_direct(self):
+        """Test every backend against the untiled result."""
+        direct = FireDetector({"performance": {"parallel": {"chunk_size": 4096}}})
+        expected_hotspots, expected = direct.detect_masks(self.thermal, self.optical, self.cloud_mask)
+        self.assertTrue(expected_hotspots.any())
+        self.assertTrue(expected["combined_mask"].any())
+
+        for backend in ("serial", "thread", "process"):
+            detector = self.detector(backend)
+            try:
+                hotspots, optical = detector.detect_masks(self.thermal, self.optical, self.cloud_mask)
+            finally:
+                detector.engine.shutdown()
+            np.testing.assert_array_equal(hotspots, expected_hotspots)
+            np.testing.assert_array_equal(optical["combined_mask"], expected["combined_mask"])
+            np.testing.assert_allclose(optical["indices"]["nbr"], expected["indices"]["nbr"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Test module for FIRMS CSV ingestion and the hotspot store.
+"""
+
+import unittest
+import sys
+import os
+import io
+import tempfile
+import asyncio
+import threading
+import time
+from unittest import mock
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage.firms import parse_confidence, read_firms_csv
+from storage.hotspot_store import HotspotStore, cell_ranges, get_hotspot_store, grid_cell
+from api import simple_main
+
+VIIRS_CSV = """latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight
+37.61,-122.21,333.5,0.39,0.36,2024-07-01,912,N,VIIRS,n,2.0NRT,290.1,5.2,N
+37.62,-122.22,367.0,0.39,0.36,2024-07-01,2145,N20,VIIRS,h,2.0NRT,295.4,21.7,D
+,-122.23,330.1,0.39,0.36,2024-07-01,912,N,VIIRS,l,2.0NRT,289.0,1.1,N
+38.40,-121.90,320.2,0.39,0.36,2024-07-03,30,N,VIIRS,l,2.0NRT,288.7,0.9,N
+37.70,-122.10,340.0,0.39,0.36,not-a-date,100,N,VIIRS,n,2.0NRT,290.0,3.3,N
+"""
+
+MODIS_CSV = """latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_t31,frp,daynight
+37.65,-122.25,321.4,1.0,1.0,2024-07-02,1830,Terra,MODIS,76,6.1NRT,296.2,18.4,D
+-33.90,151.10,318.0,1.1,1.0,2024-07-02,0,Aqua,MODIS,40,6.1NRT,290.5,9.0,N
+"""
+
+
+class TestFirmsParsing(unittest.TestCase):
+    """Test cases for parsing FIRMS CSV files into columns."""
+
+    def test_viirs(self):
+        """Test types, confidence classes, acquisition times and dropped rows."""
+        chunks = list(read_firms_csv(io.StringIO(VIIRS_CSV)))
+        self.assertEqual(len(chunks), 1)
+        columns = chunks[0]
+        np.testing.assert_allclose(columns["lat"], [37.61, 37.62, 38.40])
+        self.assertEqual(columns["lat"].dtype, np.float64)
+        self.assertEqual(columns["brightness"].dtype, np.float32)
+        np.testing.assert_allclose(columns["confidence"], [0.6, 0.9, 0.3])
+        np.testing.assert_allclose(columns["frp"], [5.2, 21.7, 0.9], rtol=1e-6)
+        # 2024-07-01 is day 19905 since the epoch
+        self.assertEqual(columns["acquired"].tolist(),
+                         [19905 * 86400 + 9 * 3600 + 12 * 60, 19905 * 86400 + 21 * 3600 + 45 * 60,
+                          19907 * 86400 + 30 * 60])
+        self.assertEqual(columns["satellite"].tolist(), ["N", "N20", "N"])
+
+    def test_modis_and_chunking(self):
+        """Test percentage confidence, source detection and chunk sizes."""
+        chunks = list(read_firms_csv(io.StringIO(MODIS_CSV), chunk_rows=1))
+        self.assertEqual([len(chunk["lat"]) for chunk in chunks], [1, 1])
+        np.testing.assert_allclose([chunk["confidence"][0] for chunk in chunks], [0.76, 0.4])
+        np.testing.assert_allclose(parse_confidence(["h", "nominal", "55", "?"]), [0.9, 0.6, 0.55, np.nan])
+
+    def test_rejects_other_files(self):
+        """Test that files without a brightness column are refused."""
+        with self.assertRaises(ValueError):
+            list(read_firms_csv(io.StringIO("latitude,longitude\n1,2\n")))
+
+
+class TestHotspotStore(unittest.TestCase):
+    """Test cases for appending, deduplicating and querying hotspots."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = HotspotStore(os.path.join(self.tmpdir.name, "hotspots.sqlite"))
+        self.viirs_path = self.write("viirs.csv", VIIRS_CSV)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_grid(self):
+        """Test the index cells and the cell ranges of a bounding box."""
+        self.assertEqual(grid_cell([-90, 89.99], [-180, 179.99]).tolist(), [0, 180 * 360 - 1])
+        ranges = cell_ranges([-122.5, 37.5, -121.5, 38.5])
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(ranges[1][0] - ranges[0][0], 360)
+        self.assertEqual(ranges[0][1] - ranges[0][0], 1)
+
+    def test_ingest_dedupes_redelivered_rows(self):
+        """Test that overlapping deliveries and unchanged files add nothing."""
+        first = self.store.ingest_csv(self.viirs_path)
+        self.assertEqual((first["rows"], first["inserted"], first["duplicates"]), (3, 3, 0))
+        version = self.store.version
+
+        self.assertTrue(self.store.ingest_csv(self.viirs_path)["skipped"])
+        again = self.store.ingest_csv(self.viirs_path, force=True)
+        self.assertEqual((again["inserted"], again["duplicates"]), (0, 3))
+        self.assertEqual(self.store.version, version)
+
+        # A later delivery repeating one row and adding a new one
+        lines = VIIRS_CSV.splitlines()
+        self.write("viirs_update.csv", "\n".join(
+            [lines[0], lines[1], lines[1].replace("37.61", "37.63")]) + "\n")
+        totals = self.store.ingest_directory(self.tmpdir.name)
+        self.assertEqual(totals, {"files": 1, "rows": 2, "inserted": 1})
+        self.assertEqual(self.store.count(), 4)
+        self.assertEqual(self.store.count("viirs"), 4)
+        self.assertGreater(self.store.version, version)
+
+    def test_query(self):
+        """Test bounding box, time, source and confidence filters."""
+        self.store.ingest_csv(self.viirs_path)
+        self.store.ingest_csv(self.write("modis.csv", MODIS_CSV))
+        self.assertTrue(self.store.has_data("modis"))
+        self.assertFalse(self.store.has_data("goes"))
+
+        bay_area = [-122.5, 37.5, -122.0, 38.0]
+        hotspots = self.store.query(bay_area)
+        self.assertEqual(hotspots["source"].tolist(), ["modis", "viirs", "viirs"])
+        self.assertTrue(np.all(np.diff(hotspots["acquired"]) <= 0))
+
+        viirs = self.store.query(bay_area, source="viirs", min_confidence=0.8)
+        self.assertEqual(viirs["satellite"].tolist(), ["N20"])
+        day = self.store.query(bay_area, "2024-07-01T00:00:00", "2024-07-01T12:00:00")
+        self.assertEqual(len(day["id"]), 1)
+        self.assertEqual(len(self.store.query([150.0, -35.0, 152.0, -33.0], source="modis")["id"]), 1)
+        self.assertEqual(len(self.store.query(bay_area, limit=2)["lat"]), 2)
+        empty = self.store.query([0.0, 0.0, 1.0, 1.0])
+        self.assertEqual(len(empty["id"]), 0)
+        self.assertEqual(empty["lat"].dtype, np.float64)
+
+    def test_shared_store_reopens_after_close(self):
+        """Test that closing the shared store (e.g. on shutdown) does not leave a dead connection."""
+        path = os.path.join(self.tmpdir.name, "shared.sqlite")
+        get_hotspot_store(path).close()
+        store = get_hotspot_store(path)
+        try:
+            self.assertEqual(store.count(), 0)
+        finally:
+            store.close()
+
+
+class TestHotspotEndpoint(unittest.TestCase):
+    """Test that the hotspots endpoint serves ingested data."""
+
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = HotspotStore(os.path.join(self.tmpdir.name, "hotspots.sqlite"))
+        # Tiles also read the shared detection store, which is kept out of the checkout
+        self.detection_store_path = mock.patch.object(
+            simple_main, "DETECTION_STORE_PATH", os.path.join(self.tmpdir.name, "detections.sqlite")
+        )
+        self.detection_store_path.start()
+        simple_main.get_detection_store(simple_main.DETECTION_STORE_PATH).close()
+        self.patch = mock.patch.object(simple_main, "get_hotspot_store", lambda path=None: self.store)
+        self.patch.start()
+        self.client = TestClient(simple_main.app)
+        self.params = {"bounds": [-122.5, 37.5, -122.0, 38.0], "start_date": "2024-07-01",
+                       "end_date": "2024-07-01", "source": "viirs"}
+
+    def tearDown(self):
+        self.patch.stop()
+        simple_main.get_detection_store(simple_main.DETECTION_STORE_PATH).close()
+        self.detection_store_path.stop()
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_stored_hotspots(self):
+        """Test features, inclusive end dates and ETags that follow the store."""
+        synthetic = self.client.get("/api/v1/hotspots", params=self.params)
+        self.assertNotIn("data_source", synthetic.json()["metadata"])
+
+        self.store.append(next(read_firms_csv(io.StringIO(VIIRS_CSV))), "viirs")
+        response = self.client.get("/api/v1/hotspots", params=self.params)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["metadata"]["data_source"], "firms")
+        self.assertFalse(body["metadata"]["truncated"])
+        self.assertNotEqual(response.headers["etag"], synthetic.headers["etag"])
+        properties = [feature["properties"] for feature in body["features"]]
+        self.assertEqual([p["acquired"] for p in properties], ["2024-07-01T21:45:00Z", "2024-07-01T09:12:00Z"])
+        self.assertEqual(properties[0]["satellite"], "N20")
+        self.assertEqual(properties[0]["confidence"], 0.9)
+        self.assertTrue(properties[0]["id"].startswith("firms_viirs_"))
+
+        etag = response.headers["etag"]
+        self.assertEqual(self.client.get("/api/v1/hotspots", params=self.params,
+                                         headers={"If-None-Match": etag}).status_code, 304)
+        self.store.append(next(read_firms_csv(io.StringIO(MODIS_CSV))), "viirs")
+        changed = self.client.get("/api/v1/hotspots", params=self.params, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()["features"]), 2)  # the new rows are outside the dates
+
+        # Explicit counts keep producing synthetic load-test data
+        counted = self.client.get("/api/v1/hotspots", params={**self.params, "count": 5})
+        self.assertEqual(len(counted.json()["features"]), 5)
+        self.assertNotIn("data_source", counted.json()["metadata"])
+
+    def test_busy_store_does_not_block_event_loop(self):
+        """Test that a request waiting for the store lock leaves the event loop running."""
+        from starlette.requests import Request
+        self.store.append(next(read_firms_csv(io.StringIO(VIIRS_CSV))), "viirs")
+        http_request = Request({"type": "http", "headers": [], "query_string": b""})
+
+        async def scenario():
+            # Stand-in for a long query or ingest holding the lock; released after a second at the latest
+            self.store._lock.acquire()
+            release = threading.Timer(1.0, self.store._lock.release)
+            release.start()
+            handler = asyncio.ensure_future(simple_main.get_hotspots(
+                http_request, self.params["bounds"], "2024-07-01", "2024-07-01", "viirs", None, None
+            ))
+            started = time.perf_counter()
+            await asyncio.sleep(0.05)
+            elapsed = time.perf_counter() - started
+            await handler
+            release.join()
+            return elapsed
+
+        self.assertLess(asyncio.run(scenario()), 0.5)
+
+    def test_tile_hotspots_follow_store(self):
+        """Test that the tile hotspot layer draws ingested data and is invalidated by new rows."""
+        from api.tiles import TileCache
+        params = {"layers": "hotspots", "start_date": "2024-07-01", "end_date": "2024-07-01"}
+        with mock.patch.object(simple_main, "tile_cache", TileCache()):
+            synthetic = self.client.get("/tiles/8/41/99", params=params)
+            self.store.append(next(read_firms_csv(io.StringIO(VIIRS_CSV))), "viirs")
+            stored = self.client.get("/tiles/8/41/99", params=params)
+            self.assertEqual(stored.status_code, 200)
+            self.assertEqual(stored.headers["x-tile-cache"], "miss")
+            self.assertNotEqual(stored.headers["etag"], synthetic.headers["etag"])
+            self.assertIn(b"firms_viirs_", stored.content)
+            self.assertEqual(self.client.get("/tiles/8/41/99", params=params).headers["x-tile-cache"], "hit")
+
+            self.store.append(next(read_firms_csv(io.StringIO(MODIS_CSV))), "viirs")
+            changed = self.client.get("/tiles/8/41/99", params=params,
+                                      headers={"If-None-Match": stored.headers["etag"]})
+            self.assertEqual(changed.status_code, 200)
+            self.assertEqual(changed.headers["x-tile-cache"], "miss")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test module for the grid-bucket gazetteer.
+"""
+
+import unittest
+import tempfile
+import json
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.gazetteer import Gazetteer, DEFAULT_PLACES
+
+
+class TestGazetteer(unittest.TestCase):
+    """Test cases for nearest-place lookups."""
+
+    def test_matches_brute_force(self):
+        """Test grid-bucket results against an exhaustive search."""
+        rng = np.random.default_rng(1)
+        place_lon = rng.uniform(-125, -114, 3000)
+        place_lat = rng.uniform(32, 42, 3000)
+        gazetteer = Gazetteer([f"p{i}" for i in range(3000)], place_lon, place_lat)
+
+        lon = rng.uniform(-126, -113, 2000)
+        lat = rng.uniform(31, 43, 2000)
+        index, distance = gazetteer.nearest(lon, lat, chunk_size=500)
+
+        all_dist = np.hypot(lon[:, None] - place_lon[None, :], lat[:, None] - place_lat[None, :])
+        expected_index = np.argmin(all_dist, axis=1)
+        expected_distance = all_dist[np.arange(len(lon)), expected_index]
+        in_range = expected_distance <= gazetteer.cell_size
+
+        np.testing.assert_array_equal(index[in_range], expected_index[in_range])
+        np.testing.assert_allclose(distance[in_range], expected_distance[in_range])
+        self.assertTrue(np.all(index[~in_range] == -1))
+
+    def test_names(self):
+        """Test exact, near and remote naming with the built-in places."""
+        gazetteer = Gazetteer.from_places(DEFAULT_PLACES)
+        names = gazetteer.names_for([-122.42, -122.0, 10.0], [37.77, 37.9, 10.0])
+        self.assertEqual(names, ["San Francisco Area", "Near San Francisco Area", "Remote Area (10.00, 10.00)"])
+        self.assertEqual(gazetteer.names_for(-118.25, 34.05), ["Los Angeles Area"])
+
+    def test_ties_prefer_first_listed(self):
+        gazetteer = Gazetteer(["first", "second"], [0.0, 0.2], [0.0, 0.0])
+        self.assertEqual(gazetteer.names_for(0.1, 0.0), ["Near first"])
+
+    def test_load_files(self):
+        """Test CSV and GeoJSON loading."""
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "places.csv")
+            with open(csv_path, "w") as f:
+                f.write("name,lon,lat,kind\nYosemite National Park,-119.5383,37.8651,park\n")
+            geojson_path = os.path.join(tmp, "places.geojson")
+            with open(geojson_path, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": [{
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [148.4, -36.4]},
+                    "properties": {"name": "Kosciuszko National Park", "kind": "park"}
+                }]}, f)
+
+            from_csv = Gazetteer.from_file(csv_path)
+            from_geojson = Gazetteer.from_file(geojson_path)
+
+        self.assertEqual(from_csv.kinds, ["park"])
+        self.assertEqual(from_csv.names_for(-119.54, 37.87), ["Yosemite National Park"])
+        self.assertEqual(from_geojson.names_for(148.45, -36.4), ["Kosciuszko National Park"])
+
+    def test_empty(self):
+        index, distance = Gazetteer([], [], []).nearest([0.0], [0.0])
+        self.assertEqual(index.tolist(), [-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
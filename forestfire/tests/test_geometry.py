@@ -0,0 +1,84 @@
+"""
+Test module for GeoJSON geometry helpers.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.geometry import (
+    centroid, douglas_peucker, simplify_geometry, geometry_bounds, meters_to_degrees,
+    build_geometry_levels, select_geometry
+)
+
+
+def staircase_polygon(n=50, step=0.001):
+    """Right triangle whose hypotenuse is a pixel staircase, closed."""
+    ring = [[0.0, 0.0]]
+    for i in range(n):
+        ring.append([i * step, (i + 1) * step])
+        ring.append([(i + 1) * step, (i + 1) * step])
+    ring += [[n * step, 0.0], [0.0, 0.0]]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+class TestGeometry(unittest.TestCase):
+    """Test cases for geometry helpers."""
+
+    def test_centroid(self):
+        """Test area-weighted centroids, including holes."""
+        square = {"type": "Polygon", "coordinates": [[[-120, 38], [-119, 38], [-119, 39], [-120, 39], [-120, 38]]]}
+        np.testing.assert_allclose(centroid(square)["coordinates"], [-119.5, 38.5], atol=1e-12)
+
+        with_hole = {"type": "Polygon", "coordinates": [
+            [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+            [[2, 0], [4, 0], [4, 4], [2, 4], [2, 0]]
+        ]}
+        np.testing.assert_allclose(centroid(with_hole)["coordinates"], [1.0, 2.0])
+        self.assertEqual(centroid({"type": "Point", "coordinates": [1, 2]})["coordinates"], [1, 2])
+
+    def test_douglas_peucker(self):
+        """Test that collinear vertices are removed and corners kept."""
+        points = np.array([[0, 0], [1, 0.01], [2, 0], [2, 1], [2, 2]], dtype=float)
+        np.testing.assert_array_equal(douglas_peucker(points, 0.1), [True, False, True, False, True])
+        np.testing.assert_array_equal(douglas_peucker(points, 0.001), [True, True, True, False, True])
+
+    def test_simplify_polygon(self):
+        """Test staircase simplification keeps a closed, valid ring."""
+        polygon = staircase_polygon()
+        simplified = simplify_geometry(polygon, 0.002)
+        ring = simplified["coordinates"][0]
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring[0], ring[-1])
+        self.assertGreaterEqual(len(ring), 4)
+        self.assertEqual(geometry_bounds(simplified), geometry_bounds(polygon))
+
+        self.assertIsNone(simplify_geometry(staircase_polygon(step=1e-6), 1.0))
+
+    def test_geometry_levels(self):
+        """Test per-zoom levels get coarser and tiny shapes become points."""
+        polygon = staircase_polygon(n=200, step=0.0001)
+        levels = build_geometry_levels(polygon, [4, 10, 12])
+        sizes = [len(levels[z]["coordinates"][0]) for z in ("12", "10")]
+        self.assertLessEqual(sizes[1], sizes[0])
+        self.assertLess(sizes[0], len(polygon["coordinates"][0]))
+        self.assertEqual(levels["4"]["type"], "Point")
+
+        detection = {"geometry": polygon, "geometry_levels": levels}
+        self.assertIs(select_geometry(detection, 9), levels["10"])
+        self.assertIs(select_geometry(detection, 12), levels["12"])
+        self.assertIs(select_geometry(detection, 16), polygon)
+        self.assertIs(select_geometry(detection, None), polygon)
+
+    def test_meters_to_degrees(self):
+        """Test latitude-aware tolerance conversion."""
+        self.assertAlmostEqual(meters_to_degrees(111320.0), 1.0)
+        self.assertAlmostEqual(meters_to_degrees(111320.0, 60.0), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
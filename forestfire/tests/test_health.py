@@ -0,0 +1,128 @@
+"""
+Test module for liveness and readiness checks.
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.health import (
+    DEFAULT_THRESHOLDS, EventLoopLagMonitor, liveness_report, process_memory_mb, readiness_report
+)
+
+
+class TestHealthChecks(unittest.TestCase):
+    """Test cases for the lag monitor and the readiness verdict."""
+
+    def setUp(self):
+        self.measurements = {
+            "warm": True,
+            "event_loop_lag_s": 0.01,
+            "queue_depth": 10,
+            "max_queue_size": 100,
+            "task_store_bytes": 1024
+        }
+
+    def test_ready(self):
+        """Test that an idle, warm instance is ready."""
+        report = readiness_report(self.measurements, DEFAULT_THRESHOLDS)
+        self.assertEqual(report["status"], "ready")
+        self.assertEqual(report["failing"], [])
+        self.assertAlmostEqual(report["checks"]["queue_utilization"]["value"], 0.1)
+
+    def test_saturation_fails_readiness(self):
+        """Test each saturation signal on its own."""
+        cases = {
+            "warm": {"warm": False},
+            "event_loop_lag_ms": {"event_loop_lag_s": 0.5},
+            "queue_utilization": {"queue_depth": 95},
+            "task_store_mb": {"task_store_bytes": 600 * 2 ** 20}
+        }
+        for check, override in cases.items():
+            report = readiness_report({**self.measurements, **override}, DEFAULT_THRESHOLDS)
+            self.assertEqual(report["status"], "not_ready")
+            self.assertEqual(report["failing"], [check])
+
+    def test_lag_monitor_detects_blocking(self):
+        """Test that a blocking call shows up as lag and liveness stays up."""
+        async def scenario():
+            monitor = EventLoopLagMonitor(interval=0.01)
+            await monitor.start()
+            await asyncio.sleep(0.03)
+            time.sleep(0.1)  # block the loop
+            await asyncio.sleep(0.03)
+            live = liveness_report(monitor, DEFAULT_THRESHOLDS)
+            await monitor.stop()
+            stopped = liveness_report(monitor, DEFAULT_THRESHOLDS)
+            return monitor.lag, live, stopped
+
+        lag, live, stopped = asyncio.run(scenario())
+        self.assertGreater(lag, 0.05)
+        self.assertEqual(live["status"], "alive")
+        self.assertEqual(stopped["status"], "stalled")
+
+    def test_process_memory(self):
+        """Test that the RSS probe returns a plausible value."""
+        self.assertGreater(process_memory_mb(), 1)
+
+
+class TestTaskEviction(unittest.TestCase):
+    """Test that finished tasks do not accumulate in memory."""
+
+    def setUp(self):
+        from api import simple_main
+        self.main = simple_main
+        self.patches = [
+            mock.patch.object(simple_main, "detection_tasks", {}),
+            mock.patch.object(simple_main, "detection_batches", {}),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def add_task(self, request_id, status, age_seconds, result_bytes=0):
+        self.main.detection_tasks[request_id] = {
+            "status": status, "timestamp": self.now - timedelta(seconds=age_seconds), "result_bytes": result_bytes
+        }
+
+    def test_ttl_and_size_eviction(self):
+        """Test that expired and, above the budget, oldest finished tasks are evicted."""
+        self.now = datetime(2024, 7, 1, 12, 0)
+        self.add_task("expired", "completed", 7200)
+        self.add_task("running", "processing", 7200)
+        self.add_task("old", "failed", 60, 100)
+        self.add_task("recent", "completed", 10, 100)
+        self.main.detection_batches["batch"] = {"items": ["expired"]}
+
+        with mock.patch.object(self.main, "TASK_STORE_MAX_BYTES", 150):
+            self.main.prune_detection_tasks(self.now)
+        self.assertEqual(set(self.main.detection_tasks), {"running", "recent"})
+        self.assertEqual(self.main.detection_batches, {})
+
+        # Within the TTL and the budget nothing is evicted
+        self.main.prune_detection_tasks(self.now)
+        self.assertEqual(set(self.main.detection_tasks), {"running", "recent"})
+
+    def test_result_size_estimate(self):
+        """Test that the estimate follows the size of the serialized results."""
+        from api.serialization import dumps
+        from api.simple_main import DetectionRequest, create_mock_detection_results, estimate_result_bytes
+        request = DetectionRequest(bounds=[-122.5, 37.5, -122.0, 38.0], start_date="2024-07-01",
+                                   end_date="2024-07-15")
+        results = create_mock_detection_results(request, 1234)
+        actual = len(dumps(results))
+        self.assertLess(abs(estimate_result_bytes(results) - actual) / actual, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
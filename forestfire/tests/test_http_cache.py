@@ -0,0 +1,65 @@
+"""
+Test module for HTTP validators and conditional GET handling.
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.http_cache import cache_headers, http_date, is_not_modified, make_etag, not_modified
+
+
+class TestHttpCache(unittest.TestCase):
+    """Test cases for ETag generation and conditional request evaluation."""
+
+    def setUp(self):
+        self.modified = datetime(2024, 7, 1, 12, 30, 15, 500000, tzinfo=timezone.utc)
+
+    def test_etag_is_stable_and_weak(self):
+        """Test that tags depend only on their inputs."""
+        etag = make_etag("hotspots", [1, 2, 3, 4], "json")
+        self.assertEqual(etag, make_etag("hotspots", [1, 2, 3, 4], "json"))
+        self.assertNotEqual(etag, make_etag("hotspots", [1, 2, 3, 4], "ndjson"))
+        self.assertTrue(etag.startswith('W/"') and etag.endswith('"'))
+
+    def test_if_none_match(self):
+        """Test weak comparison, tag lists and the wildcard."""
+        etag = make_etag("regions")
+        strong = etag[2:]
+        self.assertTrue(is_not_modified({"if-none-match": etag}, etag))
+        self.assertTrue(is_not_modified({"if-none-match": strong}, etag))
+        self.assertTrue(is_not_modified({"if-none-match": f'"other", {etag}'}, etag))
+        self.assertTrue(is_not_modified({"if-none-match": "*"}, etag))
+        self.assertFalse(is_not_modified({"if-none-match": '"other"'}, etag))
+        self.assertFalse(is_not_modified({}, etag))
+
+    def test_if_modified_since(self):
+        """Test date comparison at one second precision."""
+        self.assertTrue(is_not_modified({"if-modified-since": http_date(self.modified)}, None, self.modified))
+        earlier = http_date(self.modified - timedelta(seconds=1))
+        self.assertFalse(is_not_modified({"if-modified-since": earlier}, None, self.modified))
+        self.assertFalse(is_not_modified({"if-modified-since": "not a date"}, None, self.modified))
+
+    def test_if_none_match_takes_precedence(self):
+        """Test that a failing tag match is not overridden by the date."""
+        headers = {"if-none-match": '"other"', "if-modified-since": http_date(self.modified)}
+        self.assertFalse(is_not_modified(headers, make_etag("x"), self.modified))
+
+    def test_headers_and_304(self):
+        """Test header assembly and the empty 304 response."""
+        headers = cache_headers(make_etag("x"), "public, max-age=60", self.modified, vary="Accept")
+        self.assertEqual(headers["Last-Modified"], "Mon, 01 Jul 2024 12:30:15 GMT")
+        self.assertEqual(headers["Cache-Control"], "public, max-age=60")
+
+        response = not_modified(headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.body, b"")
+        self.assertEqual(response.headers["etag"], headers["ETag"])
+
+
+if __name__ == '__main__':
+    unittest.main()
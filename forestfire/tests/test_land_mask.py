@@ -0,0 +1,62 @@
+"""
+Test module for the bit-packed land/water grid.
+"""
+
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.land_mask import LandMask, water_rules
+
+
+class TestLandMask(unittest.TestCase):
+    """Test cases for land/water lookups."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mask = LandMask.build(cells_per_degree=4)
+
+    def test_matches_rules_away_from_edges(self):
+        """Test that grid lookups agree with the analytic rules at cell centres."""
+        rng = np.random.default_rng(0)
+        rows = rng.integers(0, self.mask.rows, 5000)
+        cols = rng.integers(0, self.mask.cols, 5000)
+        lat = 90 - (rows + 0.5) / 4
+        lon = -180 + (cols + 0.5) / 4
+        np.testing.assert_array_equal(self.mask.is_water(lon, lat), water_rules(lon, lat))
+
+    def test_known_points(self):
+        """Test a few well-known land and water locations."""
+        self.assertTrue(self.mask.is_water_point(-140.0, 20.0))    # Pacific
+        self.assertTrue(self.mask.is_water_point(-122.25, 37.75))  # San Francisco Bay
+        self.assertFalse(self.mask.is_water_point(-100.0, 40.0))   # Kansas
+        self.assertFalse(self.mask.is_water_point(10.0, 48.0))     # Germany
+        self.assertEqual(self.mask.is_land([-100.0, -140.0], [40.0, 20.0]).tolist(), [True, False])
+
+    def test_save_and_memory_map(self):
+        """Test that a saved grid can be memory-mapped and queried."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "land_mask.npy")
+            self.mask.save(path)
+            loaded = LandMask.load(path, mmap=True)
+            self.assertIsInstance(loaded.packed, np.memmap)
+            self.assertEqual(loaded.cells_per_degree, 4)
+            np.testing.assert_array_equal(loaded.packed, self.mask.packed)
+
+    def test_raster_mask(self):
+        """Test land masking of a geographic raster."""
+        # 0.5 degree pixels from -131W to -129W at 20N: western half is ocean
+        transform = (0.5, 0, -131.0, 0, -0.5, 21.0)
+        land = self.mask.land_mask_for_transform(transform, (4, 4))
+        self.assertEqual(land.shape, (4, 4))
+        self.assertFalse(land[:, :2].any())
+        self.assertTrue(land[:, 2:].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Test module checking that heavy dependencies load lazily.
+"""
+
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+HEAVY_MODULES = ("geopandas", "shapely", "rasterio", "pandas", "scipy", "uvicorn")
+
+
+def loaded_heavy_modules(module: str) -> list:
+    """Import ``module`` in a fresh interpreter and list the heavy modules it pulled in."""
+    code = (
+        f"import json, sys; sys.path.insert(0, {SRC_DIR!r}); import {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        output = subprocess.run([sys.executable, "-c", code], cwd=workdir,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for import-time dependencies of the API and detector."""
+
+    def test_api_import(self):
+        """Test that starting the API does not import geospatial libraries."""
+        self.assertEqual(loaded_heavy_modules("api.simple_main"), [])
+
+    def test_detector_import(self):
+        """Test that the detector defers geopandas / shapely / rasterio to first use."""
+        self.assertEqual(loaded_heavy_modules("detection.fire_detector"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
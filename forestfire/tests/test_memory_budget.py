@@ -0,0 +1,110 @@
+"""
+Test module for memory estimates and budget-driven tiling.
+"""
+
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.memory_budget import MemoryReport, estimate_peak_bytes, stage_bytes_per_pixel, track_peak
+from detection.fire_detector import FireDetector
+
+
+def make_scene(shape, dtype=np.float64, seed=5):
+    rng = np.random.default_rng(seed)
+    optical = {name: rng.uniform(0.05, 0.6, shape).astype(dtype)
+               for name in ("red", "nir", "swir1", "swir2", "blue")}
+    optical["nir"][50:200, 60:220] = 0.05
+    optical["swir2"][50:200, 60:220] = 0.5
+    brightness = rng.normal(300, 5, shape)
+    brightness[80:180, 100:200] = 340
+    thermal = {"brightness_temp": brightness,
+               "mir": rng.uniform(0.5, 1, shape).astype(dtype),
+               "nir": rng.uniform(0.1, 0.5, shape).astype(dtype)}
+    return thermal, optical
+
+
+def detector(max_memory_gb=None, **parallel):
+    return FireDetector({"performance": {
+        "parallel": {"backend": "serial", **parallel},
+        "memory": {"max_memory_gb": max_memory_gb}
+    }})
+
+
+class FlakyDetector(FireDetector):
+    """Runs out of memory on tiles larger than 100 pixels a side."""
+
+    def _tile_masks(self, tile):
+        if max(tile["brightness_temp"].shape) > 100:
+            raise MemoryError("simulated")
+        return super()._tile_masks(tile)
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Test cases for estimates, enforcement and degradation."""
+
+    def setUp(self):
+        self.shape = (300, 300)
+        self.thermal, self.optical = make_scene(self.shape)
+
+    def test_estimate_brackets_actual(self):
+        """Test that the masks estimate covers the measured peak without grossly overshooting."""
+        rasters = [*self.optical.values(), *self.thermal.values()]
+        estimate = estimate_peak_bytes("masks", self.shape, rasters)
+        inputs = sum(array.nbytes for array in rasters)
+        with track_peak() as peak:
+            detector().detect_masks(self.thermal, self.optical)
+        self.assertGreater(peak["peak_bytes"], 0)
+        self.assertLessEqual(peak["peak_bytes"], estimate - inputs)
+        self.assertGreater(peak["peak_bytes"], 0.5 * (estimate - inputs))
+
+    def test_precision_halves_temporaries(self):
+        """Test that float32 bands are estimated at half the cost of float64."""
+        thermal32, optical32 = make_scene(self.shape, np.float32)
+        wide = stage_bytes_per_pixel("masks", self.optical.values())
+        narrow = stage_bytes_per_pixel("masks", optical32.values())
+        self.assertAlmostEqual(narrow - 10, (wide - 10) / 2)
+
+    def test_budget_selects_tiles(self):
+        """Test that a small budget tiles the scene and gives the untiled result."""
+        expected_hotspots, expected = detector().detect_masks(self.thermal, self.optical)
+
+        report = MemoryReport()
+        hotspots, optical = detector(max_memory_gb=4 / 1024).detect_masks(
+            self.thermal, self.optical, report=report
+        )
+        stage = report.to_dict()["stages"]["masks"]
+        self.assertGreater(stage["tiles"], 1)
+        self.assertLess(stage["tile_size"], 300)
+        self.assertIsNotNone(stage["actual_mb"])
+        np.testing.assert_array_equal(hotspots, expected_hotspots)
+        np.testing.assert_array_equal(optical["combined_mask"], expected["combined_mask"])
+
+    def test_degrades_on_memory_error(self):
+        """Test that MemoryError shrinks the tiles instead of failing."""
+        expected_hotspots, expected = detector().detect_masks(self.thermal, self.optical)
+
+        flaky = FlakyDetector({"performance": {"parallel": {"backend": "serial"}}})
+        report = MemoryReport()
+        hotspots, optical = flaky.detect_masks(self.thermal, self.optical, report=report)
+        stage = report.stages["masks"]
+        self.assertGreaterEqual(stage["retries"], 2)
+        self.assertLessEqual(stage["tile_size"] + 16, 100)
+        np.testing.assert_array_equal(hotspots, expected_hotspots)
+        np.testing.assert_array_equal(optical["combined_mask"], expected["combined_mask"])
+
+    def test_results_carry_report(self):
+        """Test that detection results include the memory report."""
+        pre = {name: band + 0.2 for name, band in self.optical.items()}
+        results = detector(max_memory_gb=1).detect_fire_events(self.thermal, self.optical, pre_fire_data=pre)
+        self.assertIn("masks", results["memory"]["stages"])
+        self.assertIn("dnbr", results["memory"]["stages"])
+        self.assertEqual(results["memory"]["budget_mb"], 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
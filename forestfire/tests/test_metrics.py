@@ -0,0 +1,97 @@
+"""
+Test module for the metrics registry and request instrumentation.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.metrics import MetricsRegistry
+from api.instrumentation import MetricsMiddleware
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for counters, gauges, histograms and text rendering."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        """Test labelled counters and gauges."""
+        counter = self.registry.counter("jobs_total", "Jobs", ("status",))
+        counter.inc(status="completed")
+        counter.inc(2, status="completed")
+        counter.inc(status="failed")
+        self.assertEqual(counter.value(status="completed"), 3)
+
+        gauge = self.registry.gauge("in_flight", "In flight")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        self.assertEqual(gauge.value(), 1)
+
+        with self.assertRaises(ValueError):
+            counter.inc(reason="x")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts, sum and count."""
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value, route="/a")
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{route="/a"} 4', text)
+        self.assertIn('latency_seconds_sum{route="/a"} 5.65', text)
+        self.assertIn("# TYPE latency_seconds histogram", text)
+
+    def test_register_is_idempotent(self):
+        """Test that re-registering returns the same metric and conflicts raise."""
+        first = self.registry.counter("requests_total", "Requests")
+        self.assertIs(first, self.registry.counter("requests_total", "Requests"))
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests_total", "Requests")
+
+    def test_collectors(self):
+        """Test scrape-time collectors and isolation of failing ones."""
+        self.registry.register_collector(lambda: [
+            ("queue_depth", "gauge", "Queue depth", [("queue_depth", {}, 7)])
+        ])
+        self.registry.register_collector(lambda: 1 / 0)
+        text = self.registry.render()
+        self.assertIn("queue_depth 7", text)
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+    """Test cases for per-route request instrumentation."""
+
+    def test_route_template_labels(self):
+        """Test that requests are labelled by route template and status."""
+        registry = MetricsRegistry()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, registry=registry)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        text = registry.render()
+        self.assertIn('forestfire_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2', text)
+        self.assertIn('forestfire_http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1', text)
+        self.assertIn("forestfire_http_requests_in_flight 0", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Test module for coarse-to-fine progressive detection.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection.fire_detector import FireDetector
+from detection.progressive import candidate_windows, coarse_factor, offset_transform, scale_transform, window_bounds
+from storage.pyramid import downsample_max
+
+
+class TestWindows(unittest.TestCase):
+    """Test cases for the coarse level geometry."""
+
+    def test_factor_and_transforms(self):
+        """Test the reduction factor and the derived transforms."""
+        self.assertEqual(coarse_factor((400, 300), 512), 1)
+        self.assertEqual(coarse_factor((1200, 1100), 512), 4)
+        transform = (10.0, 0.0, 500000.0, 0.0, -10.0, 4200000.0)
+        self.assertEqual(scale_transform(transform, 4), (40.0, 0.0, 500000.0, 0.0, -40.0, 4200000.0))
+        self.assertEqual(offset_transform(transform, 100, 20), (10.0, 0.0, 500200.0, 0.0, -10.0, 4199000.0))
+        self.assertEqual(window_bounds(transform, (slice(0, 10), slice(0, 5))),
+                         (500000.0, 4199900.0, 500050.0, 4200000.0))
+        np.testing.assert_array_equal(downsample_max(np.array([[1.0, 5.0, 2.0], [np.nan, 0.0, 3.0]])), [[5.0, 3.0]])
+
+    def test_candidate_windows(self):
+        """Test scaling, margins, merging and ordering of candidate regions."""
+        mask = np.zeros((20, 20), dtype=bool)
+        mask[2:4, 2:4] = True     # small region
+        mask[10:16, 10:16] = True  # large region
+        mask[10:12, 17:19] = True  # close to the large one once margins are added
+        windows = candidate_windows(mask, factor=4, shape=(80, 78), margin=4)
+        self.assertEqual(windows, [(slice(36, 68), slice(36, 78)), (slice(4, 20), slice(4, 20))])
+
+
+class TestProgressiveDetection(unittest.TestCase):
+    """Test that refinement converges to the full-resolution result."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        shape = (1200, 1100)
+        self.optical = {
+            "red": rng.uniform(0.04, 0.06, shape),
+            "nir": rng.uniform(0.45, 0.5, shape),
+            "swir1": rng.uniform(0.2, 0.25, shape),
+            "swir2": rng.uniform(0.1, 0.12, shape),
+            "blue": rng.uniform(0.03, 0.05, shape),
+        }
+        brightness = np.full(shape, 300.0)
+        for row, col, size in [(100, 100, 60), (700, 800, 120), (1000, 200, 30)]:
+            window = (slice(row, row + size), slice(col, col + size))
+            self.optical["nir"][window] = 0.05
+            self.optical["swir2"][window] = 0.6
+            self.optical["red"][window] = 0.2
+            brightness[window] = 350
+        self.thermal = {"brightness_temp": brightness}
+        self.detector = FireDetector({
+            "performance": {"parallel": {"backend": "serial"}},
+            "detection": {"spatial": {"min_burn_area": 50, "geometry_zoom_levels": []}}
+        })
+        self.metadata = {"crs": "EPSG:32610", "transform": (1.0, 0.0, 0.0, 0.0, -1.0, 1200.0)}
+
+    def areas(self, results):
+        return sorted(round(detection["area_m2"]) for detection in results["detections"])
+
+    def test_refined_matches_full_resolution(self):
+        """Test that a run without deadline refines every region."""
+        updates = []
+        results = self.detector.detect_progressive(self.thermal, self.optical, metadata=self.metadata,
+                                                   on_update=lambda r: updates.append(dict(r["progressive"])))
+        full = self.detector.detect_fire_events(self.thermal, self.optical, metadata=self.metadata)
+
+        self.assertNotIn("error", results)
+        self.assertEqual(self.areas(results), self.areas(full))
+        self.assertEqual({d["resolution"] for d in results["detections"]}, {"full"})
+        for refined, expected in zip(sorted(results["detections"], key=lambda d: d["area_m2"]),
+                                     sorted(full["detections"], key=lambda d: d["area_m2"])):
+            self.assertTrue(refined["geometry"].equals(expected["geometry"]))
+        self.assertEqual([u["stage"] for u in updates], ["coarse", "refining", "refining", "final"])
+        self.assertEqual(results["progressive"]["factor"], 4)
+        self.assertTrue(results["progressive"]["complete"])
+        ids = [detection["id"] for detection in results["detections"]]
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_deadline_keeps_coarse_results(self):
+        """Test that windows which do not fit the deadline stay coarse."""
+        results = self.detector.detect_progressive(self.thermal, self.optical, metadata=self.metadata,
+                                                   deadline_seconds=1e-6)
+        self.assertFalse(results["progressive"]["complete"])
+        self.assertEqual(results["progressive"]["windows_refined"], 0)
+        self.assertEqual(len(results["detections"]), 3)
+        self.assertEqual({d["resolution"] for d in results["detections"]}, {"coarse"})
+
+    def test_failed_run_has_no_windows(self):
+        """Test that a failed coarse pass is reported without candidate windows."""
+        with mock.patch.object(self.detector, "detect_masks", side_effect=ValueError("unreadable scene")):
+            results = self.detector.detect_progressive(self.thermal, self.optical, metadata=self.metadata)
+        self.assertEqual(results["error"], "unreadable scene")
+        self.assertEqual(results["progressive"]["windows_total"], 0)
+        self.assertFalse(results["progressive"]["complete"])
+        self.assertEqual(results["detections"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
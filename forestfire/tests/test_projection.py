@@ -0,0 +1,67 @@
+"""
+Test module for detection field projection and pagination.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.projection import paginate, parse_fields, parse_geometry_mode, project_detection
+
+
+class TestProjection(unittest.TestCase):
+    """Test cases for project_detection and paginate."""
+
+    def setUp(self):
+        self.detection = {
+            "id": "fire_1",
+            "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]},
+            "area_ha": 12.5,
+            "confidence": 0.8,
+            "indices": {"dnbr_mean": -0.4, "nbr_mean": 0.1},
+            "metadata": {"satellite": "sentinel2"}
+        }
+
+    def test_fields(self):
+        """Test top-level, nested and virtual centroid fields."""
+        projected = project_detection(self.detection, parse_fields("id, centroid,indices.dnbr_mean,missing"))
+        self.assertEqual(projected, {"id": "fire_1", "centroid": [1.0, 1.0], "indices": {"dnbr_mean": -0.4}})
+        self.assertIn("metadata", self.detection)
+
+    def test_geometry_modes(self):
+        """Test geometry detail options."""
+        self.assertNotIn("geometry", project_detection(self.detection, geometry="none"))
+        self.assertEqual(project_detection(self.detection, geometry="centroid")["geometry"],
+                         {"type": "Point", "coordinates": [1.0, 1.0]})
+        self.assertEqual(project_detection(self.detection)["geometry"], self.detection["geometry"])
+        self.assertIn("geometry", project_detection(self.detection, ["id", "geometry"], "simplified", 0.1))
+        with self.assertRaises(ValueError):
+            parse_geometry_mode("bogus")
+
+    def test_zoom_levels(self):
+        """Test zoom-matched geometry and that levels are not serialized by default."""
+        level = {"type": "Point", "coordinates": [1.0, 1.0]}
+        detection = {**self.detection, "geometry_levels": {"4": level}}
+        self.assertNotIn("geometry_levels", project_detection(detection))
+        self.assertEqual(project_detection(detection, zoom=3)["geometry"], level)
+        self.assertEqual(project_detection(detection, zoom=5)["geometry"], self.detection["geometry"])
+
+    def test_paginate(self):
+        """Test that cursors walk the list once."""
+        items = list(range(5))
+        page, cursor = paginate(items, 2, None)
+        seen = list(page)
+        while cursor:
+            page, cursor = paginate(items, 2, cursor)
+            seen.extend(page)
+        self.assertEqual(seen, items)
+        self.assertEqual(paginate(items, None, None), (items, None))
+        with self.assertRaises(ValueError):
+            paginate(items, 2, "bogus")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Test module for overview generation.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from storage.array_store import ArrayStore
+from storage.pyramid import default_resampling, downsample_mean, downsample_mode, overview_shapes
+
+
+class TestResampling(unittest.TestCase):
+    """Test cases for the 2x2 reductions."""
+
+    def test_mean_with_odd_edges_and_nan(self):
+        """Test that padding and NaN do not bias the mean."""
+        block = np.array([[1.0, 3.0, 5.0],
+                          [5.0, 7.0, np.nan],
+                          [2.0, 2.0, 8.0]], dtype=np.float32)
+        np.testing.assert_allclose(downsample_mean(block), [[4.0, 5.0], [2.0, 8.0]])
+        self.assertEqual(downsample_mean(block).dtype, np.float32)
+
+    def test_mode(self):
+        """Test majority, ties and edges for class rasters."""
+        severity = np.array([[1, 1, 0, 4],
+                             [1, 3, 4, 0],
+                             [2, 0, 3, 3]], dtype=np.uint8)
+        np.testing.assert_array_equal(downsample_mode(severity), [[1, 4], [2, 3]])
+        mask = np.array([[True, False], [False, False]])
+        self.assertFalse(downsample_mode(mask)[0, 0])
+        self.assertEqual(downsample_mode(mask).dtype, bool)
+
+    def test_defaults(self):
+        """Test resampling choice and level shapes."""
+        self.assertEqual(default_resampling(np.float32), "mean")
+        self.assertEqual(default_resampling(np.uint8), "mode")
+        self.assertEqual(default_resampling(bool), "mode")
+        self.assertEqual(overview_shapes((1000, 600), 256), [(1000, 600), (500, 300), (250, 150)])
+
+
+class TestStreamingPyramid(unittest.TestCase):
+    """Test that overviews built while writing match a rebuild from full resolution."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(4)
+        self.shape = (301, 257)
+        self.nbr = rng.uniform(-1, 1, self.shape)
+        self.severity = rng.integers(0, 5, self.shape).astype(np.uint8)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_tiles(self, root, tile):
+        store = ArrayStore(os.path.join(self.tmpdir.name, root), shape=self.shape, chunk_size=32)
+        for top in range(0, self.shape[0], tile):
+            for left in range(0, self.shape[1], tile):
+                window = (slice(top, min(top + tile, self.shape[0])), slice(left, min(left + tile, self.shape[1])))
+                store.write("nbr", window, self.nbr[window])
+                store.write("severity", window, self.severity[window])
+        return store
+
+    def test_streamed_matches_rebuilt(self):
+        """Test aligned (streamed) and misaligned (completed at finish) tiles."""
+        aligned = self.write_tiles("aligned", 64)
+        self.assertEqual(aligned.alignment, 16)
+        misaligned = self.write_tiles("misaligned", 50)
+        self.assertEqual(aligned.finish(), {"nbr": 5, "severity": 5})
+        self.assertEqual(misaligned.finish(), {"nbr": 5, "severity": 5})
+
+        expected = self.nbr.copy()
+        for level in range(1, 5):
+            expected = downsample_mean(expected)
+            np.testing.assert_allclose(aligned.read("nbr", level=level), expected)
+            np.testing.assert_allclose(misaligned.read("nbr", level=level), expected)
+            np.testing.assert_array_equal(aligned.read("severity", level=level),
+                                          misaligned.read("severity", level=level))
+        self.assertEqual(aligned.attrs("severity")["resampling"], "mode")
+
+    def test_preview_is_cheap(self):
+        """Test that a preview reads a fraction of the chunks of the full-resolution raster."""
+        store = self.write_tiles("preview", 64)
+        store.finish()
+        counts = {}
+        for level in (0, 3):
+            array = store.array("nbr", level)
+            reads = []
+            original = array.read_chunk
+            array.read_chunk = lambda row, col, original=original, reads=reads: reads.append(1) or original(row, col)
+            array.read()
+            counts[level] = len(reads)
+        self.assertEqual(counts, {0: 90, 3: 4})  # 10x9 chunks vs the 38x33 level-3 overview
+
+
+if __name__ == '__main__':
+    unittest.main()
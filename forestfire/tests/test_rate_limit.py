@@ -0,0 +1,107 @@
+"""
+Test module for the token-bucket rate limiter.
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.rate_limit import RateLimiter, MemoryBucketStore, RateLimitMiddleware, default_client_key
+from utils.metrics import MetricsRegistry
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for token-bucket rate limiting."""
+
+    def test_burst_then_reject(self):
+        """Test that a client may burst up to the bucket size."""
+        limiter = RateLimiter(requests_per_minute=60, burst_size=3)
+
+        async def scenario():
+            return [await limiter.check("client", "/api/v1/hotspots") for _ in range(4)]
+
+        results = asyncio.run(scenario())
+        self.assertEqual([r[0] for r in results], [True, True, True, False])
+        self.assertEqual(results[-1][2], 1)
+        self.assertEqual(limiter.rejected_total, 1)
+        self.assertEqual(limiter.stats()["rejected_by_path"], {"/api/v1/hotspots": 1})
+
+    def test_rejections_are_counted_by_route(self):
+        """Test that IDs in paths do not create new rejection labels."""
+        registry = MetricsRegistry()
+        limiter = RateLimiter(requests_per_minute=60, burst_size=1, registry=registry)
+
+        async def scenario():
+            for request_id in ("a", "b", "c"):
+                await limiter.check("client", f"/api/v1/results/{request_id}")
+
+        asyncio.run(scenario())
+        self.assertEqual(limiter.stats()["rejected_by_path"], {"/api/v1/results": 2})
+        self.assertIn('forestfire_rate_limited_total{route="/api/v1/results"} 2', registry.render())
+
+    def test_clients_are_independent(self):
+        """Test that buckets are keyed per client."""
+        limiter = RateLimiter(requests_per_minute=60, burst_size=1)
+
+        async def scenario():
+            first = await limiter.check("a")
+            second = await limiter.check("b")
+            third = await limiter.check("a")
+            return first[0], second[0], third[0]
+
+        self.assertEqual(asyncio.run(scenario()), (True, True, False))
+
+    def test_store_evicts_idle_clients(self):
+        """Test that the in-memory store stays bounded."""
+        store = MemoryBucketStore(max_keys=2)
+
+        async def scenario():
+            for key in ("a", "b", "c"):
+                await store.consume(key, 1.0, 5.0)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(store), 2)
+
+    def test_client_key(self):
+        """Test that configured API keys take precedence over client addresses."""
+        scope = {"headers": [(b"x-api-key", b"secret")], "client": ("10.0.0.1", 1234)}
+        self.assertEqual(default_client_key(scope, {"secret"}), "key:secret")
+        # Unknown keys cannot buy a fresh bucket
+        self.assertEqual(default_client_key(scope, {"other"}), "ip:10.0.0.1")
+        self.assertEqual(default_client_key(scope), "ip:10.0.0.1")
+        self.assertEqual(default_client_key({"headers": [], "client": ("10.0.0.1", 1)}), "ip:10.0.0.1")
+
+    def test_middleware_rejects_with_retry_after(self):
+        """Test the 429 response produced by the middleware."""
+        limiter = RateLimiter(requests_per_minute=60, burst_size=1)
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope["path"])
+
+        middleware = RateLimitMiddleware(app, limiter)
+        scope = {"type": "http", "path": "/api/v1/hotspots", "headers": [], "client": ("1.2.3.4", 1)}
+
+        async def scenario():
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            await middleware(scope, None, send)
+            await middleware(scope, None, send)
+            await middleware({**scope, "path": "/health"}, None, send)
+            return sent
+
+        sent = asyncio.run(scenario())
+        self.assertEqual(calls, ["/api/v1/hotspots", "/health"])
+        self.assertEqual(sent[0]["status"], 429)
+        self.assertIn((b"retry-after", b"1"), sent[0]["headers"])
+
+
+if __name__ == '__main__':
+    unittest.main()
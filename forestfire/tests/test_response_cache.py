@@ -0,0 +1,78 @@
+"""
+Test module for stable hashing and the in-process response cache.
+"""
+
+import unittest
+import subprocess
+import sys
+import os
+
+# Add src to path
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.append(SRC_DIR)
+
+from utils.hashing import stable_hash, stable_key, stable_seed
+from api.response_cache import ResponseCache
+
+
+class TestStableHashing(unittest.TestCase):
+    """Test cases for process-independent hashing."""
+
+    def test_seed_range(self):
+        """Test that seeds fit in 32 bits and depend on every part."""
+        seed = stable_seed("hotspots", [-125.0, 32.0, -114.0, 42.0], "2024-07-01")
+        self.assertTrue(0 <= seed < 2**32)
+        self.assertNotEqual(seed, stable_seed("hotspots", [-125.0, 32.0, -114.0, 42.0], "2024-07-02"))
+        self.assertTrue(0 <= stable_hash("x", bits=16) < 2**16)
+        self.assertEqual(len(stable_key("x")), 32)
+
+    def test_stable_across_processes(self):
+        """Test that different PYTHONHASHSEED values give the same seed."""
+        code = (
+            "import sys; sys.path.insert(0, %r); "
+            "from utils.hashing import stable_seed; print(stable_seed('hotspots_[1, 2, 3, 4]'))" % SRC_DIR
+        )
+        outputs = set()
+        for hash_seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            outputs.add(subprocess.check_output([sys.executable, "-c", code], env=env).strip())
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(int(outputs.pop()), stable_seed('hotspots_[1, 2, 3, 4]'))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the LRU response cache."""
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_entries=2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", {"value": 1})
+        self.assertEqual(cache.get("a"), {"value": 1})
+        self.assertEqual(cache.stats()["hit_ratio"], 0.5)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_weight_budget(self):
+        cache = ResponseCache(max_entries=10, max_weight=10)
+        cache.put("big", 1, weight=11)
+        self.assertEqual(len(cache), 0)
+        cache.put("a", 1, weight=6)
+        cache.put("b", 2, weight=6)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl_seconds=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test module for memoization of whole detection runs.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from detection.fire_detector import FireDetector
+from storage.run_cache import code_version, decode_results, encode_results
+
+
+class TestRunCache(unittest.TestCase):
+    """Test cases for run addressing, provenance and invalidation."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.detector = FireDetector({
+            "performance": {
+                "parallel": {"backend": "serial"},
+                "caching": {"enabled": True, "cache_dir": self.tmpdir.name}
+            },
+            "detection": {"spatial": {"min_burn_area": 50, "geometry_zoom_levels": []}}
+        })
+        rng = np.random.default_rng(3)
+        shape = (120, 100)
+        self.optical = {
+            "red": rng.uniform(0.04, 0.06, shape),
+            "nir": rng.uniform(0.45, 0.5, shape),
+            "swir2": rng.uniform(0.1, 0.12, shape),
+        }
+        brightness = np.full(shape, 300.0)
+        self.optical["nir"][30:70, 20:60] = 0.05
+        self.optical["swir2"][30:70, 20:60] = 0.6
+        brightness[30:70, 20:60] = 350
+        self.thermal = {"brightness_temp": brightness}
+        self.metadata = {"crs": "EPSG:32610", "timestamp": datetime(2024, 8, 1, 12, 30), "location": "Test"}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_detection(self):
+        return self.detector.detect_fire_events(self.thermal, self.optical, metadata=self.metadata)
+
+    def test_identical_run_is_served_from_cache(self):
+        """Test that a re-run returns the stored results with their provenance."""
+        first = self.run_detection()
+        self.assertNotIn("error", first)
+        self.assertEqual(len(first["detections"]), 1)
+        self.assertFalse(first["provenance"]["cached"])
+        self.assertEqual(set(first["provenance"]["inputs"]),
+                         {"thermal:brightness_temp", "optical:red", "optical:nir", "optical:swir2"})
+        self.assertEqual(first["provenance"]["code_version"], code_version())
+
+        second = self.run_detection()
+        self.assertTrue(second["provenance"]["cached"])
+        self.assertEqual(second["provenance"]["run_key"], first["provenance"]["run_key"])
+        self.assertEqual(len(second["detections"]), len(first["detections"]))
+        for cached, computed in zip(second["detections"], first["detections"]):
+            self.assertEqual(cached["id"], computed["id"])
+            self.assertTrue(cached["geometry"].equals(computed["geometry"]))
+            self.assertEqual(cached["timestamp"], computed["timestamp"])
+        self.assertEqual(second["summary"], first["summary"])
+
+    def test_changes_invalidate(self):
+        """Test that different bands or thresholds address a different run."""
+        key = self.run_detection()["provenance"]["run_key"]
+
+        self.optical["red"] = self.optical["red"].copy()
+        self.optical["red"][0, 0] += 1e-6
+        changed_band = self.run_detection()
+        self.assertFalse(changed_band["provenance"]["cached"])
+        self.assertNotEqual(changed_band["provenance"]["run_key"], key)
+
+        self.detector.min_burn_area = 500
+        changed_threshold = self.run_detection()
+        self.assertFalse(changed_threshold["provenance"]["cached"])
+        self.assertEqual(changed_threshold["provenance"]["parameters"]["min_burn_area"], 500)
+
+    def test_encoding_round_trip(self):
+        """Test the tagged types of the stored payload."""
+        from shapely.geometry import box
+        results = {"timestamp": datetime(2024, 1, 2, 3, 4, 5), "geometry": box(0, 0, 1, 1),
+                   "mean": np.float32(0.5), "count": np.int64(3), "values": np.arange(3, dtype=np.int16)}
+        decoded = decode_results(encode_results(results))
+        self.assertEqual(decoded["timestamp"], results["timestamp"])
+        self.assertTrue(decoded["geometry"].equals(results["geometry"]))
+        self.assertEqual((decoded["mean"], decoded["count"]), (0.5, 3))
+        self.assertEqual(decoded["values"].dtype, np.int16)
+
+
+if __name__ == '__main__':
+    unittest.main()
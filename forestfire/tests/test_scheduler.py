@@ -0,0 +1,173 @@
+"""
+Test module for the detection job scheduler.
+"""
+
+import unittest
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.scheduler import JobScheduler, AdmissionError, JobCancelledError, classify_priority
+
+
+class TestJobScheduler(unittest.TestCase):
+    """Test cases for admission control and priority scheduling."""
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_classify_priority(self):
+        """Test default and explicit priority classes."""
+        self.assertEqual(classify_priority([-122, 37, -121, 38]), "normal")
+        self.assertEqual(classify_priority([-180, -90, 180, 90]), "bulk")
+        self.assertEqual(classify_priority([-180, -90, 180, 90], "Emergency"), "emergency")
+        with self.assertRaises(ValueError):
+            classify_priority([0, 0, 1, 1], "urgent")
+
+    def test_priority_order(self):
+        """Test that emergency jobs run before queued bulk jobs."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, max_queue_size=10, per_client_limit=10)
+            order = []
+            gate = asyncio.Event()
+
+            async def blocker():
+                await gate.wait()
+
+            def job(name):
+                async def run():
+                    order.append(name)
+                return run
+
+            scheduler.submit("blocker", "a", "normal", blocker)
+            await asyncio.sleep(0)
+            scheduler.submit("bulk", "a", "bulk", job("bulk"))
+            scheduler.submit("emergency", "a", "emergency", job("emergency"))
+            gate.set()
+            await scheduler._queue.join()
+            await scheduler.stop()
+            return order
+
+        self.assertEqual(self.run_async(scenario()), ["emergency", "bulk"])
+
+    def test_per_client_limit(self):
+        """Test that a client over its limit receives a 429."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, max_queue_size=10, per_client_limit=2)
+            gate = asyncio.Event()
+
+            async def blocker():
+                await gate.wait()
+
+            scheduler.submit("j1", "a", "normal", blocker)
+            scheduler.submit("j2", "a", "normal", blocker)
+            try:
+                scheduler.submit("j3", "a", "normal", blocker)
+            except AdmissionError as e:
+                error = e
+            else:
+                error = None
+            # Other clients are still admitted
+            scheduler.submit("j4", "b", "normal", blocker)
+            gate.set()
+            await scheduler._queue.join()
+            await scheduler.stop()
+            return error
+
+        error = self.run_async(scenario())
+        self.assertIsNotNone(error)
+        self.assertEqual(error.status_code, 429)
+        self.assertGreaterEqual(error.retry_after, 1)
+
+    def test_job_cost(self):
+        """Test that a job costing several slots counts them all against the client."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, max_queue_size=10, per_client_limit=4)
+            gate = asyncio.Event()
+
+            async def blocker():
+                await gate.wait()
+
+            scheduler.submit("batch", "a", "normal", blocker, cost=3)
+            with self.assertRaises(AdmissionError):
+                scheduler.submit("second_batch", "a", "normal", blocker, cost=2)
+            scheduler.submit("single", "a", "normal", blocker)
+            gate.set()
+            await scheduler._queue.join()
+            stats = scheduler.stats()
+            await scheduler.stop()
+            return stats
+
+        self.assertEqual(self.run_async(scenario())["active_clients"], 0)
+
+    def test_queue_full(self):
+        """Test that a saturated queue returns 503."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, max_queue_size=1, per_client_limit=10)
+            gate = asyncio.Event()
+
+            async def blocker():
+                await gate.wait()
+
+            scheduler.submit("running", "a", "normal", blocker)
+            await asyncio.sleep(0)
+            scheduler.submit("queued", "b", "normal", blocker)
+            with self.assertRaises(AdmissionError) as ctx:
+                scheduler.submit("rejected", "c", "normal", blocker)
+            gate.set()
+            await scheduler._queue.join()
+            await scheduler.stop()
+            return ctx.exception
+
+        error = self.run_async(scenario())
+        self.assertEqual(error.status_code, 503)
+
+    def test_job_timeout(self):
+        """Test that jobs exceeding the timeout are reported as failed."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, job_timeout=0.01)
+            failures = []
+
+            async def slow():
+                await asyncio.sleep(1)
+
+            scheduler.submit("slow", "a", "normal", slow, on_error=lambda job_id, e: failures.append(job_id))
+            await scheduler._queue.join()
+            stats = scheduler.stats()
+            await scheduler.stop()
+            return failures, stats
+
+        failures, stats = self.run_async(scenario())
+        self.assertEqual(failures, ["slow"])
+        self.assertEqual(stats["active_clients"], 0)
+
+    def test_stop_reports_dropped_jobs(self):
+        """Test that running and queued jobs are reported when the scheduler stops."""
+        async def scenario():
+            scheduler = JobScheduler(max_concurrent_jobs=1, per_client_limit=10)
+            failures = {}
+
+            async def blocker():
+                await asyncio.Event().wait()
+
+            def on_error(job_id, error):
+                failures[job_id] = error
+
+            scheduler.submit("running", "a", "normal", blocker, on_error=on_error)
+            await asyncio.sleep(0)
+            scheduler.submit("queued", "a", "normal", blocker, on_error=on_error)
+            await scheduler.stop()
+            return failures, scheduler.stats()
+
+        failures, stats = self.run_async(scenario())
+        self.assertEqual(set(failures), {"running", "queued"})
+        self.assertTrue(all(isinstance(e, JobCancelledError) for e in failures.values()))
+        self.assertIn("before the job started", str(failures["queued"]))
+        self.assertEqual((stats["queue_depth"], stats["active_clients"]), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
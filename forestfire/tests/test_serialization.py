@@ -0,0 +1,104 @@
+"""
+Test module for fast JSON, streaming bodies and response compression.
+"""
+
+import unittest
+import asyncio
+import gzip
+import json
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.serialization import (
+    CompressionMiddleware, chunked, dumps, iter_geojson, iter_ndjson,
+    negotiate_encoding, response_format
+)
+
+
+class TestSerialization(unittest.TestCase):
+    """Test cases for encoders and streaming helpers."""
+
+    def setUp(self):
+        self.features = [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [i, i]},
+             "properties": {"id": i, "confidence": np.float64(0.5)}}
+            for i in range(5)
+        ]
+
+    def test_dumps_handles_numpy_and_datetime(self):
+        """Test conversions shared by the orjson and stdlib encoders."""
+        payload = {"a": np.int64(3), "b": np.array([1.5, 2.5]), "t": datetime(2024, 7, 1, 12, 0)}
+        decoded = json.loads(dumps(payload))
+        self.assertEqual(decoded["a"], 3)
+        self.assertEqual(decoded["b"], [1.5, 2.5])
+        self.assertTrue(decoded["t"].startswith("2024-07-01T12:00"))
+
+    def test_streamed_geojson_and_ndjson(self):
+        """Test that streamed bodies decode to the same features."""
+        body = b"".join(iter_geojson(chunked(self.features, 2), {"metadata": {"seed": 1}}))
+        collection = json.loads(body)
+        self.assertEqual(collection["type"], "FeatureCollection")
+        self.assertEqual(len(collection["features"]), 5)
+        self.assertEqual(collection["metadata"], {"seed": 1})
+        self.assertEqual(json.loads(b"".join(iter_geojson([])))["features"], [])
+
+        lines = b"".join(iter_ndjson(chunked(self.features, 2))).splitlines()
+        self.assertEqual([json.loads(line)["properties"]["id"] for line in lines], list(range(5)))
+
+    def test_format_and_encoding_negotiation(self):
+        """Test format selection and Accept-Encoding parsing."""
+        self.assertEqual(response_format(None, "application/x-ndjson"), "ndjson")
+        self.assertEqual(response_format("GeoJSON", "application/json"), "geojson")
+        self.assertEqual(response_format(None, None), "json")
+        with self.assertRaises(ValueError):
+            response_format("xml", None)
+
+        self.assertEqual(negotiate_encoding("gzip;q=0.5"), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity"))
+        self.assertIsNone(negotiate_encoding(""))
+
+    def test_middleware_compresses_streams(self):
+        """Test chunk-wise gzip of a streamed body and pass-through of small ones."""
+        chunks = [b'{"part":%d}\n' % i * 200 for i in range(3)]
+
+        async def streaming_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"application/x-ndjson")]})
+            for i, chunk in enumerate(chunks):
+                await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+
+        async def small_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-length", b"2")]})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+
+        async def run(app):
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            await CompressionMiddleware(app, minimum_size=100, brotli_quality=4)(scope, None, send)
+            return sent
+
+        sent = asyncio.run(run(streaming_app))
+        self.assertIn((b"content-encoding", b"gzip"), sent[0]["headers"])
+        bodies = [m["body"] for m in sent[1:]]
+        self.assertTrue(all(bodies[:-1]))  # every chunk flushed immediately
+        self.assertEqual(gzip.decompress(b"".join(bodies)), b"".join(chunks))
+
+        sent = asyncio.run(run(small_app))
+        self.assertNotIn(b"content-encoding", dict(sent[0]["headers"]))
+        self.assertEqual(sent[1]["body"], b"{}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Test module for vectorized synthetic hotspot generation.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api import simple_main
+from utils.land_mask import get_land_mask
+from api.synthetic_hotspots import (
+    generate_hotspots, hotspot_features, land_locations, MAX_SYNTHETIC_HOTSPOTS
+)
+
+
+class TestSyntheticHotspots(unittest.TestCase):
+    """Test that the vectorized generator matches the scalar helpers."""
+
+    def setUp(self):
+        self.seed = 123456789
+        self.start_date = "2024-07-01"
+
+    def test_land_locations_on_land(self):
+        """Test vectorized land placement, including water fallbacks."""
+        land_mask = get_land_mask()
+        for bounds in ([-125.0, 32.0, -114.0, 42.0], [-60.0, -30.0, -40.0, -10.0]):
+            lon, lat = land_locations(bounds, self.seed, np.arange(200))
+            self.assertTrue(np.all(land_mask.is_land(lon, lat)))
+            self.assertEqual(
+                simple_main.get_deterministic_land_location(bounds, self.seed, 7),
+                (lon[7], lat[7])
+            )
+
+        # Open ocean: no land candidate, so points are offset around the centre
+        lon, lat = land_locations([-150.0, 0.0, -140.0, 10.0], self.seed, np.arange(5))
+        self.assertEqual(len(set(zip(lon.round(6), lat.round(6)))), 5)
+
+    def test_attributes_match_scalar(self):
+        """Test brightness, FRP and confidence against the scalar helpers."""
+        bounds = [-180.0, -90.0, 180.0, 90.0]
+        hotspots = generate_hotspots(bounds, self.start_date, "viirs", self.seed, [], count=50)
+        for i in range(50):
+            lat = hotspots["lat"][i]
+            self.assertEqual(
+                hotspots["brightness"][i],
+                simple_main.get_deterministic_brightness_temp(lat, self.start_date, self.seed, i)
+            )
+            self.assertEqual(
+                hotspots["frp"][i],
+                simple_main.get_deterministic_frp(lat, self.start_date, self.seed, i)
+            )
+
+    def test_deterministic_and_sized(self):
+        """Test that large requests are deterministic and honour the count."""
+        bounds = [-125.0, 32.0, -114.0, 42.0]
+        zones = simple_main.get_realistic_fire_zones(bounds)
+        first = generate_hotspots(bounds, self.start_date, "modis", self.seed, zones, count=20000)
+        second = generate_hotspots(bounds, self.start_date, "modis", self.seed, zones, count=20000)
+        self.assertEqual(len(first["lon"]), 20000)
+        for key in first:
+            np.testing.assert_array_equal(first[key], second[key])
+
+        features = hotspot_features(first, self.start_date, "modis", self.seed)
+        self.assertEqual(features[0]["properties"]["id"], f"hotspot_0_{self.seed}_0")
+        self.assertTrue(all(bounds[0] - 0.5 <= f["geometry"]["coordinates"][0] <= bounds[2] + 0.5 for f in features))
+
+        capped = generate_hotspots(bounds, self.start_date, "modis", self.seed, zones, count=MAX_SYNTHETIC_HOTSPOTS + 10)
+        self.assertEqual(len(capped["lon"]), MAX_SYNTHETIC_HOTSPOTS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+"""
+Test module for vector tile rendering and the tile cache.
+"""
+
+import unittest
+import tempfile
+import shutil
+import struct
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.tiles import (
+    TileCache, render_tile, tile_bounds, validate_tile, project, ring_area, TILE_EXTENT
+)
+
+
+def read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def read_message(data):
+    """Minimal protobuf reader: field number -> list of raw values."""
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = struct.unpack("<d", data[pos:pos + 8])[0], pos + 8
+        else:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        fields.setdefault(field, []).append(value)
+    return fields
+
+
+def read_packed(data):
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def decode_geometry(commands):
+    """Decode MVT commands into rings / points in absolute tile coordinates."""
+    parts, cx, cy, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        if command == 7:
+            continue
+        for _ in range(count):
+            dx, dy = commands[i], commands[i + 1]
+            i += 2
+            cx += (dx >> 1) ^ -(dx & 1)
+            cy += (dy >> 1) ^ -(dy & 1)
+            if command == 1:
+                parts.append([])
+            parts[-1].append((cx, cy))
+    return parts
+
+
+def decode_tile(data):
+    """Decode a tile into {layer: [(type, parts, properties)]}."""
+    layers = {}
+    for raw_layer in read_message(data).get(3, []):
+        layer = read_message(raw_layer)
+        keys = [k.decode() for k in layer.get(3, [])]
+        values = []
+        for raw_value in layer.get(4, []):
+            value = read_message(raw_value)
+            if 1 in value:
+                values.append(value[1][0].decode())
+            elif 6 in value:
+                values.append((value[6][0] >> 1) ^ -(value[6][0] & 1))
+            else:
+                values.append(next(iter(value.values()))[0])
+        features = []
+        for raw_feature in layer.get(2, []):
+            feature = read_message(raw_feature)
+            tags = read_packed(feature.get(2, [b""])[0])
+            properties = {keys[tags[j]]: values[tags[j + 1]] for j in range(0, len(tags), 2)}
+            features.append((feature[3][0], decode_geometry(read_packed(feature[4][0])), properties))
+        layers[layer[1][0].decode()] = features
+    return layers
+
+
+def square(lon, lat, size):
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [lon - size, lat - size], [lon + size, lat - size],
+            [lon + size, lat + size], [lon - size, lat + size], [lon - size, lat - size]
+        ]]
+    }
+
+
+class TestTiles(unittest.TestCase):
+    """Test cases for MVT rendering."""
+
+    def test_tile_math(self):
+        """Test tile bounds and projection round trip at the corners."""
+        bounds = tile_bounds(1, 0, 0)
+        self.assertAlmostEqual(bounds[0], -180.0)
+        self.assertAlmostEqual(bounds[1], 0.0)
+        self.assertAlmostEqual(bounds[2], 0.0)
+        px, py = project(bounds[0], bounds[1], 1, 0, 0)
+        self.assertAlmostEqual(px, 0.0)
+        self.assertAlmostEqual(py, TILE_EXTENT)
+        with self.assertRaises(ValueError):
+            validate_tile(2, 4, 0)
+
+    def test_render_points_and_polygons(self):
+        """Test that features decode with MVT winding and properties."""
+        z, x, y = 4, 2, 6  # covers California
+        tile = render_tile({
+            "detections": [{"geometry": square(-120.0, 38.0, 0.5),
+                            "properties": {"id": "fire_1", "confidence": 0.9, "area_ha": 12}}],
+            "hotspots": [{"geometry": {"type": "Point", "coordinates": [-120.0, 38.0]},
+                          "properties": {"source": "viirs"}},
+                         {"geometry": {"type": "Point", "coordinates": [10.0, 48.0]},
+                          "properties": {"source": "viirs"}}]
+        }, z, x, y)
+        layers = decode_tile(tile)
+
+        geom_type, rings, properties = layers["detections"][0]
+        self.assertEqual(geom_type, 3)
+        self.assertEqual(len(rings), 1)
+        self.assertGreater(ring_area(rings[0]), 0)
+        self.assertEqual(properties, {"id": "fire_1", "confidence": 0.9, "area_ha": 12})
+
+        self.assertEqual(len(layers["hotspots"]), 1)
+        expected = tuple(int(round(v)) for v in project(-120.0, 38.0, z, x, y))
+        self.assertEqual(layers["hotspots"][0][1], [[expected]])
+
+    def test_clipping_and_simplification(self):
+        """Test that large polygons are clipped and tiny ones dropped."""
+        tile = render_tile({"detections": [
+            {"geometry": square(-120.0, 38.0, 40.0), "properties": {}},
+            {"geometry": square(-120.0, 38.0, 0.0001), "properties": {}},
+        ]}, 4, 2, 6)
+        features = decode_tile(tile)["detections"]
+        self.assertEqual(len(features), 1)
+        for px, py in features[0][1][0]:
+            self.assertTrue(-64 <= px <= TILE_EXTENT + 64 and -64 <= py <= TILE_EXTENT + 64)
+
+        self.assertEqual(render_tile({"detections": [{"geometry": square(100.0, 0.0, 1.0)}]}, 4, 2, 6), b"")
+
+
+class TestTileCache(unittest.TestCase):
+    """Test cases for TileCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_disk_layer_and_invalidation(self):
+        """Test disk reuse across instances and invalidation by version."""
+        cache = TileCache(disk_dir=self.temp_dir)
+        cache.put("abcd", 1, b"tile")
+        self.assertEqual(cache.get("abcd", 1), b"tile")
+
+        fresh = TileCache(disk_dir=self.temp_dir)
+        self.assertEqual(fresh.get("abcd", 1), b"tile")
+        self.assertEqual(fresh.disk_hits, 1)
+
+        self.assertIsNone(fresh.get("abcd", 2))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_disk_layer_is_bounded(self):
+        """Test that the least recently used tile files are evicted above the disk budget."""
+        cache = TileCache(max_entries=1, disk_dir=self.temp_dir, max_disk_bytes=3000)
+        for key in ("aa01", "bb02", "cc03"):
+            cache.put(key, 1, b"x" * 1000)
+        # Make "aa01" the most recently used file
+        for offset, key in enumerate(("bb02", "cc03", "aa01")):
+            path = cache._path(key, 1)
+            os.utime(path, (1000 + offset, 1000 + offset))
+
+        cache.put("dd04", 1, b"x" * 1000)
+        self.assertFalse(os.path.exists(cache._path("bb02", 1)))
+        self.assertFalse(os.path.exists(cache._path("cc03", 1)))
+        self.assertTrue(os.path.exists(cache._path("aa01", 1)))
+        self.assertEqual(cache.stats()["disk_evictions"], 2)
+        self.assertEqual(cache.stats()["disk_bytes"], 2000)
+
+
+class TestTileEndpoint(unittest.TestCase):
+    """Test cache keys of the tile endpoint."""
+
+    def setUp(self):
+        from api import simple_main
+        self.main = simple_main
+        self.temp_dir = tempfile.mkdtemp()
+        # Keep the shared stores out of the checkout
+        self.patches = [
+            mock.patch.object(simple_main, "DETECTION_STORE_PATH", os.path.join(self.temp_dir, "detections.sqlite")),
+            mock.patch.object(simple_main, "HOTSPOT_STORE_PATH", os.path.join(self.temp_dir, "hotspots.sqlite")),
+        ]
+        for patch in self.patches:
+            patch.start()
+        self.close_shared_stores()
+
+    def tearDown(self):
+        self.close_shared_stores()
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def close_shared_stores(self):
+        # The shared stores keep the path they were first opened with
+        self.main.get_detection_store(self.main.DETECTION_STORE_PATH).close()
+        self.main.get_hotspot_store(self.main.HOTSPOT_STORE_PATH).close()
+
+    def test_implied_hotspot_date_is_part_of_the_key(self):
+        """Test that a tile without start date is re-rendered when the day changes."""
+        from fastapi.testclient import TestClient
+
+        class Clock(datetime):
+            current = datetime(2024, 7, 1, 23, 0)
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        with mock.patch.object(self.main, "tile_cache", TileCache()), \
+                mock.patch.object(self.main, "datetime", Clock):
+            client = TestClient(self.main.app)
+            first = client.get("/tiles/6/10/24", params={"layers": "hotspots"})
+            repeated = client.get("/tiles/6/10/24", params={"layers": "hotspots"})
+            Clock.current = datetime(2024, 7, 2, 1, 0)
+            next_day = client.get("/tiles/6/10/24", params={"layers": "hotspots"})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(repeated.headers["x-tile-cache"], "hit")
+        self.assertEqual(next_day.headers["x-tile-cache"], "miss")
+        self.assertNotEqual(next_day.headers["etag"], first.headers["etag"])
+
+
+if __name__ == '__main__':
+    unittest.main()